@@ -5,22 +5,12 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from Vehicles.h3_mining_truck import H3MiningTruck
 
 
+@pytest.mark.usefixtures("dummy_logger")
 class TestH3MiningTruck(unittest.IsolatedAsyncioTestCase):
     """Tests the H3MiningTruck class."""
 
-    class DummyLogger:
-        """Mock Logger for logging; Use this class instead of SimulationLogger."""
-
-        def __init__(self, log_msgs):
-            self._log_msgs = log_msgs
-
-        def log(self, message):
-            self._log_msgs.append(message)
-
     def setUp(self):
         """Prepare tests."""
-        self._log_msgs = []
-        self._logger = self.DummyLogger(self._log_msgs)
         self._logger_patch = patch(
             target="simulation_logger.SimulationLogger.get_instance",
             return_value=self._logger,
@@ -32,11 +22,12 @@ class TestH3MiningTruck(unittest.IsolatedAsyncioTestCase):
         self._logger_patch.stop()
 
     @pytest.mark.asyncio
-    @patch("Vehicles.h3_mining_truck.randint", return_value=150)  # Use patch to return 150 min for mining time
+    @patch("Vehicles.mining_truck.randint", return_value=150)  # Use patch to return 150 min for mining time
     @patch("asyncio.sleep", return_value=None)  # Skip wait time
     async def test_go(self, mock_sleep, mock_randint):
         control_center = MagicMock()
         control_center.truck_arrived = AsyncMock()
+        control_center.wait_until = AsyncMock()
 
         # Execute Truck.go
         truck_name = "Truck X"
@@ -52,6 +43,10 @@ class TestH3MiningTruck(unittest.IsolatedAsyncioTestCase):
             f"--> {truck_name} arrived and ready to unload.",
         ]
 
+        # Verification: waits until absolute deadlines; travel 30 min, mining 150 min and travel 30 min.
+        assert [call.kwargs["sim_time"] for call in control_center.wait_until.await_args_list] == [30, 180, 210]
+        assert 210 == truck.deadline
+
         assert control_center.truck_arrived.call_count == 1
         control_center.truck_arrived.assert_awaited_once_with(truck=truck)
 
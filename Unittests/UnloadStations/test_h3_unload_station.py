@@ -5,25 +5,14 @@ from unittest.mock import AsyncMock, MagicMock, call, patch
 from UnloadStations.h3_unload_station import H3UnloadStation
 
 
+@pytest.mark.usefixtures("dummy_logger")
 class TestH3UnloadStation(unittest.IsolatedAsyncioTestCase):
-    class DummyLogger:
-        """Mock Logger for logging; Use this class instead of SimulationLogger."""
-
-        def __init__(self, log_msgs):
-            self._log_msgs = log_msgs
-
-        def log(self, message):
-            """Save log messages to log_msgs"""
-            self._log_msgs.append(message)
-
     def setUp(self):
         # Mock: Add an Unload Station
         control_center = MagicMock()
         control_center.unload_complete = AsyncMock()
+        control_center.wait_until = AsyncMock()
         self._station = H3UnloadStation(control_center=control_center, name="H3 Unload Station X", sim_time_unit=5)
-        self._station._calculate_unload_time_in_simulation = MagicMock(return_value=1)
-        self._log_msgs = []
-        self._logger = self.DummyLogger(self._log_msgs)
         self._logger_patch = patch(
             target="simulation_logger.SimulationLogger.get_instance",
             return_value=self._logger,
@@ -41,6 +30,7 @@ class TestH3UnloadStation(unittest.IsolatedAsyncioTestCase):
         # Mock: Add a Truck
         truck = MagicMock()
         truck.name = "Truck X"
+        truck.deadline = 180
 
         await self._station.unload(truck)
 
@@ -54,6 +44,8 @@ class TestH3UnloadStation(unittest.IsolatedAsyncioTestCase):
         )
 
         assert 1 == self._station._unloads
+        # Verification: the truck leaves when the unloading ends.
+        assert 185 == truck.deadline
 
     @pytest.mark.asyncio
     @patch("asyncio.sleep", return_value=None)
@@ -65,6 +57,7 @@ class TestH3UnloadStation(unittest.IsolatedAsyncioTestCase):
         for i in range(5):
             truck = MagicMock()
             truck.name = f"Truck {i}"
+            truck.deadline = 180
             trucks.append(truck)
 
         for truck in trucks:
@@ -86,6 +79,8 @@ class TestH3UnloadStation(unittest.IsolatedAsyncioTestCase):
         self._station._control_center.unload_complete.assert_has_awaits(calls)
 
         assert 5 == self._station._unloads
+        # Verification: trucks arrived at 180 at the same time are unloaded one after another.
+        assert [185, 190, 195, 200, 205] == [truck.deadline for truck in trucks]
 
     @pytest.mark.asyncio
     @patch("asyncio.sleep", return_value=None)
@@ -95,6 +90,7 @@ class TestH3UnloadStation(unittest.IsolatedAsyncioTestCase):
         # Mock: Add a Truck
         truck = MagicMock()
         truck.name = None
+        truck.deadline = 0
 
         await self._station.unload(truck)
 
@@ -108,20 +104,3 @@ class TestH3UnloadStation(unittest.IsolatedAsyncioTestCase):
         )
 
         assert 1 == self._station._unloads
-
-    @patch("asyncio.sleep", return_value=None)
-    def test_verify_unload_time(self, mock_sleep):
-        """Test: UnloadStation._calculate_unload_time_in_simulation."""
-        # Verify Time unit: 1, 2, 5, 10
-        for time_unit, expected in [[1, 5], [2, 2.5], [5, 1], [10, 0.5]]:
-            self._test_verify_unload_time_for_time_unit_x(time_unit=time_unit, expected=expected)
-
-    def _test_verify_unload_time_for_time_unit_x(self, time_unit: int, expected: float) -> None:
-        """Check the calculated unload time is correct.
-
-        :param time_unit: simulation time unit.
-        :param expected: expected unload time.
-        """
-        control_center = MagicMock()
-        station = H3UnloadStation(control_center=control_center, sim_time_unit=time_unit)
-        assert expected == station._calculate_unload_time_in_simulation()
@@ -0,0 +1,41 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+
+class DummyLogger:
+    """Mock Logger for logging; Use this class instead of SimulationLogger."""
+
+    def __init__(self, log_msgs):
+        self._log_msgs = log_msgs
+        self.thread = MagicMock()
+
+    def log(self, message, log_with_timestamp=True, category=None, level=None):
+        """Save log messages to log_msgs"""
+        self._log_msgs.append(message)
+
+    def log_event(self, category, template, *args, level=None):
+        """Save formatted event messages to log_msgs"""
+        self._log_msgs.append(template.format(*args))
+
+    def trace_fleet(self, trucks, stations):
+        """Mocking trace_fleet function. Do nothing."""
+        pass
+
+    def trace_event(self, event, truck_id=-1, station_id=-1, duration=0, sim_time=None):
+        """Mocking trace_event function. Do nothing."""
+        pass
+
+    def reset(self, start_time_in_unix_timestamp, sim_time_unit, clock=None):
+        """Mocking reset function. Do nothing."""
+        pass
+
+
+@pytest.fixture
+def dummy_logger(request):
+    """Give the test case a DummyLogger (self._logger) and the messages it saves (self._log_msgs).
+    Runs before setUp of unittest test cases: use @pytest.mark.usefixtures("dummy_logger") on the class.
+    """
+    request.instance._log_msgs = []
+    request.instance._logger = DummyLogger(request.instance._log_msgs)
+    return request.instance._logger
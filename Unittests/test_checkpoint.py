@@ -0,0 +1,96 @@
+import os
+import random
+import tempfile
+import unittest
+
+from const import SimulationMode
+from mining_control_center import MiningControlCenter
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Test checkpoints of the MiningControlCenter class."""
+
+    def setUp(self):
+        """Prepare for tests."""
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._temp_dir.name, "checkpoint.gz")
+
+    def tearDown(self):
+        """Clean up."""
+        self._temp_dir.cleanup()
+
+    def _make_control_center(self, seed=None, m=2) -> MiningControlCenter:
+        return MiningControlCenter(n=20, m=m, sim_time_unit=1, mode=SimulationMode.DISCRETE_EVENT, seed=seed)
+
+    def _get_state(self, control_center: MiningControlCenter, duration: int):
+        """Statistics to compare simulations."""
+        return (
+            control_center.summarize(duration=duration * 60),
+            [truck.report() for truck in control_center._trucks],
+            [station.report() for station in control_center._unload_stations],
+        )
+
+    def test_resume_is_same_as_uninterrupted_run(self):
+        """Test: a simulation restored from a checkpoint continues exactly as if it was never stopped."""
+        uninterrupted = self._make_control_center(seed=5)
+        uninterrupted.simulate(duration=72)
+
+        interrupted = self._make_control_center(seed=5)
+        interrupted.simulate(duration=24)
+        interrupted.save_checkpoint(self._path)
+        restored = MiningControlCenter.load_checkpoint(self._path)
+        restored.simulate(duration=72)
+
+        assert self._get_state(uninterrupted, 72) == self._get_state(restored, 72)
+
+    def test_resume_restores_random_state(self):
+        """Test: without a seed, the state of the random module is restored too."""
+        random.seed(3)
+        uninterrupted = self._make_control_center()
+        uninterrupted.simulate(duration=48)
+
+        random.seed(3)
+        interrupted = self._make_control_center()
+        interrupted.simulate(duration=12)
+        interrupted.save_checkpoint(self._path)
+        random.seed(100)
+        restored = MiningControlCenter.load_checkpoint(self._path)
+        restored.simulate(duration=48)
+
+        assert self._get_state(uninterrupted, 48) == self._get_state(restored, 48)
+
+    def test_fork(self):
+        """Test: forks share the warm-up, and continue with independent mining times."""
+        warm_up = self._make_control_center(seed=5, m=1)
+        warm_up.simulate(duration=24)
+        warm_up.save_checkpoint(self._path)
+
+        forks = [MiningControlCenter.load_checkpoint(self._path, replication=r) for r in range(1, 4)]
+        for fork in forks:
+            assert warm_up.unloads == fork.unloads
+            fork.simulate(duration=48)
+        assert len({fork.unloads for fork in forks}) > 1
+
+    def test_fork_with_more_unload_stations(self):
+        """Test: added unload stations serve waiting trucks right away."""
+        warm_up = self._make_control_center(seed=5, m=1)
+        warm_up.simulate(duration=24)
+        # Stop while trucks are waiting
+        while not warm_up._trucks_to_unload:
+            warm_up.simulate(duration=warm_up._engine.now / 60 + 1)
+        warm_up.save_checkpoint(self._path)
+
+        fork = MiningControlCenter.load_checkpoint(self._path, m=3)
+        assert 3 == len(fork._unload_stations)
+        assert 0 == len(fork._trucks_to_unload)
+        fork.simulate(duration=48)
+        assert all(station.report()["Total unloads"] > 0 for station in fork._unload_stations)
+
+        with self.assertRaises(ValueError):
+            MiningControlCenter.load_checkpoint(self._path, m=0)
+
+    def test_checkpoint_needs_discrete_event_engine(self):
+        """Test: a simulation which has not run by the discrete event engine cannot be checkpointed."""
+        control_center = MiningControlCenter(n=2, m=1, sim_time_unit=1)
+        with self.assertRaises(RuntimeError):
+            control_center.save_checkpoint(self._path)
@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from event_engine import DiscreteEventEngine
+from mining_control_center import MiningControlCenter
+from const import SimulationMode
+from virtual_time_loop import run_in_virtual_time
+
+
+@pytest.mark.usefixtures("dummy_logger")
+class TestDiscreteEventEngine(unittest.TestCase):
+    """Test the DiscreteEventEngine class."""
+
+    def setUp(self):
+        """Prepare for tests."""
+
+    def _run(self, n: int, m: int, duration: int) -> MiningControlCenter:
+        """Run the engine for the given simulation minutes with 150 minutes of mining time."""
+        control_center = MiningControlCenter(
+            n=n, m=m, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=self._logger
+        )
+        engine = DiscreteEventEngine(control_center=control_center, sim_time_unit=10, logger=self._logger)
+        control_center._get_sim_time = lambda: engine.now
+        with patch("Vehicles.mining_truck.randint", return_value=150):
+            engine.start(trucks=control_center._trucks)
+            engine.run(duration=duration)
+        return control_center
+
+    def test_single_truck_cycle(self):
+        """Test: a truck mines 150 min, travels 30 min, unloads 5 min and travels 30 min back."""
+        # Arrives at 180 and 395; Unloads from 180 to 185.
+        control_center = self._run(n=1, m=1, duration=360)
+        truck = control_center._trucks[0]
+        station = control_center._unload_stations[0]
+
+        assert 1 == truck.total_mining
+        assert 150 == truck.total_mining_time
+        assert 0 == truck.total_wait_time
+        assert 1 == station.report()["Total unloads"]
+        assert 1 == control_center.unloads
+
+    def test_truck_waits_for_unload_station(self):
+        """Test: the second truck waits until the only unload station is available."""
+        control_center = self._run(n=2, m=1, duration=200)
+        first_truck, second_truck = control_center._trucks
+
+        assert 2 == control_center.unloads
+        assert 0 == first_truck.total_wait_time
+        # Waits from 180 until the unloading is completed at 190.
+        assert 10 == second_truck.total_wait_time
+        assert "H3 Truck #2 is waiting for next available unload stations." in self._log_msgs
+
+    def test_events_at_the_end_of_duration(self):
+        """Test: events until the end of the duration are handled and the clock stops there."""
+        control_center = self._run(n=1, m=1, duration=180)
+        assert 1 == control_center._trucks[0].total_mining
+        assert 0 == control_center.unloads
+        assert 6 == self._log_msgs.count("-- Notify every 30 minutes. --")
+
+    def test_run_paced(self):
+        """Test: paced by the clock of the event loop, with the same events and no task per truck."""
+        scheduled = MiningControlCenter(
+            n=20, m=2, sim_time_unit=10, mode=SimulationMode.SCHEDULED, logger=self._logger, seed=4
+        )
+
+        async def run_scheduled():
+            await scheduled._run_engine(duration=24, run=DiscreteEventEngine.run_paced)
+            return asyncio.get_running_loop().time(), len(asyncio.all_tasks())
+
+        with patch("asyncio.create_task", side_effect=AssertionError("No task per truck")):
+            elapsed, tasks = run_in_virtual_time(run_scheduled())
+        # 24 hours in 10 simulation minutes per second.
+        assert 24 * 60 / 10 == elapsed
+        assert 1 == tasks
+
+        discrete_event = MiningControlCenter(
+            n=20, m=2, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=self._logger, seed=4
+        )
+        discrete_event.simulate(duration=24)
+        assert discrete_event.summarize(duration=24 * 60) == scheduled.summarize(duration=24 * 60)
+        assert 48 == self._log_msgs.count("-- Notify every 30 minutes. --")
+
+    def test_start_is_logged_first(self):
+        """Test: in both modes of the engine, the start of the simulation is logged before the first events."""
+        for mode in [SimulationMode.DISCRETE_EVENT, SimulationMode.SCHEDULED]:
+            self._log_msgs.clear()
+            control_center = MiningControlCenter(
+                n=3, m=1, sim_time_unit=10, mode=mode, logger=self._logger, seed=1
+            )
+            run_in_virtual_time(control_center.run(duration=1))
+            assert "Start the simulation for 1 hours." == self._log_msgs[0]
+            assert all(message.startswith("+++ Mining time") for message in self._log_msgs[1:4])
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from const import LogLevel, SimulationMode, TraceEvent
+from event_trace import TRACE_DTYPE, TraceWriter, read_trace, read_trace_header
+from mining_control_center import MiningControlCenter
+from simulation_logger import SimulationLogger
+
+
+class TestEventTrace(unittest.TestCase):
+    """Test the binary event trace."""
+
+    def setUp(self):
+        """Prepare for tests."""
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._temp_dir.name, "trace.bin")
+
+    def tearDown(self):
+        """Clean up."""
+        self._temp_dir.cleanup()
+
+    def test_write_and_read(self):
+        """Test: records are written in batches and read back as a structured array."""
+        with TraceWriter(self._path, batch_size=2) as trace:
+            trace.write(0, TraceEvent.MINING_STARTED, truck_id=1, duration=150)
+            trace.write(180, TraceEvent.TRUCK_ARRIVED, truck_id=1, duration=150)
+            trace.write(180, TraceEvent.UNLOAD_STARTED, truck_id=1, station_id=2, duration=5)
+            assert 3 == trace.records
+            # The fleet size is known after records were written (e.g., the writer was made before the fleet).
+            trace.set_fleet(trucks=1, stations=2)
+
+        assert {"trucks": 1, "stations": 2} == read_trace_header(self._path)
+        records = read_trace(self._path)
+        assert TRACE_DTYPE == records.dtype
+        assert 16 + 3 * TRACE_DTYPE.itemsize == os.path.getsize(self._path)
+        np.testing.assert_array_equal([0, 180, 180], records["sim_time"])
+        np.testing.assert_array_equal(
+            [TraceEvent.MINING_STARTED, TraceEvent.TRUCK_ARRIVED, TraceEvent.UNLOAD_STARTED], records["event"]
+        )
+        np.testing.assert_array_equal([1, 1, 1], records["truck_id"])
+        np.testing.assert_array_equal([-1, -1, 2], records["station_id"])
+        np.testing.assert_array_equal([150, 150, 5], records["duration"])
+
+        unload_started = read_trace(self._path, event=TraceEvent.UNLOAD_STARTED)
+        assert 1 == len(unload_started)
+
+    def test_partial_record_is_ignored(self):
+        """Test: a partial record at the end of the file (e.g., after a crash) is ignored."""
+        with TraceWriter(self._path) as trace:
+            trace.write(10, TraceEvent.MINING_COMPLETED, truck_id=3)
+        with open(self._path, "ab") as trace_file:
+            trace_file.write(b"\x00" * 5)
+
+        assert 1 == len(read_trace(self._path))
+
+    def test_invalid_file(self):
+        """Test: a file which is not an event trace is not read."""
+        with open(self._path, "wb") as trace_file:
+            trace_file.write(b"not a trace")
+        with self.assertRaises(ValueError):
+            read_trace(self._path)
+
+    def test_trace_simulation(self):
+        """Test: every event of a simulation is traced with the simulation time."""
+        with TraceWriter(self._path) as trace:
+            logger = SimulationLogger(level=LogLevel.WARNING, trace=trace)
+            control_center = MiningControlCenter(
+                n=3, m=1, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=logger
+            )
+            with patch("Vehicles.mining_truck.randint", return_value=150):
+                control_center.simulate(duration=4)
+
+        records = read_trace(self._path)
+        # Trucks start to mine at 0, and again at 215, 220 and 225 after unloading.
+        assert 6 == np.count_nonzero(records["event"] == TraceEvent.MINING_STARTED)
+        assert 3 == np.count_nonzero(records["event"] == TraceEvent.TRUCK_ARRIVED)
+        assert 2 == np.count_nonzero(records["event"] == TraceEvent.TRUCK_WAITING)
+
+        # 3 trucks arrive at 180 and unload one by one: wait until 190 and 195.
+        unload_completed = read_trace(self._path, event=TraceEvent.UNLOAD_COMPLETED)
+        np.testing.assert_array_equal([185, 190, 195], unload_completed["sim_time"])
+        np.testing.assert_array_equal([1, 2, 3], unload_completed["truck_id"])
+        np.testing.assert_array_equal([0, 10, 15], unload_completed["duration"])
+        assert sum(truck.total_wait_time for truck in control_center._trucks) == unload_completed["duration"].sum()
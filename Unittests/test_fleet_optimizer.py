@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import patch
+
+from fleet_optimizer import FleetSizingOptimizer, format_candidates
+from monte_carlo_engine import MonteCarloEngine
+
+
+class TestFleetSizingOptimizer(unittest.TestCase):
+    """Test the FleetSizingOptimizer class."""
+
+    def test_utilization_target(self):
+        """Test: the minimum number of unload stations which keeps the utilization below the target."""
+        # 100 trucks unload about 100 * 5 / 245 = 2.04 stations worth of work.
+        optimizer = FleetSizingOptimizer(n=100, metric="unloading_utilization", target=0.8, duration=24)
+        best = optimizer.optimize()
+
+        assert 3 == best.m
+        assert best.passed
+        assert not optimizer.candidates[2].passed
+        # Every candidate stops once its confidence interval is clear of the target, or at the most replications.
+        for candidate in optimizer.candidates.values():
+            assert candidate.replications == 200 or (
+                candidate.mean + candidate.half_width < 0.8 or candidate.mean - candidate.half_width >= 0.8
+            )
+
+    def test_wait_time_target(self):
+        """Test: p95 wait time target; every smaller evaluated candidate fails."""
+        optimizer = FleetSizingOptimizer(n=60, metric="p95_wait_time", target=10, duration=24)
+        best = optimizer.optimize()
+
+        assert best.passed and best.mean < 10
+        assert all(not candidate.passed for m, candidate in optimizer.candidates.items() if m < best.m)
+        # Header lines and a row per candidate
+        assert 4 + len(optimizer.candidates) == len(format_candidates(list(optimizer.candidates.values())))
+
+    def test_candidates_share_random_numbers(self):
+        """Test: every candidate runs the same seed and replications (common random numbers)."""
+        optimizer = FleetSizingOptimizer(n=20, metric="mean_wait_time", target=1, duration=24, seed=5)
+        with patch("fleet_optimizer.MonteCarloEngine", wraps=MonteCarloEngine) as engine:
+            optimizer.optimize()
+
+        assert {5} == {call.kwargs["seed"] for call in engine.call_args_list}
+        assert 0 == engine.call_args_list[0].kwargs["first_replication"]
+
+    def test_unreachable_target(self):
+        """Test: None if even max_stations does not meet the target."""
+        optimizer = FleetSizingOptimizer(n=10, metric="unloading_utilization", target=0.01, max_stations=3)
+        assert optimizer.optimize() is None
+
+    def test_invalid_metric(self):
+        """Test: only known metrics can be targeted."""
+        with self.assertRaises(ValueError):
+            FleetSizingOptimizer(n=10, metric="throughput", target=1)
@@ -0,0 +1,73 @@
+import unittest
+
+from const import SimulationMode, TruckPhase
+from fleet_store import FleetEngine, FleetStore, build_array_fleet, build_object_fleet, measure_memory_per_truck
+from mining_control_center import MiningControlCenter
+from monte_carlo_engine import MonteCarloEngine
+
+
+class TestFleetStore(unittest.TestCase):
+    """Test the FleetStore and FleetEngine classes."""
+
+    def test_same_as_object_model(self):
+        """Test: the same seed gives the same statistics as the MiningControlCenter."""
+        for n, m, seed in [(10, 2, 1), (30, 3, 5), (7, 1, 0)]:
+            control_center = MiningControlCenter(
+                n=n, m=m, sim_time_unit=1, mode=SimulationMode.DISCRETE_EVENT, seed=seed
+            )
+            control_center.simulate(duration=24)
+            engine = FleetEngine(n=n, m=m, seed=seed)
+            engine.simulate(duration=24)
+
+            assert control_center.summarize(duration=24 * 60) == engine.summarize(duration=24 * 60)
+            assert [(truck.name, truck.report()) for truck in control_center._trucks] == list(
+                engine.truck_reports()
+            )
+
+    def test_continue(self):
+        """Test: calling simulate again continues the simulation."""
+        engine = FleetEngine(n=10, m=2, seed=3, antithetic=True)
+        engine.simulate(duration=24)
+        engine.simulate(duration=72)
+        once = FleetEngine(n=10, m=2, seed=3, antithetic=True)
+        once.simulate(duration=72)
+        assert engine.summarize(duration=72 * 60) == once.summarize(duration=72 * 60)
+
+    def test_antithetic_pairs(self):
+        """Test: antithetic replications are the same as those of MonteCarloEngine, pair by pair."""
+        result = MonteCarloEngine(n=6, m=2, replications=4, seed=5, antithetic=True).run(duration=24)
+        for replication in range(4):
+            engine = FleetEngine(n=6, m=2, seed=5, replication=replication, antithetic=True)
+            engine.simulate(duration=24)
+            assert list(engine.trucks.total_mining_time) == list(result.truck_total_mining_time[replication])
+
+    def test_phase(self):
+        """Test: 3 trucks arrive at 180 at the same time; one unloads and the others wait."""
+        engine = FleetEngine(n=3, m=1, shortest_mining_time=150, longest_mining_time=150)
+        engine.run(duration=180)
+        assert list(engine.trucks.phase) == [TruckPhase.UNLOADING, TruckPhase.WAITING, TruckPhase.WAITING]
+        assert list(engine.trucks.next_event_time) == [185, 180, 180]
+        engine.run(duration=200)
+        assert list(engine.trucks.total_wait_time) == [0, 10, 15]
+
+    def test_long_mining_time(self):
+        """Test: mining times longer than 65535 minutes are kept as is."""
+        engine = FleetEngine(n=1, m=1, shortest_mining_time=70000, longest_mining_time=70000)
+        engine.run(duration=70030)
+        assert [70000] == list(engine.trucks.total_mining_time)
+        with self.assertRaises(ValueError):
+            FleetEngine(n=1, m=1, longest_mining_time=1 << 32)
+
+    def test_names_on_report(self):
+        """Test: names are generated from truck ids."""
+        assert FleetStore.name(0) == "H3 Truck #1"
+        with self.assertRaises(ValueError):
+            FleetStore(n=0)
+        with self.assertRaises(ValueError):
+            FleetEngine(n=1, m=0)
+
+    def test_memory_per_truck(self):
+        """Test: the fleet store takes much less memory per truck than the object model."""
+        object_bytes = measure_memory_per_truck(build_object_fleet, 1000)
+        array_bytes = measure_memory_per_truck(build_array_fleet, 1000)
+        assert array_bytes * 3 < object_bytes
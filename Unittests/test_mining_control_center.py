@@ -5,27 +5,15 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from collections import deque
 
 from Vehicles.h3_mining_truck import H3MiningTruck
+from const import CatchUpPolicy, MiningType, SimulationMode
 from mining_control_center import MiningControlCenter
+from virtual_time_loop import run_in_virtual_time
 
 
+@pytest.mark.usefixtures("dummy_logger")
 class TestMiningControlCenter(unittest.IsolatedAsyncioTestCase):
     """Test the MiningControlCenter class."""
 
-    class DummyLogger:
-        """Mock Logger for logging; Use this class instead of SimulationLogger."""
-
-        def __init__(self, log_msgs):
-            self._log_msgs = log_msgs
-            self.thread = AsyncMock()
-
-        def log(self, message):
-            """Save log messages to log_msgs"""
-            self._log_msgs.append(message)
-
-        def reset(self, start_time_in_unix_timestamp, sim_time_unit):
-            """Mocking reset function. Do nothing."""
-            pass
-
     def _make_unload_stations(self) -> deque:
         """Create unload station mock queue."""
         unload_station = MagicMock(name="Unload Station X")
@@ -37,28 +25,20 @@ class TestMiningControlCenter(unittest.IsolatedAsyncioTestCase):
         """Create a Trcuk mock"""
         truck = MagicMock()
         truck.name = name
+        truck.mining_type = MiningType.HELIUM_3
         truck.start_to_mining = AsyncMock()
+        # First unload: no cycle time yet, and unloaded as soon as it arrived
+        truck.record_unload.return_value = (None, 5)
         return truck
 
     def setUp(self):
         """Prepare for tests."""
-        self._control_center = MiningControlCenter(n=5, m=2, sim_time_unit=10)
+        self._control_center = MiningControlCenter(n=5, m=2, sim_time_unit=10, logger=self._logger)
         self._control_center._trucks = deque(
             [self._make_truck(name=f"Truck {i}") for i in range(5)]
         )
         self._control_center._unload = AsyncMock()
         self._control_center._send_truck = AsyncMock()
-        self._log_msgs = []
-        self._logger = self.DummyLogger(self._log_msgs)
-        self._logger_patch = patch(
-            target="simulation_logger.SimulationLogger.get_instance",
-            return_value=self._logger,
-        )
-        self._logger_patch.start()
-
-    def tearDown(self):
-        """Clean up."""
-        self._logger_patch.stop()
 
     @pytest.mark.asyncio
     async def test_truck_arrived_and_unload_station_available(self):
@@ -99,6 +79,7 @@ class TestMiningControlCenter(unittest.IsolatedAsyncioTestCase):
 
         truck = self._make_truck()
         truck.start_to_wait = 1
+        self._control_center._get_sim_time = lambda: 10
         self._control_center._trucks_to_unload = deque()
 
         truck_wait = self._make_truck("Truck Wait")
@@ -110,6 +91,17 @@ class TestMiningControlCenter(unittest.IsolatedAsyncioTestCase):
         assert 0 == len(self._control_center._trucks_to_unload)
         self.assertEqual(self._control_center._unload.call_count, 1)
 
+    def test_each_control_center_owns_logger(self):
+        """Test: trucks and unload stations use the logger of their control center."""
+        control_center = MiningControlCenter(n=2, m=2, sim_time_unit=10)
+        other_control_center = MiningControlCenter(n=2, m=2, sim_time_unit=10)
+
+        assert control_center._logger is not other_control_center._logger
+        for truck in control_center._trucks:
+            assert control_center._logger is truck.logger
+        for unload_station in control_center._unload_stations:
+            assert control_center._logger is unload_station.logger
+
     @pytest.mark.asyncio
     @patch("asyncio.sleep", return_value=None)  # Skip wait time
     @patch("time_converter.convert_sim_time_to_real_time_in_sec", side_effect=(15, 5))
@@ -136,4 +128,117 @@ class TestMiningControlCenter(unittest.IsolatedAsyncioTestCase):
 
         # Verify all 5 trucks start to mining
         for truck in self._control_center._trucks:
-            assert truck.start_to_mining.called
\ No newline at end of file
+            assert truck.start_to_mining.called
+
+    @pytest.mark.asyncio
+    @patch("asyncio.sleep", return_value=None)  # Skip wait time
+    async def test_wait_until(self, mock_sleep):
+        """Test: waits until absolute deadlines and saves the lag of phases; SLIP slips the schedule by a long lag."""
+        # The clock after the deadline of minute 110: 0.1 seconds later without a wait, or 0.2 seconds late after it.
+        for policy, expected_slipped, clock in [(CatchUpPolicy.BURST, 0, 15.6), (CatchUpPolicy.SLIP, 5, 16.2)]:
+            control_center = MiningControlCenter(
+                n=1, m=1, sim_time_unit=10, logger=self._logger, catch_up_policy=policy, max_lag=1
+            )
+            control_center._start_time_in_unix_tic = 0
+            # Minute 100 is due at 10 seconds but the host is 5 seconds late: no wait.
+            control_center._clock = MagicMock(side_effect=[15, 15])
+            await control_center.wait_until(sim_time=100)
+            mock_sleep.assert_not_awaited()
+            assert 100 == control_center._get_sim_time_from_deadline()
+            assert expected_slipped == control_center.slipped
+
+            # Minute 110 is due at 11 seconds (+ slipped schedule).
+            control_center._clock = MagicMock(side_effect=[15.5, clock])
+            await control_center.wait_until(sim_time=110)
+            if policy == CatchUpPolicy.SLIP:
+                mock_sleep.assert_awaited_once_with(0.5)
+            mock_sleep.reset_mock()
+
+            # The notification of minute 120 is late too, but it is not a phase.
+            control_center._clock = MagicMock(side_effect=[30])
+            await control_center.wait_until(sim_time=120, record_lag=False)
+            mock_sleep.assert_not_awaited()
+            assert 120 == control_center._get_sim_time_from_deadline()
+            assert expected_slipped == control_center.slipped
+            pacing = control_center.pacing()
+            assert 2 == pacing["phases"]
+            assert 5 == pytest.approx(pacing["max_lag"], rel=0.02)
+
+    def test_mixed_fleet(self):
+        """Test: trucks of each mining type unload only at unload stations which serve the type."""
+        control_center = MiningControlCenter(
+            n=30, m=4, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=self._logger, seed=1,
+            truck_mix={MiningType.HELIUM_3: 20, MiningType.REGOLITH: 10},
+            station_types=[
+                [MiningType.HELIUM_3],
+                [MiningType.HELIUM_3],
+                [MiningType.REGOLITH],
+                [MiningType.REGOLITH, MiningType.HELIUM_3],
+            ],
+        )
+        control_center.simulate(duration=72)
+
+        assert ["H3 Truck #1", "Regolith Truck #21"] == [control_center._trucks[i].name for i in (0, 20)]
+        assert "Regolith Unload Station #4" == control_center._unload_stations[3].name
+        summaries = control_center.summarize_mining_types(duration=72 * 60)
+        assert 3 == summaries[MiningType.HELIUM_3]["unload_stations"]
+        assert 2 == summaries[MiningType.REGOLITH]["unload_stations"]
+        assert control_center.unloads == sum(summary["unloads"] for summary in summaries.values())
+        # H3 unload stations unloaded H3 trucks only; regolith unload stations share the rest.
+        h3_station_unloads = sum(station.report()["Total unloads"] for station in control_center._unload_stations[:2])
+        assert 0 < h3_station_unloads <= summaries[MiningType.HELIUM_3]["unloads"]
+        assert 10 == control_center._unload_stations[2].UNLOADING_TIME
+
+    def test_unloading_time_by_mining_type(self):
+        """Test: an unload station serving several mining types unloads each truck in the time of its mining type,
+            in both the discrete event engine and the truck and unload station coroutines."""
+        for mode in [SimulationMode.DISCRETE_EVENT, SimulationMode.VIRTUAL_TIME]:
+            control_center = MiningControlCenter(
+                n=2, m=1, sim_time_unit=1, mode=mode, logger=self._logger,
+                truck_mix={MiningType.HELIUM_3: 1, MiningType.REGOLITH: 1},
+                station_types=[[MiningType.REGOLITH, MiningType.HELIUM_3]],
+            )
+            station = control_center._unload_stations[0]
+            h3_truck, regolith_truck = control_center._trucks
+            assert (5, 10) == (station.get_unloading_time(h3_truck), station.get_unloading_time(regolith_truck))
+
+            # The regolith truck arrives at 140 and the H3 truck at 180; both unload without waiting.
+            with patch("Vehicles.mining_truck.randint", side_effect=[150, 120, 1000, 1000]):
+                if mode == SimulationMode.DISCRETE_EVENT:
+                    control_center.simulate(duration=4)
+                else:
+                    run_in_virtual_time(control_center.run(duration=4))
+            assert 2 == control_center.unloads
+            assert 15 == station.report()["Total unloading time"]
+            summaries = control_center.summarize_mining_types(duration=4 * 60)
+            assert 0 == summaries[MiningType.HELIUM_3]["mean_wait_per_unload"]
+
+    def test_mixed_fleet_waits_in_order(self):
+        """Test: an unload station serving several mining types unloads the truck which has waited the longest."""
+        control_center = MiningControlCenter(
+            n=3, m=1, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=self._logger,
+            truck_mix={MiningType.REGOLITH: 1, MiningType.HELIUM_3: 2},
+            station_types=[[MiningType.HELIUM_3, MiningType.REGOLITH]],
+        )
+        station = control_center._unload_stations[0]
+        regolith_truck, first_truck, second_truck = control_center._trucks
+        control_center._get_sim_time = lambda: 100
+        assert station is control_center.dispatch_arrived_truck(truck=first_truck)
+        assert control_center.dispatch_arrived_truck(truck=second_truck) is None
+        control_center._get_sim_time = lambda: 102
+        assert control_center.dispatch_arrived_truck(truck=regolith_truck) is None
+
+        control_center._get_sim_time = lambda: 105
+        assert second_truck is control_center.dispatch_unloaded_truck(truck=first_truck, station=station)
+        control_center._get_sim_time = lambda: 110
+        assert regolith_truck is control_center.dispatch_unloaded_truck(truck=second_truck, station=station)
+        control_center._get_sim_time = lambda: 120
+        assert control_center.dispatch_unloaded_truck(truck=regolith_truck, station=station) is None
+        assert station is control_center.dispatch_arrived_truck(truck=first_truck)
+
+    def test_invalid_mixed_fleet(self):
+        """Test: the truck mix must have n trucks and every mining type of trucks needs an unload station."""
+        with self.assertRaises(ValueError):
+            MiningControlCenter(n=3, m=1, sim_time_unit=10, truck_mix={MiningType.REGOLITH: 2})
+        with self.assertRaises(ValueError):
+            MiningControlCenter(n=2, m=1, sim_time_unit=10, truck_mix={MiningType.REGOLITH: 2})
@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from const import SimulationMode
+from mining_control_center import MiningControlCenter
+from monte_carlo_engine import MonteCarloEngine
+
+
+class TestMonteCarloEngine(unittest.TestCase):
+    """Test the MonteCarloEngine class."""
+
+    def test_trucks_wait_for_unload_station(self):
+        """Test: 3 trucks arrive at 180 at the same time and unload one by one until 195."""
+        result = MonteCarloEngine(
+            n=3, m=1, replications=3, shortest_mining_time=150, longest_mining_time=150
+        ).run(duration=4)
+
+        np.testing.assert_array_equal([[1, 1, 1]] * 3, result.truck_total_mining)
+        np.testing.assert_array_equal([[150, 150, 150]] * 3, result.truck_total_mining_time)
+        np.testing.assert_array_equal([[0, 10, 15]] * 3, result.truck_total_wait_time)
+        np.testing.assert_array_equal([3, 3, 3], result.unloads)
+        # The third truck sees the second truck in queue.
+        np.testing.assert_array_equal([1, 1, 1], result.max_queue_length)
+
+    def test_same_totals_as_discrete_event_engine(self):
+        """Test: totals are the same as the discrete event engine with the same mining time."""
+        result = MonteCarloEngine(
+            n=7, m=2, replications=2, shortest_mining_time=100, longest_mining_time=100
+        ).run(duration=24)
+
+        control_center = MiningControlCenter(n=7, m=2, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT)
+        with patch("Vehicles.mining_truck.randint", return_value=100):
+            control_center.simulate(duration=24)
+
+        for replication in range(2):
+            assert control_center.unloads == result.unloads[replication]
+            assert [truck.total_mining for truck in control_center._trucks] == list(
+                result.truck_total_mining[replication]
+            )
+            assert [truck.total_wait_time for truck in control_center._trucks] == list(
+                result.truck_total_wait_time[replication]
+            )
+
+    def test_summary(self):
+        """Test: replications are independent and summarized across replications."""
+        result = MonteCarloEngine(n=10, m=1, replications=200, seed=1).run(duration=72)
+        summary = result.summary()
+
+        assert result.unloads.std() > 0
+        assert 0 < summary["Unloading utilization"]["mean"] < 1
+        assert summary["Total unloads"]["ci95"] < summary["Total unloads"]["std"]
+        assert (result.station_utilization() <= 1).all()
+
+    def test_seed(self):
+        """Test: the same seed gives the same result."""
+        first = MonteCarloEngine(n=5, m=2, replications=10, seed=7).run(duration=10)
+        second = MonteCarloEngine(n=5, m=2, replications=10, seed=7).run(duration=10)
+        np.testing.assert_array_equal(first.truck_total_wait_time, second.truck_total_wait_time)
+        np.testing.assert_array_equal(first.station_total_unloads, second.station_total_unloads)
+
+    def test_invalid_parameters(self):
+        """Test: n, m and replications must be positive."""
+        with self.assertRaises(ValueError):
+            MonteCarloEngine(n=0, m=1, replications=1)
+        with self.assertRaises(ValueError):
+            MonteCarloEngine(n=1, m=1, replications=0)
+
+    def test_antithetic_pairs(self):
+        """Test: antithetic runs have whole pairs only, and pairs are by the index of the whole run."""
+        for first_replication, replications in [(1, 2), (0, 3)]:
+            with self.assertRaises(ValueError):
+                MonteCarloEngine(
+                    n=5, m=1, replications=replications, first_replication=first_replication, antithetic=True
+                )
+
+        whole = MonteCarloEngine(n=5, m=1, replications=4, seed=2, antithetic=True).run(duration=24)
+        # A batch from replication 2 pairs (2, 3), same as the second pair of the whole run
+        batch = MonteCarloEngine(n=5, m=1, replications=2, seed=2, first_replication=2, antithetic=True).run(
+            duration=24
+        )
+        np.testing.assert_array_equal(whole.unloads[2:], batch.unloads)
+        # Results from an odd replication (e.g., replications 1 to 4 of concatenated batches) pair 2k with 2k + 1
+        whole.first_replication = 1
+        pairs = np.array([whole.unloads[0], whole.unloads[1:3].mean(), whole.unloads[3]])
+        assert np.isclose(1.96 * pairs.std(ddof=1) / np.sqrt(3), whole.summary()["Total unloads"]["ci95"])
+
+    def test_common_random_numbers(self):
+        """Test: with the same seed, trucks mine the same times regardless of the number of unload stations."""
+        one_station = MonteCarloEngine(n=5, m=1, replications=4, seed=3).run(duration=24)
+        two_stations = MonteCarloEngine(n=5, m=2, replications=4, seed=3).run(duration=24)
+        # A truck which mined the same number of times mined the same total time, although it waited differently.
+        same_count = one_station.truck_total_mining == two_stations.truck_total_mining
+        assert same_count.sum() > 10
+        np.testing.assert_array_equal(
+            one_station.truck_total_mining_time[same_count], two_stations.truck_total_mining_time[same_count]
+        )
+        assert (one_station.truck_total_wait_time != two_stations.truck_total_wait_time).any()
+
+        # Replications run in batches are the same as in a single run.
+        batch = MonteCarloEngine(n=5, m=1, replications=2, seed=3, first_replication=2).run(duration=24)
+        np.testing.assert_array_equal(one_station.truck_total_wait_time[2:], batch.truck_total_wait_time)
+
+    def test_wait_time_quantile(self):
+        """Test: wait time quantiles per replication from the wait histogram."""
+        result = MonteCarloEngine(
+            n=3, m=1, replications=2, shortest_mining_time=150, longest_mining_time=150,
+            record_wait_distribution=True,
+        ).run(duration=4)
+        # Waits: 0, 10 and 15 minutes
+        np.testing.assert_array_equal([0, 0], result.wait_time_quantile(0))
+        np.testing.assert_array_equal([10, 10], result.wait_time_quantile(0.5))
+        np.testing.assert_array_equal([15, 15], result.wait_time_quantile(1))
+        np.testing.assert_allclose([25 / 3, 25 / 3], result.mean_wait_time())
+        with self.assertRaises(ValueError):
+            MonteCarloEngine(n=3, m=1, replications=1).run(duration=4).wait_time_quantile(0.5)
+
+    def test_wait_histogram_grows(self):
+        """Test: waits longer than the initial histogram are counted at their own minute, not in the last bin."""
+        grown = MonteCarloEngine(
+            n=3, m=1, replications=2, shortest_mining_time=150, longest_mining_time=150,
+            record_wait_distribution=True, max_wait_time=4,
+        ).run(duration=4)
+        # Waits: 0, 10 and 15 minutes
+        assert grown.wait_histogram.shape[1] > 15
+        assert 3 == grown.wait_histogram[0].sum()
+        np.testing.assert_array_equal([15, 15], grown.wait_time_quantile(1))
@@ -0,0 +1,67 @@
+import asyncio
+import io
+import math
+import random
+import unittest
+
+from const import SimulationMode
+from mining_control_center import MiningControlCenter
+from mva_solver import MVASolver
+from simulation_logger import SimulationLogger
+
+
+class TestMVASolver(unittest.TestCase):
+    """Test the MVASolver class."""
+
+    def test_single_truck(self):
+        """Test: a single truck never waits; it unloads once a cycle."""
+        result = MVASolver(n=1, m=1).solve()
+        # Cycle: mining 180 + travel 2 * 30 + unloading 5 minutes
+        assert math.isclose(245, result["mean_cycle_time"])
+        assert math.isclose(1 / 245, result["throughput"])
+        assert 0 == result["mean_queueing_delay"]
+
+    def test_saturated_stations(self):
+        """Test: the throughput never exceeds the capacity of the unload stations."""
+        result = MVASolver(n=500, m=5).solve()
+        assert math.isclose(1.0, result["unloading_utilization"])
+        assert math.isclose(5 / 5, result["throughput"])
+        # 500 trucks share 1 unload per minute: 500 minutes per cycle
+        assert math.isclose(500, result["mean_cycle_time"])
+
+    def test_exponential_unloading_waits_longer(self):
+        """Test: variable unloading makes trucks wait longer than the fixed unloading time."""
+        fixed = MVASolver(n=40, m=1).solve()
+        exponential = MVASolver(n=40, m=1, unloading_scv=1.0).solve()
+        assert exponential["mean_queueing_delay"] > fixed["mean_queueing_delay"]
+        assert exponential["throughput"] < fixed["throughput"]
+
+    def test_invalid_parameters(self):
+        """Test: the network needs trucks and unload stations."""
+        with self.assertRaises(ValueError):
+            MVASolver(n=0, m=1)
+
+    def test_compare_with_simulation(self):
+        """Test: the analytic model agrees with a long discrete event simulation."""
+        random.seed(0)
+        control_center = MiningControlCenter(n=40, m=1, sim_time_unit=1, mode=SimulationMode.DISCRETE_EVENT)
+        control_center.simulate(duration=500)
+
+        comparison = control_center.compare_with_analytic(duration=500 * 60)
+        expected, simulated = comparison["Throughput (unloads/hour)"]
+        assert math.isclose(expected, simulated, rel_tol=0.03)
+        expected, simulated = comparison["Unloading utilization (%)"]
+        assert math.isclose(expected, simulated, rel_tol=0.03)
+        expected, simulated = comparison["Mean queueing delay (min)"]
+        assert math.isclose(expected, simulated, rel_tol=0.2)
+
+    def test_run_analytic(self):
+        """Test: the analytic mode reports the expected statistics without simulating."""
+        stream = io.StringIO()
+        control_center = MiningControlCenter(
+            n=1, m=1, sim_time_unit=10, mode=SimulationMode.ANALYTIC, logger=SimulationLogger(stream=stream)
+        )
+        # A cycle takes 245 minutes: 60 unloads in 245 hours
+        asyncio.run(control_center.run(duration=245))
+        assert 0 == control_center.unloads
+        assert "Expected unloads          | 60 " in stream.getvalue()
@@ -0,0 +1,94 @@
+import argparse
+import csv
+import os
+import tempfile
+import unittest
+
+from parameter_sweep import make_scenarios, parse_range, run_scenario, sweep
+
+
+def crash_runner(n: int, m: int, seed: int, duration: int):
+    """Runner which kills its worker process for 13 trucks."""
+    if n == 13:
+        os._exit(1)
+    if n == 14:
+        raise ValueError("Invalid scenario")
+    return {"trucks": n, "unload_stations": m, "seed": seed, "duration": duration * 60}
+
+
+class TestParameterSweep(unittest.TestCase):
+    """Test the parameter sweep."""
+
+    def setUp(self):
+        """Prepare for tests."""
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self._output_path = os.path.join(self._temp_dir.name, "sweep.csv")
+
+    def tearDown(self):
+        """Clean up."""
+        self._temp_dir.cleanup()
+
+    def _read_rows(self):
+        with open(self._output_path, newline="") as output:
+            return list(csv.DictReader(output))
+
+    def test_make_scenarios(self):
+        """Test: every (trucks, unload stations) pair has R seeds."""
+        scenarios = make_scenarios(trucks=range(1, 3), unload_stations=[1], replications=2, duration=5, seed=10)
+        assert [(1, 1, 10, 5), (1, 1, 11, 5), (2, 1, 10, 5), (2, 1, 11, 5)] == scenarios
+
+    def test_run_scenario(self):
+        """Test: the same seed gives the same result."""
+        assert run_scenario(n=5, m=1, seed=3, duration=24) == run_scenario(n=5, m=1, seed=3, duration=24)
+        summary = run_scenario(n=5, m=1, seed=3, duration=24)
+        assert 5 == summary["trucks"]
+        assert 24 * 60 == summary["duration"]
+        assert summary["unloads"] > 0
+
+    def test_sweep(self):
+        """Test: all results are streamed into the CSV file."""
+        scenarios = make_scenarios(trucks=[2, 4], unload_stations=[1, 2], replications=2, duration=12)
+        assert 8 == sweep(scenarios=scenarios, output_path=self._output_path, max_workers=2)
+
+        rows = self._read_rows()
+        assert 8 == len(rows)
+        assert {("2", "1"), ("2", "2"), ("4", "1"), ("4", "2")} == {
+            (row["trucks"], row["unload_stations"]) for row in rows
+        }
+        assert all(row["error"] == "" for row in rows)
+
+    def test_sweep_survives_worker_crash(self):
+        """Test: finished results are kept and failed scenarios are recorded when a worker crashes."""
+        scenarios = make_scenarios(trucks=[11, 12, 13, 14], unload_stations=[1], replications=1, duration=1)
+        finished = sweep(
+            scenarios=scenarios, output_path=self._output_path, max_workers=2, max_retries=1, runner=crash_runner
+        )
+
+        rows = {row["trucks"]: row for row in self._read_rows()}
+        assert 2 == finished
+        assert {"11", "12", "13", "14"} == set(rows)
+        assert "" == rows["11"]["error"] == rows["12"]["error"]
+        assert "worker process crashed" == rows["13"]["error"]
+        assert "Invalid scenario" in rows["14"]["error"]
+
+    def test_sweep_crash_without_retries(self):
+        """Test: without retries, only the crashing scenario fails; duplicate scenarios are counted separately."""
+        scenarios = [(13, 1, 0, 1)] + [(11, 1, 0, 1)] * 5
+        finished = sweep(
+            scenarios=scenarios, output_path=self._output_path, max_workers=2, max_retries=0, runner=crash_runner
+        )
+
+        rows = self._read_rows()
+        assert 5 == finished
+        assert 6 == len(rows)
+        assert ["worker process crashed"] == [row["error"] for row in rows if row["trucks"] == "13"]
+        assert all("" == row["error"] for row in rows if row["trucks"] == "11")
+
+    def test_parse_range(self):
+        """Test: parse range arguments (stop inclusive)."""
+        assert range(10, 501, 10) == parse_range("10:500:10")
+        assert range(1, 41) == parse_range("1:40")
+        assert range(5, 6) == parse_range("5")
+        for value in ["0:5", "5:1", "1:5:0", "a:b"]:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_range(value)
@@ -0,0 +1,89 @@
+import random
+import unittest
+
+import numpy as np
+
+from const import SimulationMode
+from mining_control_center import MiningControlCenter
+from monte_carlo_engine import MonteCarloEngine
+from random_streams import MiningTimeStream, mix, mix_array
+
+
+class TestRandomStreams(unittest.TestCase):
+    """Test the seeded random substreams."""
+
+    def _simulate(self, n: int, m: int, seed: int, **kwargs) -> MiningControlCenter:
+        control_center = MiningControlCenter(
+            n=n, m=m, sim_time_unit=1, mode=SimulationMode.DISCRETE_EVENT, seed=seed, **kwargs
+        )
+        control_center.simulate(duration=24)
+        return control_center
+
+    def test_mix_array_is_same_as_mix(self):
+        """Test: the NumPy and the Python hash give the same bits."""
+        values = [0, 1, 2 ** 63, 2 ** 64 - 1, 0x9E3779B97F4A7C15]
+        assert [mix(value) for value in values] == list(mix_array(np.array(values, dtype=np.uint64)))
+
+    def test_stream(self):
+        """Test: a stream gives the same uniform mining times for the same seed and truck."""
+        stream = MiningTimeStream(seed=1, truck_id=1, shortest_mining_time=60, longest_mining_time=300)
+        mining_times = [stream.next() for _ in range(10000)]
+        assert all(60 <= mining_time <= 300 for mining_time in mining_times)
+        assert abs(sum(mining_times) / len(mining_times) - 180) < 3
+
+        same_stream = MiningTimeStream(seed=1, truck_id=1, shortest_mining_time=60, longest_mining_time=300)
+        assert mining_times[:100] == [same_stream.next() for _ in range(100)]
+        other_truck = MiningTimeStream(seed=1, truck_id=2, shortest_mining_time=60, longest_mining_time=300)
+        assert mining_times[:100] != [other_truck.next() for _ in range(100)]
+
+    def test_antithetic_stream(self):
+        """Test: replication 2k + 1 of antithetic streams mirrors the mining times of replication 2k."""
+        even = MiningTimeStream(
+            seed=4, truck_id=3, shortest_mining_time=60, longest_mining_time=300, replication=2, antithetic=True
+        )
+        odd = MiningTimeStream(
+            seed=4, truck_id=3, shortest_mining_time=60, longest_mining_time=300, replication=3, antithetic=True
+        )
+        for _ in range(100):
+            assert 360 == even.next() + odd.next()
+
+    def test_reproducible_regardless_of_random_module(self):
+        """Test: other users of the random module do not change the simulation."""
+        random.seed(1)
+        first = self._simulate(n=10, m=2, seed=42)
+        random.seed(2)
+        second = self._simulate(n=10, m=2, seed=42)
+        assert first.summarize(duration=24 * 60) == second.summarize(duration=24 * 60)
+
+    def test_same_mining_times_across_configurations(self):
+        """Test: a truck mines the same times with any number of trucks and unload stations."""
+        small = self._simulate(n=3, m=1, seed=7)
+        large = self._simulate(n=10, m=4, seed=7)
+        for small_truck, large_truck in zip(small._trucks, large._trucks):
+            if small_truck.total_mining == large_truck.total_mining:
+                assert small_truck.total_mining_time == large_truck.total_mining_time
+
+    def test_same_as_monte_carlo_engine(self):
+        """Test: replication r of the discrete event engine and MonteCarloEngine are the same."""
+        result = MonteCarloEngine(n=7, m=2, replications=3, seed=11).run(duration=24)
+        control_center = self._simulate(n=7, m=2, seed=11, replication=2)
+
+        assert control_center.unloads == result.unloads[2]
+        assert [truck.total_mining_time for truck in control_center._trucks] == list(
+            result.truck_total_mining_time[2]
+        )
+        assert [truck.total_wait_time for truck in control_center._trucks] == list(
+            result.truck_total_wait_time[2]
+        )
+
+    def test_antithetic_monte_carlo(self):
+        """Test: antithetic pairs of MonteCarloEngine mirror each other and the discrete event engine."""
+        result = MonteCarloEngine(n=7, m=2, replications=4, seed=11, antithetic=True).run(duration=24)
+        for replication in range(4):
+            control_center = self._simulate(n=7, m=2, seed=11, replication=replication, antithetic=True)
+            assert control_center.unloads == result.unloads[replication]
+            assert [truck.total_mining_time for truck in control_center._trucks] == list(
+                result.truck_total_mining_time[replication]
+            )
+        summary = result.summary()
+        assert summary["Total unloads"]["ci95"] >= 0
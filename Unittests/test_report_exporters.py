@@ -0,0 +1,103 @@
+import csv
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from const import SimulationMode
+from mining_control_center import MiningControlCenter
+from report_exporters import Column, CsvExporter, JsonLinesExporter, ParquetExporter, TableExporter, format_percent
+
+
+def simulate(seed: int = 1) -> MiningControlCenter:
+    control_center = MiningControlCenter(n=5, m=2, sim_time_unit=1, mode=SimulationMode.DISCRETE_EVENT, seed=seed)
+    control_center.simulate(duration=24)
+    return control_center
+
+
+class TestReportExporters(unittest.TestCase):
+    """Test the report exporters."""
+
+    def test_table(self):
+        """Test: a table is logged in a single message with formatted values."""
+        logger = MagicMock()
+        exporter = TableExporter(logger=logger)
+        exporter.begin_table(
+            name="test", columns=[Column(key="name", header="Name"), Column("ratio", "Ratio", fmt=format_percent)]
+        )
+        exporter.write_row(["a", 0.5])
+        exporter.write_row(["long name", None])
+        exporter.end_table()
+
+        logger.log.assert_called_once()
+        assert logger.log.call_args.args[0].split("\n") == [
+            " -----------+--------",
+            "| Name      | Ratio  |",
+            " -----------+--------",
+            "| a         | 50.0 % |",
+            "| long name | -      |",
+            " -----------+--------",
+        ]
+
+    def test_json_lines(self):
+        """Test: every truck, every unload station and the run summary are a line with raw values."""
+        control_center = simulate()
+        stream = io.StringIO()
+        with JsonLinesExporter(stream=stream) as exporter:
+            control_center.export(duration=24 * 60, exporter=exporter)
+
+        records = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [record["table"] for record in records] == ["trucks"] * 5 + ["unload_stations"] * 2 + ["summary"]
+        truck = control_center._trucks[0]
+        assert records[0] == {
+            "table": "trucks",
+            "name": truck.name,
+            "total_mining": truck.total_mining,
+            "total_mining_time": truck.total_mining_time,
+            "mining_utilization": truck.total_mining_time / (24 * 60),
+            "total_wait_time": truck.total_wait_time,
+        }
+        assert sum(record["total_unloads"] for record in records[5:7]) == control_center.unloads
+        assert records[-1]["mode"] == "DISCRETE_EVENT"
+        assert records[-1]["seed"] == 1
+        assert records[-1]["unloads"] == control_center.unloads
+
+    def test_csv(self):
+        """Test: a CSV file per table; run summaries are appended to one file."""
+        with tempfile.TemporaryDirectory() as directory:
+            for seed in (1, 2):
+                with CsvExporter(directory=directory) as exporter:
+                    simulate(seed=seed).export(duration=24 * 60, exporter=exporter)
+
+            with open(os.path.join(directory, "trucks.csv"), newline="") as file:
+                trucks = list(csv.DictReader(file))
+            with open(os.path.join(directory, "summary.csv"), newline="") as file:
+                summaries = list(csv.DictReader(file))
+
+        assert len(trucks) == 5
+        assert trucks[0]["name"] == "H3 Truck #1"
+        assert [summary["seed"] for summary in summaries] == ["1", "2"]
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet(self):
+        """Test: a Parquet file per table, written in batches."""
+        import pyarrow.parquet
+
+        control_center = simulate()
+        with tempfile.TemporaryDirectory() as directory:
+            with ParquetExporter(directory=directory, batch_size=2) as exporter:
+                control_center.export(duration=24 * 60, exporter=exporter)
+            trucks = pyarrow.parquet.read_table(os.path.join(directory, "trucks.parquet"))
+
+        assert trucks.num_rows == 5
+        assert trucks.column("name").to_pylist()[0] == "H3 Truck #1"
+
+    @unittest.skipIf(importlib.util.find_spec("pyarrow"), "pyarrow is installed")
+    def test_parquet_without_pyarrow(self):
+        """Test: ParquetExporter tells pyarrow is required."""
+        with tempfile.TemporaryDirectory() as directory:
+            with self.assertRaises(ImportError):
+                ParquetExporter(directory=directory)
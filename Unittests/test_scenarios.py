@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from const import SimulationMode
+from mining_control_center import MiningControlCenter
+from scenarios import UNPACED, load_scenario_file, make_scenarios, run_scenarios, write_results
+from simulation_logger import SimulationLogger
+
+
+class TestScenarios(unittest.TestCase):
+    """Test scenario files and the batch runner."""
+
+    def test_load_scenario_file(self):
+        """Test: defaults of the file apply to every scenario, and lists make a scenario per combination."""
+        document = {
+            "defaults": {"duration": 24, "seed": 3},
+            "scenario": [
+                {"name": "sweep", "trucks": [10, 20], "stations": [1, 2]},
+                {"trucks": 5, "stations": 1, "mode": "real_time", "time_scale": UNPACED},
+            ],
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "fleets.json")
+            with open(path, "w") as file:
+                json.dump(document, file)
+            settings = load_scenario_file(path)
+        scenarios = [scenario for item in settings for scenario in make_scenarios(item)]
+
+        assert ["sweep-n10-m1", "sweep-n10-m2", "sweep-n20-m1", "sweep-n20-m2", "fleets-2"] == [
+            scenario.name for scenario in scenarios
+        ]
+        assert all(24 == scenario.duration and 3 == scenario.seed for scenario in scenarios)
+        # Unpaced real time runs in virtual time
+        assert SimulationMode.VIRTUAL_TIME == scenarios[-1].mode
+        # Overrides (e.g., flags) replace the settings of the file
+        assert [48] == [scenario.duration for scenario in make_scenarios(settings[1], overrides={"duration": 48})]
+
+    def test_invalid_settings(self):
+        """Test: unknown, missing and invalid settings are rejected."""
+        for settings in [
+            {"trucks": 5, "stations": 1, "speed": 2},
+            {"trucks": 5},
+            {"trucks": 5, "stations": 0},
+            {"trucks": 5, "stations": 1, "mode": "fast"},
+            {"trucks": 5, "stations": 1, "time_scale": 0},
+            {"trucks": 5, "stations": 1, "shortest_mining_time": 60, "longest_mining_time": 30},
+            {"trucks": 5, "stations": 1, "longest_mining_time": 200.5},
+            {"trucks": 5, "stations": 1, "log_level": 10},
+            {"trucks": 5, "stations": 1, "report_mode": 1},
+        ]:
+            with self.assertRaises(ValueError):
+                make_scenarios(settings)
+
+    def test_time_constants(self):
+        """Test: time constants of a scenario replace those of const.py."""
+        scenario, = make_scenarios({
+            "trucks": 10, "stations": 1, "duration": 24, "seed": 7, "unloading_time": 20, "travel_time": 10,
+            "shortest_mining_time": 30, "longest_mining_time": 30,
+        })
+        record, = run_scenarios([scenario], stream=io.StringIO())
+
+        # Every cycle takes 30 + 10 + 20 + 10 minutes at least; the only unload station is the bottleneck.
+        assert 24 * 60 // 20 - 2 <= record["unloads"] <= 24 * 60 // 20
+        assert record["unloading_utilization"] > 0.95
+        assert 20 == scenario.unloading_time
+
+    def test_replications(self):
+        """Test: each replication of a scenario gives the same result as a run of the same replication."""
+        scenario, = make_scenarios({"trucks": 10, "stations": 2, "duration": 24, "seed": 5, "replications": 2})
+        records = run_scenarios([scenario], stream=io.StringIO())
+
+        assert [0, 1] == [record["replication"] for record in records]
+        for replication, record in enumerate(records):
+            control_center = MiningControlCenter(
+                n=10, m=2, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=SimulationLogger(), seed=5,
+                replication=replication,
+            )
+            control_center.simulate(duration=24)
+            assert control_center.summarize(duration=24 * 60).items() <= record.items()
+
+    def test_write_results(self):
+        """Test: records of every mode are written with the union of their keys."""
+        scenarios = make_scenarios({"trucks": 5, "stations": 1, "duration": 6, "seed": 1}) + make_scenarios(
+            {"trucks": 5, "stations": 1, "duration": 6, "mode": "analytic"}
+        )
+        records = run_scenarios(scenarios, stream=io.StringIO())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.csv")
+            write_results(path, records)
+            with open(path, newline="") as file:
+                rows = list(csv.DictReader(file))
+            path = os.path.join(directory, "results.jsonl")
+            write_results(path, records)
+            with open(path) as file:
+                lines = [json.loads(line) for line in file]
+
+        assert ["DISCRETE_EVENT", "ANALYTIC"] == [row["mode"] for row in rows]
+        assert "throughput" in rows[0] and "" == rows[0]["throughput"]
+        assert "unloads" in rows[1] and "" == rows[1]["unloads"]
+        assert records[0]["unloads"] == lines[0]["unloads"]
+        with self.assertRaises(ValueError):
+            write_results("results.txt", records)
@@ -0,0 +1,103 @@
+import math
+import random
+import unittest
+
+from const import SimulationMode
+from mining_control_center import MiningControlCenter
+from sequential_stopping import (
+    Estimate,
+    IntervalSeries,
+    PrecisionResult,
+    batch_means,
+    format_result,
+    mser,
+    run_batch_means,
+    run_replications,
+    student_t_quantile,
+)
+
+
+class TestSequentialStopping(unittest.TestCase):
+    """Test warm-up truncation and sequential stopping on confidence interval half-widths."""
+
+    def test_mser(self):
+        """Test: the truncation covers a transient and is 0 for a stationary series."""
+        rng = random.Random(1)
+        stationary = [10 + rng.gauss(0, 1) for _ in range(200)]
+        transient = [index / 2 for index in range(20)] + stationary
+        assert 20 <= mser(transient) <= 30
+        assert mser(stationary) <= 10
+        assert 0 == mser([1, 2, 3])
+
+    def test_student_t_quantile(self):
+        """Test: quantiles are close to the exact values, also with few degrees of freedom."""
+        for dof, expected in [(1, 12.706), (2, 4.303), (3, 3.182), (4, 2.776), (10, 2.228), (30, 2.042)]:
+            assert abs(student_t_quantile(0.975, dof) - expected) < 0.001 * expected
+        for dof, expected in [(1, 63.657), (2, 9.925), (3, 5.841), (4, 4.604), (5, 4.032)]:
+            assert abs(student_t_quantile(0.995, dof) - expected) < 0.001 * expected
+        assert -4.303 == round(student_t_quantile(0.025, 2), 3)
+
+    def test_format_result(self):
+        """Test: estimates are formatted as a table; metrics without a target have none."""
+        result = PrecisionResult(
+            estimates={"unloads_per_hour": Estimate(12.5, 0.25), "mean_wait_time": Estimate(1.0, math.inf)},
+            warm_up=0, duration=24, observations=5, converged=False,
+        )
+        assert format_result(result, targets={"unloads_per_hour": 0.5}) == [
+            " ------------------+---------+---------------+--------",
+            "| Metric           | Mean    | CI half-width | Target |",
+            " ------------------+---------+---------------+--------",
+            "| unloads_per_hour | 12.5000 | 0.2500        | 0.5    |",
+            "| mean_wait_time   | 1.0000  | inf           | -      |",
+            " ------------------+---------+---------------+--------",
+        ]
+
+    def test_interval_series(self):
+        """Test: totals of the intervals add up to the totals of the run."""
+        control_center = MiningControlCenter(n=20, m=2, sim_time_unit=1, mode=SimulationMode.DISCRETE_EVENT, seed=3)
+        series = IntervalSeries()
+        series.observe(control_center, intervals=24, interval=1)
+        assert 24 == len(series)
+        assert control_center.totals() == (
+            sum(series.unloads), sum(series.wait_time), sum(series.unloading_time)
+        )
+        # No truck unloads in the first hour: mining takes an hour at least, then 30 minutes of travel
+        assert 0 == series.unloads[0]
+
+        result = batch_means(series, m=2, interval=1, batches=4)
+        assert 4 == result.observations and 24 == result.duration
+
+    def test_run_batch_means(self):
+        """Test: the run continues until the half-width is below the target, with the warm-up truncated."""
+        loose = run_batch_means(n=50, m=2, targets={"unloads_per_hour": 5}, seed=2, batches=10)
+        tight = run_batch_means(n=50, m=2, targets={"unloads_per_hour": 0.3}, seed=2, batches=10)
+
+        assert loose.converged and tight.converged
+        assert loose.duration < tight.duration
+        assert tight.estimates["unloads_per_hour"].half_width <= 0.3
+        assert tight.warm_up > 0
+        # Little's law of the closed network: 50 trucks, each unloading about once per 3.5 hours
+        assert 12 < tight.estimates["unloads_per_hour"].mean < 16
+
+        limited = run_batch_means(n=50, m=2, targets={"mean_wait_time": 1e-6}, seed=2, batches=10, max_duration=60)
+        assert not limited.converged and limited.duration <= 60
+
+    def test_run_replications(self):
+        """Test: replications are added until the relative half-width is below the target."""
+        result = run_replications(
+            n=30, m=1, targets={"unloading_utilization": 0.02}, duration=48, seed=4, relative=True
+        )
+        estimate = result.estimates["unloading_utilization"]
+        assert result.converged and result.observations >= 5
+        assert estimate.half_width <= 0.02 * estimate.mean
+        assert not math.isinf(result.estimates["mean_wait_time"].half_width)
+
+        paired = run_replications(
+            n=30, m=1, targets={"unloading_utilization": 0.02}, duration=48, seed=4, relative=True, antithetic=True
+        )
+        assert paired.converged and paired.observations % 2 == 0
+
+        with self.assertRaises(ValueError):
+            run_replications(n=30, m=1, targets={"p95_wait_time": 1})
+        with self.assertRaises(ValueError):
+            run_replications(n=30, m=1, targets={"mean_wait_time": 1}, min_replications=1)
@@ -0,0 +1,92 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import numpy as np
+
+from fleet_store import FleetEngine
+from shared_results import SharedFleetResults, run_parallel_replications
+
+
+class FailingFleetEngine(FleetEngine):
+    """Fleet engine whose replication 1 fails."""
+
+    def __init__(self, replication: int = 0, **kwargs):
+        if replication == 1:
+            raise RuntimeError("replication 1 failed")
+        super().__init__(replication=replication, **kwargs)
+
+
+class TestSharedResults(unittest.TestCase):
+    """Test aggregation of parallel replications through shared memory."""
+
+    def test_write_and_attach(self):
+        """Test: rows written through an attached block are read by the creator without copying."""
+        engine = FleetEngine(n=10, m=2, seed=1, replication=1)
+        engine.simulate(duration=12)
+        with SharedFleetResults(replications=2, n=10, m=2) as results:
+            attached = SharedFleetResults.attach(results.handle)
+            attached.write(replication=1, engine=engine)
+            attached.close()
+
+            assert [0, 1] == results.written.tolist()
+            assert list(engine.trucks.total_wait_time) == results.total_wait_time[1].tolist()
+            assert list(engine.station_total_unloads) == results.station_total_unloads[1].tolist()
+            assert not results.total_mining[0].any()
+            # The replication which is not written is missing, not a replication without unloads.
+            assert [0] == results.missing.tolist()
+            result = results.result(duration=12 * 60)
+            assert 1 == result.replications
+            assert [engine.unloads] == result.unloads.tolist()
+
+            results.write(replication=0, engine=engine)
+            assert 0 == len(results.missing)
+            assert np.shares_memory(results.result(duration=12 * 60).truck_total_wait_time, results.total_wait_time)
+            name = results.handle[0]
+        # The creator frees the block
+        with self.assertRaises(FileNotFoundError):
+            SharedFleetResults(replications=2, n=10, m=2, name=name)
+        with SharedFleetResults(replications=2, n=10, m=2) as results:
+            with self.assertRaises(ValueError):
+                results.result(duration=12 * 60)
+
+    def test_antithetic_pairs(self):
+        """Test: antithetic results have whole pairs only."""
+        with self.assertRaises(ValueError):
+            SharedFleetResults(replications=3, n=10, m=2, antithetic=True)
+        with SharedFleetResults(replications=4, n=10, m=2, antithetic=True) as results:
+            for replication in range(3):
+                engine = FleetEngine(n=10, m=2, seed=1, replication=replication, antithetic=True)
+                engine.simulate(duration=12)
+                results.write(replication=replication, engine=engine)
+            # Replication 2 is written, but its pair is not complete
+            result = results.result(duration=12 * 60)
+            assert 2 == result.replications and result.antithetic
+
+    def test_run_parallel_replications(self):
+        """Test: every replication is the same as a run in this process, and distributions merge all of them."""
+        with run_parallel_replications(n=20, m=2, replications=4, duration=12, seed=3, max_workers=2) as results:
+            assert [1] * 4 == results.written.tolist()
+            for replication in range(4):
+                engine = FleetEngine(n=20, m=2, seed=3, replication=replication)
+                engine.simulate(duration=12)
+                assert list(engine.trucks.total_mining_time) == results.total_mining_time[replication].tolist()
+                assert engine.queue_length_stats.stats.max == results.max_queue_length[replication]
+
+            result = results.result(duration=12 * 60)
+            assert result.unloads.sum() == results.distributions["wait_time"].count
+            assert 4 == result.replications
+            assert set(result.summary()) >= {"Total unloads", "Unloading utilization"}
+
+    def test_failed_replication(self):
+        """Test: a failed replication is missing, and the others are still aggregated."""
+        with patch("shared_results.ProcessPoolExecutor", ThreadPoolExecutor), patch(
+            "shared_results.FleetEngine", FailingFleetEngine
+        ):
+            results = run_parallel_replications(n=10, m=2, replications=3, duration=12, seed=3)
+        with results:
+            assert [1] == results.missing.tolist()
+            assert [1] == list(results.errors)
+            result = results.result(duration=12 * 60)
+            assert 2 == result.replications
+            assert result.unloads.sum() == results.distributions["wait_time"].count
@@ -0,0 +1,165 @@
+import io
+import unittest
+from unittest.mock import patch
+
+from const import LogCategory, LogLevel, OverflowPolicy
+from simulation_logger import SimulationLogger
+
+
+class TestSimulationLogger(unittest.TestCase):
+    """Test the SimulationLogger class."""
+
+    def _make_logger(self, **kwargs) -> (SimulationLogger, io.StringIO):
+        """Create a logger which prints to a string stream with a fixed clock at 01:30 (sim_time_unit 1)."""
+        stream = io.StringIO()
+        logger = SimulationLogger(stream=stream, **kwargs)
+        logger.reset(start_time_in_unix_timestamp=0, sim_time_unit=1, clock=lambda: 90)
+        return logger, stream
+
+    def test_loggers_do_not_mix_logs(self):
+        """Test: each logger has its own queue, thread and stream."""
+        logger, stream = self._make_logger()
+        other_logger, other_stream = self._make_logger()
+
+        logger.log("first simulation")
+        other_logger.log("second simulation", log_with_timestamp=False)
+        logger.log(None)
+        other_logger.log(None)
+        logger.thread.join()
+        other_logger.thread.join()
+
+        assert "[01:30] first simulation\n" == stream.getvalue()
+        assert "second simulation\n" == other_stream.getvalue()
+
+    def test_reset_after_finished(self):
+        """Test: the logger can be reset for the next simulation after its thread finished."""
+        logger, stream = self._make_logger()
+        logger.log(None)
+        logger.thread.join()
+
+        logger.reset(start_time_in_unix_timestamp=0, sim_time_unit=1, clock=lambda: 60)
+        logger.log("next simulation")
+        logger.log(None)
+        logger.thread.join()
+
+        assert "[01:00] next simulation\n" == stream.getvalue()
+
+    def test_get_instance(self):
+        """Test: get_instance returns the same process-wide logger for backward compatibility."""
+        assert SimulationLogger.get_instance() is SimulationLogger.get_instance()
+        assert SimulationLogger() is not SimulationLogger.get_instance()
+
+    def test_log_event_is_formatted_by_thread(self):
+        """Test: the template and arguments are queued and formatted when printed."""
+        logger, stream = self._make_logger()
+        logger.log_event(LogCategory.STATION, "(+) {} started unloading from {}.", "Station #1", "Truck #2")
+        logger.log(None)
+        logger.thread.join()
+
+        assert "[01:30] (+) Station #1 started unloading from Truck #2.\n" == stream.getvalue()
+
+    def test_disabled_categories_are_not_queued(self):
+        """Test: messages of disabled categories or below the level are dropped before queueing."""
+        logger = SimulationLogger(categories=[LogCategory.QUEUE, LogCategory.SUMMARY])
+        logger.log_event(LogCategory.TRUCK_MOVEMENT, "<-- {} left the control center.", "Truck #1")
+        logger.log_event(LogCategory.MINING, "+++ Mining time: {} minutes.", 100)
+        assert not logger._log_buffer
+
+        logger.log_event(LogCategory.QUEUE, "{} is waiting for next available unload stations.", "Truck #1")
+        assert 1 == len(logger._log_buffer)
+
+        logger.set_level(LogLevel.INFO)
+        logger.log_event(LogCategory.QUEUE, "{} is waiting for next available unload stations.", "Truck #1")
+        logger.log("Start the simulation for 1 hours.")
+        assert 2 == len(logger._log_buffer)
+        assert not logger.is_enabled(LogCategory.QUEUE)
+        assert logger.is_enabled(LogCategory.SUMMARY, level=LogLevel.INFO)
+
+    def test_end_notification_is_never_dropped(self):
+        """Test: the end notification stops the thread even if nothing is logged."""
+        logger, stream = self._make_logger(level=LogLevel.WARNING)
+        logger.log("Finish the simulation.")
+        logger.log(None)
+        logger.thread.join()
+        assert "" == stream.getvalue()
+
+    def test_overflow_drop_oldest(self):
+        """Test: with DROP_OLDEST, the oldest messages are dropped when the buffer is full, and counted."""
+        stream = io.StringIO()
+        logger = SimulationLogger(stream=stream, max_buffered=2, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        for i in range(5):
+            logger.log(f"message {i}", log_with_timestamp=False)
+        assert 3 == logger.dropped
+
+        # Start the thread after overflowing the buffer
+        logger.reset(start_time_in_unix_timestamp=0, sim_time_unit=1, clock=lambda: 0)
+        logger.log(None)
+        logger.thread.join()
+        assert (
+            "message 3\nmessage 4\n3 log messages were dropped because the log buffer was full.\n"
+            == stream.getvalue()
+        )
+
+    def test_overflow_sample(self):
+        """Test: with SAMPLE, one of every sample_every overflowing messages is kept."""
+        logger = SimulationLogger(
+            stream=io.StringIO(), max_buffered=1, overflow_policy=OverflowPolicy.SAMPLE, sample_every=3
+        )
+        for i in range(7):
+            logger.log(f"message {i}", log_with_timestamp=False)
+        # 6 messages overflowed: 2 were kept (each dropping the oldest one), and 4 were dropped.
+        assert 6 == logger.dropped
+        assert [(None, "message 6", ())] == list(logger._log_buffer)
+
+    def test_overflow_block(self):
+        """Test: with BLOCK, no message is dropped; producers wait for the thread which prints logs."""
+        logger, stream = self._make_logger(max_buffered=2, overflow_policy=OverflowPolicy.BLOCK)
+        for i in range(100):
+            logger.log(f"message {i}", log_with_timestamp=False)
+        logger.log(None)
+        logger.thread.join()
+
+        assert 0 == logger.dropped
+        assert "".join(f"message {i}\n" for i in range(100)) == stream.getvalue()
+
+    def test_overflow_block_without_thread(self):
+        """Test: with BLOCK, the oldest messages are dropped instead of waiting while no thread prints logs."""
+        logger = SimulationLogger(stream=io.StringIO(), max_buffered=4, overflow_policy=OverflowPolicy.BLOCK)
+        for i in range(100):
+            logger.log(f"message {i}", log_with_timestamp=False)
+        assert 96 == logger.dropped
+        assert [f"message {i}" for i in range(96, 100)] == [message for _, message, _ in logger._log_buffer]
+
+    def test_dropped_is_counted_per_simulation(self):
+        """Test: reset for the next simulation clears the number of dropped messages of the previous one."""
+        stream = io.StringIO()
+        logger = SimulationLogger(stream=stream, max_buffered=1, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        for i in range(3):
+            logger.log(f"message {i}", log_with_timestamp=False)
+        logger.reset(start_time_in_unix_timestamp=0, sim_time_unit=1, clock=lambda: 0)
+        logger.log(None)
+        logger.thread.join()
+        assert 2 == logger.dropped
+        assert stream.getvalue().endswith("2 log messages were dropped because the log buffer was full.\n")
+
+        logger.reset(start_time_in_unix_timestamp=0, sim_time_unit=1, clock=lambda: 0)
+        assert 0 == logger.dropped
+
+    def test_batch_is_written_at_once(self):
+        """Test: buffered messages are written to the stream with a single write."""
+        stream = io.StringIO()
+        with patch.object(stream, "write", wraps=stream.write) as write:
+            logger = SimulationLogger(stream=stream)
+            for i in range(10):
+                logger.log(f"message {i}", log_with_timestamp=False)
+            logger.log(None)
+            logger.reset(start_time_in_unix_timestamp=0, sim_time_unit=1, clock=lambda: 0)
+            logger.thread.join()
+
+        write.assert_called_once()
+        assert "".join(f"message {i}\n" for i in range(10)) == stream.getvalue()
+
+    def test_invalid_buffer_size(self):
+        """Test: the buffer must be able to hold a message."""
+        with self.assertRaises(ValueError):
+            SimulationLogger(max_buffered=0)
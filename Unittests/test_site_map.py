@@ -0,0 +1,81 @@
+import random
+import unittest
+
+from const import DispatchRule, SimulationMode
+from mining_control_center import MiningControlCenter
+from site_map import SiteMap, StationIndex
+
+
+class TestSiteMap(unittest.TestCase):
+    """Test the SiteMap and StationIndex classes."""
+
+    def test_from_coordinates(self):
+        """Test: travel times are straight line distances at the speed, rounded up to whole minutes."""
+        site_map = SiteMap.from_coordinates(sites=[(0, 0), (30, 40)], stations=[(0, 0), (0, 40)], speed=2)
+        assert [[1, 20], [25, 15]] == site_map.travel_times
+        assert [1, 0] == site_map.stations_by_travel_time(site=1)
+        with self.assertRaises(ValueError):
+            SiteMap([[10, 20], [10]])
+        with self.assertRaises(ValueError):
+            SiteMap([[10, 0]])
+
+    def test_nearest_available(self):
+        """Test: the nearest idle unload station; the lowest ETA if every unload station is busy."""
+        index = StationIndex(site_map=SiteMap([[10, 20, 30]]), unloading_time=5)
+        assert (0, 10) == index.dispatch(site=0, now=0, rule=DispatchRule.NEAREST_AVAILABLE)
+        assert (1, 20) == index.dispatch(site=0, now=0, rule=DispatchRule.NEAREST_AVAILABLE)
+        index.release(station=0)
+        assert (0, 10) == index.dispatch(site=0, now=1, rule=DispatchRule.NEAREST_AVAILABLE)
+        assert (2, 30) == index.dispatch(site=0, now=1, rule=DispatchRule.NEAREST_AVAILABLE)
+        # Every unload station is busy: the truck can start unloading at station #1 at 20, earlier than 25 and 36.
+        assert (0, 10) == index.dispatch(site=0, now=2, rule=DispatchRule.NEAREST_AVAILABLE)
+        assert 25 == index.available_at[0]
+
+    def test_lowest_eta(self):
+        """Test: the lowest ETA is the same as the one of a full scan."""
+        rng = random.Random(1)
+        site_map = SiteMap.from_coordinates(
+            sites=[(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(5)],
+            stations=[(rng.uniform(0, 100), rng.uniform(0, 100)) for _ in range(40)],
+            speed=2,
+        )
+        index = StationIndex(site_map=site_map, unloading_time=5)
+        now = 0
+        dispatched = []
+        for _ in range(2000):
+            now += rng.randint(0, 3)
+            site = rng.randrange(site_map.n_sites)
+            expected = min(
+                max(now + site_map.travel_time(site, station), index.available_at[station])
+                for station in range(site_map.n_stations)
+            )
+            station, eta = index.lowest_eta(site=site, now=now)
+            assert expected == eta == max(now + site_map.travel_time(site, station), index.available_at[station])
+            dispatched.append(index.dispatch(site=site, now=now, rule=DispatchRule.LOWEST_ETA)[0])
+            if rng.random() < 0.5:
+                index.release(station=dispatched.pop(rng.randrange(len(dispatched))))
+
+    def test_simulate_with_site_map(self):
+        """Test: each truck unloads at the unload station next to its mining site, without waiting."""
+        site_map = SiteMap([[5, 100], [100, 5]])
+        control_center = MiningControlCenter(
+            n=2, m=2, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, seed=1, site_map=site_map
+        )
+        control_center.simulate(duration=72)
+
+        for truck, station in zip(control_center._trucks, control_center._unload_stations):
+            assert truck.total_mining - station.report()["Total unloads"] in (0, 1)
+            assert 0 == truck.total_wait_time
+        # A short trip: more unloads than a 30 minutes trip.
+        flat = MiningControlCenter(n=2, m=2, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, seed=1)
+        flat.simulate(duration=72)
+        assert control_center.unloads > flat.unloads
+
+    def test_invalid_site_map(self):
+        """Test: the site map must match the unload stations and needs the discrete event engine."""
+        with self.assertRaises(ValueError):
+            MiningControlCenter(
+                n=2, m=3, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, site_map=SiteMap([[5]])
+            )
+        with self.assertRaises(ValueError):
+            MiningControlCenter(n=2, m=1, sim_time_unit=10, site_map=SiteMap([[5]]))
@@ -0,0 +1,157 @@
+import math
+import pickle
+import random
+import statistics
+import unittest
+from unittest.mock import patch
+
+from const import SimulationMode
+from mining_control_center import MiningControlCenter
+from simulation_logger import SimulationLogger
+from streaming_stats import DistributionStats, Histogram, QuantileSketch, RunningStats, TopK
+
+
+class TestStreamingStats(unittest.TestCase):
+    """Test the streaming statistics."""
+
+    def test_running_stats(self):
+        """Test: Welford mean and variance match the exact values, also after merging."""
+        samples = [random.uniform(0, 100) for _ in range(1000)]
+        stats = RunningStats()
+        other_stats = RunningStats()
+        for sample in samples[:300]:
+            stats.add(sample)
+        for sample in samples[300:]:
+            other_stats.add(sample)
+        stats.merge(other_stats)
+
+        assert 1000 == stats.count
+        assert math.isclose(statistics.mean(samples), stats.mean)
+        assert math.isclose(statistics.variance(samples), stats.variance)
+        assert min(samples) == stats.min
+        assert max(samples) == stats.max
+
+    def test_quantile_sketch_relative_accuracy(self):
+        """Test: quantiles are estimated within the relative accuracy."""
+        samples = sorted(random.uniform(1, 1000) for _ in range(10001))
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for sample in samples:
+            sketch.add(sample)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = samples[int(q * (len(samples) - 1))]
+            assert abs(sketch.quantile(q) - exact) <= 0.01 * exact
+
+    def test_quantile_sketch_zeros(self):
+        """Test: zero samples (e.g., trucks which did not wait) are counted exactly."""
+        sketch = QuantileSketch()
+        for sample in [0] * 90 + [10] * 10:
+            sketch.add(sample)
+        assert 0 == sketch.quantile(0.5)
+        assert math.isclose(10, sketch.quantile(0.95), rel_tol=0.01)
+        with self.assertRaises(ValueError):
+            sketch.add(-1)
+
+    def test_quantile_sketch_is_bounded(self):
+        """Test: the number of buckets is capped; high quantiles stay accurate."""
+        sketch = QuantileSketch(relative_accuracy=0.01, max_buckets=100)
+        for i in range(1, 100001):
+            sketch.add(i)
+        assert 100 >= len(sketch._buckets)
+        assert math.isclose(99000, sketch.quantile(0.99), rel_tol=0.01)
+
+    def test_merge_across_processes(self):
+        """Test: distributions survive pickling (e.g., from worker processes) and merge into one."""
+        distribution = DistributionStats()
+        other_distribution = DistributionStats()
+        for i in range(1, 51):
+            distribution.add(i)
+            other_distribution.add(i + 50)
+        merged = distribution.merge(pickle.loads(pickle.dumps(other_distribution)))
+
+        summary = merged.summary()
+        assert 100 == summary["count"]
+        assert math.isclose(50.5, summary["mean"])
+        assert math.isclose(50, summary["p50"], rel_tol=0.01)
+        assert math.isclose(99, summary["p99"], rel_tol=0.01)
+        assert None is DistributionStats().summary()["p95"]
+
+    def test_histogram(self):
+        """Test: values are counted in their bins; out-of-range values in the first or last bin."""
+        histogram = Histogram(low=0, high=1, bins=4)
+        for value in (-0.1, 0, 0.3, 0.5, 0.99, 1, 1.5):
+            histogram.add(value)
+        assert [2, 1, 1, 3] == histogram.counts
+        assert (0.25, 0.5, 1) == histogram.bins()[1]
+        assert [4, 2, 2, 6] == histogram.merge(histogram).counts
+        with self.assertRaises(ValueError):
+            Histogram(low=1, high=1)
+        with self.assertRaises(ValueError):
+            histogram.merge(Histogram(low=0, high=1, bins=5))
+        with self.assertRaises(ValueError):
+            histogram.merge(Histogram(low=0, high=2, bins=4))
+
+    def test_top_k(self):
+        """Test: the k largest keys from the largest; the first added of the same key are kept."""
+        top = TopK(k=3)
+        values = list(range(100))
+        random.Random(1).shuffle(values)
+        for value in values:
+            top.add(value, f"#{value}")
+        assert [(99, "#99"), (98, "#98"), (97, "#97")] == top.items()
+
+        top = TopK(k=2)
+        for name in ("a", "b", "c"):
+            top.add(5, name)
+        assert [(5, "a"), (5, "b")] == top.items()
+        with self.assertRaises(ValueError):
+            TopK(k=0)
+
+    def test_simulation_distributions(self):
+        """Test: the control center updates distributions on every arrival and unload."""
+        control_center = MiningControlCenter(
+            n=3, m=1, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=SimulationLogger()
+        )
+        with patch("Vehicles.mining_truck.randint", return_value=150):
+            control_center.simulate(duration=4)
+
+        distributions = control_center.distributions()
+        # 3 trucks arrive at 180 and unload one by one: wait 0, 10 and 15 minutes.
+        assert 3 == distributions["wait_time"].count
+        assert math.isclose(25 / 3, distributions["wait_time"].stats.mean)
+        assert 15 == distributions["wait_time"].stats.max
+        # Queue lengths on arrival: 0, 0 and 1.
+        assert 1 == distributions["queue_length"].stats.max
+        # The first cycles start at the mining sites, not at the unload station: they are not cycle times.
+        assert 0 == distributions["cycle_time"].count
+        assert 3 == control_center._unload_stations[0].wait_time_stats.count
+
+        summary = control_center.summarize(duration=4 * 60)
+        assert math.isclose(10, summary["p50_wait_time"], rel_tol=0.01)
+        # Wait times are per unload, like the percentiles.
+        assert math.isclose(25 / 3, summary["mean_wait_time"])
+        assert 15 == summary["max_wait_time"]
+
+        # Unloads complete again at 400, 405 and 410: a full cycle of 215 minutes for every truck.
+        with patch("Vehicles.mining_truck.randint", return_value=150):
+            control_center.simulate(duration=7)
+        cycle_time = control_center.distributions()["cycle_time"]
+        assert 3 == cycle_time.count
+        assert 215 == cycle_time.stats.min == cycle_time.stats.max
+
+    def test_summarize_fleet(self):
+        """Test: the summary of the fleet agrees with the rows of trucks and unload stations."""
+        control_center = MiningControlCenter(
+            n=50, m=3, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=SimulationLogger(), seed=7
+        )
+        control_center.simulate(duration=24)
+
+        summary = control_center.summarize_fleet(duration=24 * 60, k=5)
+        wait_times = sorted((truck.total_wait_time for truck in control_center._trucks), reverse=True)
+        assert wait_times[:5] == [total_wait_time for total_wait_time, _ in summary["worst_trucks"]]
+        assert 50 == sum(summary["mining_utilization_histogram"].counts)
+        assert 3 == sum(summary["unloading_utilization_histogram"].counts)
+        assert math.isclose(
+            control_center.summarize(duration=24 * 60)["mining_utilization"], summary["mining_utilization"].stats.mean
+        )
+        assert wait_times[0] == summary["wait_time"].stats.max
@@ -0,0 +1,120 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from const import SimulationMode, TruckPhase
+from mining_control_center import MiningControlCenter
+from report_exporters import JsonLinesExporter
+from simulation_logger import SimulationLogger
+from time_series import RingBuffer, TimeSeriesSampler
+from virtual_time_loop import run_in_virtual_time
+
+
+class CheckedControlCenter(MiningControlCenter):
+    """Control center which checks the counts kept on each event against a scan of the fleet at each sample."""
+
+    def sample(self) -> None:
+        assert self.phase_counts[TruckPhase.WAITING] == len(self._trucks_to_unload)
+        assert self.phase_counts[TruckPhase.UNLOADING] == len(self._unload_stations) - len(
+            self._available_unload_stations
+        )
+        assert sum(self.phase_counts) == len(self._trucks)
+        assert min(self.phase_counts) >= 0
+        super().sample()
+
+
+class TestTimeSeries(unittest.TestCase):
+    """Test the TimeSeriesSampler class and sampling of the control center."""
+
+    def test_ring_buffer(self):
+        """Test: the latest values are kept from the oldest one."""
+        buffer = RingBuffer(capacity=3)
+        for value in range(2):
+            buffer.append(value)
+        assert [0, 1] == buffer.to_list()
+        for value in range(2, 7):
+            buffer.append(value)
+        assert [4, 5, 6] == buffer.to_list()
+        assert 3 == len(buffer)
+        with self.assertRaises(ValueError):
+            RingBuffer(capacity=0)
+
+    def test_downsampling(self):
+        """Test: mean and max per window, including the window being filled."""
+        sampler = TimeSeriesSampler(interval=1, capacity=4, resolutions={"5min": 5})
+        for sim_time in range(1, 13):
+            sampler.sample(sim_time=sim_time, counts=(sim_time, 0, 1, 2))
+
+        assert list(range(9, 13)) == sampler.series()["queue_length"]
+        downsampled = sampler.downsampled("5min")
+        assert [5, 10, 15] == downsampled["time"]
+        assert [3, 8, 11.5] == downsampled["queue_length_mean"]
+        assert [5, 10, 12] == downsampled["queue_length_max"]
+        assert [1, 1, 1] == downsampled["mining_mean"]
+
+    def test_discrete_event(self):
+        """Test: the counts kept on each event match the fleet at every sample."""
+        sampler = TimeSeriesSampler(interval=7)
+        control_center = CheckedControlCenter(
+            n=30, m=2, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=SimulationLogger(), seed=3,
+            sampler=sampler,
+        )
+        control_center.simulate(duration=24)
+
+        series = sampler.series()
+        assert list(range(7, 24 * 60 + 1, 7)) == series["time"]
+        assert max(series["queue_length"]) > 0
+        assert all(busy <= 2 for busy in series["busy_stations"])
+        assert 3 == len(sampler.downsampled("shift")["time"])
+
+    def test_virtual_time(self):
+        """Test: the coroutine modes sample the same counts as the discrete event engine."""
+        samplers = [TimeSeriesSampler(interval=10), TimeSeriesSampler(interval=10)]
+        control_center = CheckedControlCenter(
+            n=10, m=1, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=SimulationLogger(), seed=5,
+            sampler=samplers[0],
+        )
+        control_center.simulate(duration=6)
+        control_center = CheckedControlCenter(
+            n=10, m=1, sim_time_unit=10, mode=SimulationMode.VIRTUAL_TIME, logger=SimulationLogger(), seed=5,
+            sampler=samplers[1],
+        )
+        control_center._logger._stream = io.StringIO()
+        run_in_virtual_time(control_center.run(6))
+
+        assert samplers[0].series()["time"] == samplers[1].series()["time"]
+        assert samplers[0].series()["mining"] == samplers[1].series()["mining"]
+
+    def test_checkpoint_fork(self):
+        """Test: a fork with more unload stations restores the counts from the checkpoint."""
+        control_center = MiningControlCenter(
+            n=100, m=1, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=SimulationLogger(), seed=2
+        )
+        control_center.simulate(duration=12, log_events=False)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "checkpoint.gz")
+            control_center.save_checkpoint(path)
+            fork = MiningControlCenter.load_checkpoint(path, m=3)
+
+        assert control_center.phase_counts[TruckPhase.WAITING] > 2
+        assert 3 == fork.phase_counts[TruckPhase.UNLOADING]
+        assert sum(fork.phase_counts) == 100
+        assert control_center.phase_counts[TruckPhase.WAITING] - 2 == fork.phase_counts[TruckPhase.WAITING]
+
+    def test_export(self):
+        """Test: samples and every resolution are exported as tables."""
+        sampler = TimeSeriesSampler(interval=30)
+        control_center = MiningControlCenter(
+            n=5, m=1, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=SimulationLogger(), seed=1,
+            sampler=sampler,
+        )
+        control_center.simulate(duration=24, log_events=False)
+        stream = io.StringIO()
+        control_center.export(duration=24 * 60, exporter=JsonLinesExporter(stream=stream))
+
+        tables = [json.loads(line)["table"] for line in stream.getvalue().splitlines()]
+        assert 48 == tables.count("time_series")
+        assert 24 == tables.count("time_series_hour")
+        assert 3 == tables.count("time_series_shift")
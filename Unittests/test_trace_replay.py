@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+
+from const import DispatchRule, SimulationMode, TraceEvent
+from event_trace import TraceWriter
+from mining_control_center import MiningControlCenter
+from simulation_logger import SimulationLogger
+from site_map import SiteMap
+from trace_replay import DemandTrace, ReplayEngine, replay
+
+
+class TestTraceReplay(unittest.TestCase):
+    """Test the DemandTrace and ReplayEngine classes."""
+
+    def test_replay_event_trace(self):
+        """Test: replaying the recorded mining times of a run with the same fleet gives the same statistics."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.bin")
+            with TraceWriter(path) as trace:
+                # Without a seed: mining times come from the random module
+                control_center = MiningControlCenter(
+                    n=20, m=2, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT,
+                    logger=SimulationLogger(trace=trace),
+                )
+                control_center.simulate(duration=24, log_events=False)
+            demand = DemandTrace.from_event_trace(path)
+
+        assert 20 == demand.n
+        # Mining times of trucks still mining or on the way at the end are recorded too.
+        assert all(demand.cycles(index) >= truck.total_mining for index, truck in enumerate(control_center._trucks))
+        engine = ReplayEngine(trace=demand, m=2)
+        engine.simulate(duration=24)
+        summary = engine.summarize(duration=24 * 60)
+        assert 0 == summary.pop("exhausted_trucks")
+        assert control_center.summarize(duration=24 * 60) == summary
+
+    def test_fleet_size_from_header(self):
+        """Test: the fleet size comes from the header of the event trace, not from the trucks which mined."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.bin")
+            with TraceWriter(path, trucks=3, stations=1) as trace:
+                trace.write(0, TraceEvent.MINING_STARTED, truck_id=2, duration=60)
+                trace.write(0, TraceEvent.MINING_STARTED, truck_id=1, duration=90)
+            demand = DemandTrace.from_event_trace(path)
+            assert 3 == demand.n
+            assert [1, 1, 0] == [demand.cycles(index) for index in range(3)]
+
+            with TraceWriter(path) as trace:
+                trace.write(0, TraceEvent.MINING_STARTED, truck_id=1, duration=90)
+            with self.assertRaises(ValueError):
+                DemandTrace.from_event_trace(path)
+
+    def test_replay_means_only(self):
+        """Test: without quantile sketches, the replay gives the same counts and means, and no quantiles."""
+        demand = DemandTrace.from_seed(n=30, seed=4, cycles=20)
+        summary, means_only = (
+            replay(demand, [2], duration=24, quantiles=quantiles)[0] for quantiles in (True, False)
+        )
+        quantile_keys = [key for key in summary if key.startswith("p")]
+        assert 5 == len(quantile_keys)
+        assert all(means_only.pop(key) is None for key in quantile_keys)
+        assert {key: value for key, value in summary.items() if key not in quantile_keys} == means_only
+
+    def test_replay_seed(self):
+        """Test: the mining times of a seed replay the same as simulations of the seed for any number of stations."""
+        demand = DemandTrace.from_seed(n=30, seed=4, cycles=20)
+        summaries = replay(demand, [1, 2, 3], duration=24)
+        for m, summary in zip([1, 2, 3], summaries):
+            control_center = MiningControlCenter(
+                n=30, m=m, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=SimulationLogger(), seed=4
+            )
+            control_center.simulate(duration=24, log_events=False)
+            assert 0 == summary.pop("exhausted_trucks")
+            assert control_center.summarize(duration=24 * 60) == summary
+
+    def test_replay_site_map(self):
+        """Test: dispatch rules of the geographic model replay the same as the simulation."""
+        site_map = SiteMap.from_coordinates(sites=[(0, 0), (40, 0), (0, 30)], stations=[(10, 0), (30, 10)])
+        demand = DemandTrace.from_seed(n=12, seed=9, cycles=20)
+        for rule in DispatchRule:
+            control_center = MiningControlCenter(
+                n=12, m=2, sim_time_unit=10, mode=SimulationMode.DISCRETE_EVENT, logger=SimulationLogger(), seed=9,
+                site_map=site_map, dispatch_rule=rule,
+            )
+            control_center.simulate(duration=24, log_events=False)
+            engine = ReplayEngine(trace=demand, m=2, site_map=site_map, dispatch_rule=rule)
+            engine.simulate(duration=24)
+            summary = engine.summarize(duration=24 * 60)
+            del summary["exhausted_trucks"]
+            assert control_center.summarize(duration=24 * 60) == summary
+
+        with self.assertRaises(ValueError):
+            ReplayEngine(trace=demand, m=3, site_map=site_map)
+
+    def test_exhausted(self):
+        """Test: a truck which mined every recorded mining time stays at its mining site."""
+        demand = DemandTrace([[60], [60, 60]])
+        engine = ReplayEngine(trace=demand, m=1, unloading_time=10)
+        engine.simulate(duration=24)
+        summary = engine.summarize(duration=24 * 60)
+        assert 2 == summary["exhausted_trucks"]
+        assert 3 == summary["unloads"]
+        # Both trucks arrive at 90: the second one waits until 110, when its own unloading ends.
+        assert 20 == summary["max_wait_time"]
+        with self.assertRaises(ValueError):
+            DemandTrace([])
@@ -0,0 +1,76 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from const import SimulationMode
+from mining_control_center import MiningControlCenter
+from virtual_time_loop import VirtualTimeEventLoop, VirtualTimeEventLoopPolicy, run_in_virtual_time
+
+
+@pytest.mark.usefixtures("dummy_logger")
+class TestVirtualTimeEventLoop(unittest.TestCase):
+    """Test the VirtualTimeEventLoop class."""
+
+    def test_sleep_advances_virtual_clock(self):
+        """Test: asyncio.sleep does not wait in the real world time."""
+
+        async def sleep_for_an_hour():
+            loop = asyncio.get_running_loop()
+            await asyncio.sleep(3600)
+            return loop.time()
+
+        start = time.monotonic()
+        assert 3600 == run_in_virtual_time(sleep_for_an_hour())
+        assert time.monotonic() - start < 1
+
+    def test_timers_fire_in_deadline_order(self):
+        """Test: concurrent sleeps are completed in the order of their deadlines."""
+        completed = []
+
+        async def sleep_and_save(name: str, seconds: float):
+            await asyncio.sleep(seconds)
+            completed.append((name, asyncio.get_running_loop().time()))
+
+        async def main():
+            await asyncio.gather(
+                sleep_and_save("C", 30), sleep_and_save("A", 10), sleep_and_save("B", 20)
+            )
+
+        run_in_virtual_time(main(), start_time=100)
+        assert [("A", 110), ("B", 120), ("C", 130)] == completed
+
+    def test_event_loop_policy(self):
+        """Test: asyncio.run with VirtualTimeEventLoopPolicy uses the virtual clock."""
+
+        async def get_loop():
+            return asyncio.get_running_loop()
+
+        asyncio.set_event_loop_policy(VirtualTimeEventLoopPolicy())
+        try:
+            assert isinstance(asyncio.run(get_loop()), VirtualTimeEventLoop)
+        finally:
+            asyncio.set_event_loop_policy(None)
+
+    def test_run_mining_control_center(self):
+        """Test: unchanged truck and unload station coroutines run in the virtual time."""
+        control_center = MiningControlCenter(
+            n=3, m=1, sim_time_unit=1, mode=SimulationMode.VIRTUAL_TIME, logger=self._logger
+        )
+        with patch("Vehicles.mining_truck.randint", return_value=150):
+            run_in_virtual_time(control_center.run(duration=4))
+
+        # All 3 trucks arrive at 180 and unload one by one: completed at 185, 190 and 195.
+        assert 3 == control_center.unloads
+        assert [0, 10, 15] == sorted(truck.total_wait_time for truck in control_center._trucks)
+        assert 8 == self._log_msgs.count("-- Notify every 30 minutes. --")
+        # Every phase ends on its deadline in the virtual time.
+        assert control_center.pacing()["max_lag"] < 1e-9
+
+    def test_virtual_time_mode_requires_virtual_time_loop(self):
+        """Test: virtual time mode does not run in the real world time by mistake."""
+        control_center = MiningControlCenter(n=1, m=1, sim_time_unit=1, mode=SimulationMode.VIRTUAL_TIME)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(control_center.run(duration=1))
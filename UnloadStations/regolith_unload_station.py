@@ -0,0 +1,8 @@
+from UnloadStations.unload_station import UnloadStation
+from const import UNLOADING_TIME_FOR_REGOLITH_UNLOAD_STATION
+
+
+class RegolithUnloadStation(UnloadStation):
+    """Unload Station for regolith."""
+
+    UNLOADING_TIME = UNLOADING_TIME_FOR_REGOLITH_UNLOAD_STATION
@@ -1,9 +1,10 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any
+from abc import ABC
+from typing import Dict, Any, Iterable, Optional
 
-from const import MiningType
+from const import LogCategory, MiningType
+from simulation_logger import SimulationLogger
+from streaming_stats import DistributionStats
 from Vehicles.mining_truck import MiningTruck
-from time_converter import convert_sim_time_to_real_time_in_sec
 
 
 class UnloadStation(ABC):
@@ -18,6 +19,10 @@ class UnloadStation(ABC):
         name: str = "Unload Station",
         mining_type: MiningType = MiningType.HELIUM_3,
         sim_time_unit: int = 1,
+        logger: Optional[SimulationLogger] = None,
+        station_id: int = 0,
+        mining_types: Optional[Iterable[MiningType]] = None,
+        unloading_times: Optional[Dict[MiningType, int]] = None,
     ):
         """Initialise a mining truck.
 
@@ -25,35 +30,99 @@ class UnloadStation(ABC):
         :param name: Name of the mining truck
         :param mining_type: Mining type of the mining truck
         :param sim_time_unit: Simulation time unit
+        :param logger: Logger of the simulation; None for the process-wide SimulationLogger
+        :param station_id: Id of the unload station (e.g., for the event trace)
+        :param mining_types: Mining types of trucks which the unload station serves; None for the mining type only
+        :param unloading_times: Unloading time of a truck of each mining type in simulation minutes;
+            None (or a missing mining type) for UNLOADING_TIME
         """
         self._control_center = control_center
         self.name = name
+        self.station_id = station_id
         self._mining_type = mining_type
-        self._unload_time = -1
+        self.mining_types = frozenset(mining_types) if mining_types is not None else frozenset([mining_type])
+        self._unloading_times = dict(unloading_times or {})
         self._sim_time_unit = sim_time_unit
+        self._logger = logger
         self._unloads = 0
+        self._total_unloading_time = 0
+        # Simulation time in minutes when the current unloading ends; for the real time mode
+        self.deadline = 0
+        # Distribution of wait time of trucks unloaded at this station
+        self.wait_time_stats = DistributionStats()
 
-    def _calculate_unload_time_in_simulation(self) -> float:
-        """Calculate the unload time in simulation to real time in real world seconds.
+    @property
+    def logger(self) -> SimulationLogger:
+        """Logger of the simulation; the process-wide SimulationLogger for backward compatibility."""
+        return self._logger if self._logger is not None else SimulationLogger.get_instance()
 
-        :return: Unload time in real world seconds
+    def get_unloading_time(self, truck: MiningTruck) -> int:
+        """Get the unloading time of the truck: each mining type has its own unloading time.
+
+        :param truck: MiningTruck to unload.
+        :return: unloading time in simulation minutes.
+        """
+        return self._unloading_times.get(truck.mining_type, self.UNLOADING_TIME)
+
+    async def _wait_to_unload(self, truck: MiningTruck) -> None:
+        """Wait for unloading the truck until its deadline:
+            from the arrival of the truck or the end of the previous unloading, whichever is later.
+
+        :param truck: MiningTruck to unload.
         """
-        if self._unload_time < 0:
-            self._unload_time = convert_sim_time_to_real_time_in_sec(
-                sim_time_to_convert_in_minutes=self.UNLOADING_TIME,
-                sim_time_unit=self._sim_time_unit,
-            )
-        return self._unload_time
-
-    @abstractmethod
-    def unload(self, truck: "MiningTruck") -> None:
+        self.deadline = max(self.deadline, truck.deadline) + self.get_unloading_time(truck)
+        await self._control_center.wait_until(sim_time=self.deadline)
+        # The truck leaves when the unloading ends.
+        truck.deadline = self.deadline
+
+    def record_unload(self, unloading_time: int) -> None:
+        """Save statistics of an unloading when the unloading is completed.
+
+        :param unloading_time: unloading time of the truck in simulation minutes.
+        """
+        self._unloads += 1
+        self._total_unloading_time += unloading_time
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the state of the unload station for a checkpoint.
+
+        :return: state of the unload station
+        """
+        return {
+            "unloads": self._unloads,
+            "total_unloading_time": self._total_unloading_time,
+            "wait_time_stats": self.wait_time_stats,
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Restore the state of the unload station from a checkpoint.
+
+        :param state: state from snapshot()
+        """
+        self._unloads = state["unloads"]
+        self._total_unloading_time = state["total_unloading_time"]
+        self.wait_time_stats = state["wait_time_stats"]
+
+    async def unload(self, truck: MiningTruck) -> None:
         """Unload a mining truck.
 
         :param truck: MiningTruck to unload.
         """
-        # Unload
-        pass
 
-    @abstractmethod
+        # Just in case if truck does not have name...
+        truck_name = truck.name if truck.name else "Unknown Truck"
+
+        # Unloading
+        self.logger.log_event(LogCategory.STATION, "(+) {} started unloading from {}.", self.name, truck_name)
+        await self._wait_to_unload(truck)
+        self.logger.log_event(LogCategory.STATION, "(-) {} finished unloading from {}.", self.name, truck_name)
+
+        # Notify unloading is completed
+        self.record_unload(unloading_time=self.get_unloading_time(truck))
+        await self._control_center.unload_complete(truck=truck, station=self)
+
     def report(self) -> Dict[str, Any]:
-        pass
\ No newline at end of file
+        return {
+            "Total unloads": self._unloads,
+            "Total unloading time": self._total_unloading_time
+        }
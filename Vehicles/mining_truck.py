@@ -1,8 +1,10 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any
+from abc import ABC
+from random import randint
+from typing import Dict, Any, Optional, Tuple
 
-from const import MiningType
-from time_converter import convert_sim_time_to_real_time_in_sec
+from const import LogCategory, MiningType, TraceEvent
+from random_streams import MiningTimeStream
+from simulation_logger import SimulationLogger
 
 
 class MiningTruck(ABC):
@@ -12,6 +14,9 @@ class MiningTruck(ABC):
 
     # Each Truck type has its own travel time between a mining site and an unload station,
     TRAVEL_TIME = -1
+    # and its own range of mining time in simulation minutes.
+    SHORTEST_MINING_TIME = -1
+    LONGEST_MINING_TIME = -1
 
     def __init__(
         self,
@@ -19,6 +24,9 @@ class MiningTruck(ABC):
         name: str = "Truck",
         mining_type: MiningType = MiningType.HELIUM_3,
         sim_time_unit: int = 1,
+        logger: Optional[SimulationLogger] = None,
+        truck_id: int = 0,
+        mining_time_stream: Optional[MiningTimeStream] = None,
     ):
         """Initialise a mining truck.
 
@@ -26,46 +34,167 @@ class MiningTruck(ABC):
         :param name: Name of the mining truck
         :param mining_type: Mining type of the mining truck
         :param sim_time_unit: Simulation time unit
+        :param logger: Logger of the simulation; None for the process-wide SimulationLogger
+        :param truck_id: Id of the mining truck (e.g., for the event trace)
+        :param mining_time_stream: Random substream of mining times of this truck; None for the random module
         """
 
         self._control_center = control_center
         self.name = name
+        self.truck_id = truck_id
         self._mining_type = mining_type
         self._sim_time_unit = sim_time_unit
-        self._travel_time = -1
+        self._logger = logger
+        self._mining_time_stream = mining_time_stream
+        # Simulation time in minutes when the current phase of the truck ends; for the real time mode
+        self.deadline = 0
+        # Mining site of the truck; for the geographic model (SiteMap)
+        self.site = 0
 
         # For statistics
         self.total_mining = 0
         self.total_mining_time = 0
         self.total_wait_time = 0
         self.start_to_wait = 0
+        # When the current cycle started: the last unload completion. None before the first one;
+        #   the first cycle starts at a mining site, so it is only a part of a cycle.
+        self._cycle_start: Optional[float] = None
+        # When the truck arrived at the control center
+        self._arrived_at = 0
 
-    def _get_travel_time_in_real_time(self) -> float:
-        """Get the travel time between a mining site and an unloading station.
+    @property
+    def logger(self) -> SimulationLogger:
+        """Logger of the simulation; the process-wide SimulationLogger for backward compatibility."""
+        return self._logger if self._logger is not None else SimulationLogger.get_instance()
 
-        :return: travel time in real time.
+    async def _wait(self, sim_minutes: int) -> None:
+        """Wait for a phase of the truck until its deadline: the end of the previous phase plus the given minutes.
+        Deadlines are absolute, so time to log and dispatch does not add up phase after phase.
+
+        :param sim_minutes: length of the phase in simulation minutes
+        """
+        self.deadline += sim_minutes
+        await self._control_center.wait_until(sim_time=self.deadline)
+
+    @property
+    def mining_type(self) -> MiningType:
+        """Mining type of the truck."""
+        return self._mining_type
+
+    async def go(self) -> None:
+        """Let the truck goes to a mining site and start to mining."""
+
+        # Report move
+        self.logger.log_event(LogCategory.TRUCK_MOVEMENT, "<-- {} left the control center.", self.name)
+        await self._wait(self.TRAVEL_TIME)
+        self.logger.log_event(LogCategory.TRUCK_MOVEMENT, "<++ {} arrived at a mining site.", self.name)
+        self.logger.trace_event(TraceEvent.MINING_SITE_ARRIVED, truck_id=self.truck_id)
+
+        await self.start_to_mining()
+
+    async def start_to_mining(self) -> None:
+        """Start to mining.
+        When the simulation starts, each truck starts at a mining site.
+        """
+        mining_time_in_simulation = self.get_mining_time()
+        self._control_center.mining_started(truck=self)
+        self.logger.log_event(LogCategory.MINING, "+++ Mining time: {} minutes.", mining_time_in_simulation)
+        self.logger.trace_event(
+            TraceEvent.MINING_STARTED, truck_id=self.truck_id, duration=mining_time_in_simulation
+        )
+
+        # Wait for mining time
+        await self._wait(mining_time_in_simulation)
+        self.logger.log_event(
+            LogCategory.MINING, "++> {} completed for mining. Leave the mining site.", self.name
+        )
+        self.logger.trace_event(TraceEvent.MINING_COMPLETED, truck_id=self.truck_id)
+        self._control_center.mining_completed(truck=self)
+
+        # Report arrival -> ready to unload
+        await self._wait(self.TRAVEL_TIME)
+        self.logger.log_event(LogCategory.TRUCK_MOVEMENT, "--> {} arrived and ready to unload.", self.name)
+        self.logger.trace_event(
+            TraceEvent.TRUCK_ARRIVED, truck_id=self.truck_id, duration=mining_time_in_simulation
+        )
+
+        # Save mining time when the truck arrived only.
+        self.record_mining(mining_time=mining_time_in_simulation)
+
+        # Notify truck is ready to unload (Notify to Control Center??)
+        await self._control_center.truck_arrived(truck=self)
+
+    def get_mining_time(self) -> int:
+        """Get a random mining time: randint(shortest time, longest time)
+        From the substream of this truck if it has one; otherwise from the random module.
+
+        :return: mining time in simulation minutes.
+        """
+        if self._mining_time_stream is not None:
+            return self._mining_time_stream.next()
+        return randint(self.SHORTEST_MINING_TIME, self.LONGEST_MINING_TIME)
+
+    def record_mining(self, mining_time: int) -> None:
+        """Save statistics of a mining when the truck arrived at an unload station.
+
+        :param mining_time: mining time in simulation minutes.
+        """
+        self.total_mining_time += mining_time
+        self.total_mining += 1
+
+    def record_arrival(self, sim_time: float) -> None:
+        """Save the arrival time at the control center.
+
+        :param sim_time: simulation time of the arrival in minutes
+        """
+        self._arrived_at = sim_time
+
+    def record_unload(self, sim_time: float) -> Tuple[Optional[float], float]:
+        """End the cycle when the truck completed unloading.
+
+        :param sim_time: simulation time of the unload completion in minutes
+        :return: cycle time (None for the first, partial cycle) and response time in simulation minutes
         """
-        if self._travel_time < 0:
-            self._travel_time = convert_sim_time_to_real_time_in_sec(
-                sim_time_to_convert_in_minutes=self.TRAVEL_TIME,
-                sim_time_unit=self._sim_time_unit,
-            )
-        return self._travel_time
-
-    @abstractmethod
-    def go(self):
-        """Send a mining truck to a mining site."""
-        # Go to a mining site and mining
-        pass
-
-    def start_to_mining(self) -> None:
-        """Start to mining."""
-        pass
-
-    @abstractmethod
+        cycle_time = None if self._cycle_start is None else sim_time - self._cycle_start
+        self._cycle_start = sim_time
+        return cycle_time, sim_time - self._arrived_at
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the state of the truck for a checkpoint: statistics and the position of its random substream.
+
+        :return: state of the truck
+        """
+        return {
+            "total_mining": self.total_mining,
+            "total_mining_time": self.total_mining_time,
+            "total_wait_time": self.total_wait_time,
+            "start_to_wait": self.start_to_wait,
+            "cycle_start": self._cycle_start,
+            "arrived_at": self._arrived_at,
+            "mining_time_cycle": self._mining_time_stream.cycle if self._mining_time_stream is not None else 0,
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """Restore the state of the truck from a checkpoint.
+
+        :param state: state from snapshot()
+        """
+        self.total_mining = state["total_mining"]
+        self.total_mining_time = state["total_mining_time"]
+        self.total_wait_time = state["total_wait_time"]
+        self.start_to_wait = state["start_to_wait"]
+        self._cycle_start = state["cycle_start"]
+        self._arrived_at = state["arrived_at"]
+        if self._mining_time_stream is not None:
+            self._mining_time_stream.cycle = state["mining_time_cycle"]
+
     def report(self) -> Dict[str, Any]:
         """Reports simulation statistics.
 
         :return: simulation statistics
         """
-        pass
\ No newline at end of file
+        return {
+            "Total mining time": self.total_mining_time,
+            "Total mining": self.total_mining,
+            "Total wait time": self.total_wait_time
+        }
\ No newline at end of file
@@ -0,0 +1,17 @@
+from Vehicles.mining_truck import MiningTruck
+from const import (
+    TRAVELING_TIME_FOR_REGOLITH_MINING_TRUCK,
+    SHORTEST_TIME_FOR_MINING_REGOLITH,
+    LONGEST_TIME_FOR_MINING_REGOLITH,
+)
+
+
+class RegolithMiningTruck(MiningTruck):
+    """Mining Truck for regolith."""
+
+    # Travel time between a mining site and an unload station: 20 minutes
+    TRAVEL_TIME = TRAVELING_TIME_FOR_REGOLITH_MINING_TRUCK
+    # Mining time: 30 minutes - 2 hours
+    SHORTEST_MINING_TIME = SHORTEST_TIME_FOR_MINING_REGOLITH
+    LONGEST_MINING_TIME = LONGEST_TIME_FOR_MINING_REGOLITH
+
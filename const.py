@@ -1,20 +1,134 @@
 """This is a file to store all const values."""
 
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class MiningType(Enum):
     """Mining type Enum.
-    There is only one MiningType, Helium-3 for this project; but I added for possible extension.
+    Helium-3 by default; a mixed fleet also mines regolith. Each type has its own trucks and unload stations.
     """
 
     HELIUM_3 = 0
+    REGOLITH = 1
+
+
+class SimulationMode(Enum):
+    """Simulation mode Enum.
+    REAL_TIME: every truck and unload station waits in the real world time (scaled by the simulation time unit).
+    DISCRETE_EVENT: jumps straight to the next event, so a run takes as long as its events need to process.
+    VIRTUAL_TIME: same coroutines as REAL_TIME, but waits on the virtual clock of VirtualTimeEventLoop.
+    ANALYTIC: no simulation; solves the expected steady state with mean value analysis (MVASolver).
+    SCHEDULED: same events as DISCRETE_EVENT from one scheduler heap, paced by the clock of the event loop;
+        real time without a task per truck and unload station.
+    """
+
+    REAL_TIME = 0
+    DISCRETE_EVENT = 1
+    VIRTUAL_TIME = 2
+    ANALYTIC = 3
+    SCHEDULED = 4
+
+
+class CatchUpPolicy(Enum):
+    """Catch-up policy Enum of the real time mode; what to do when the host falls behind the deadlines.
+    BURST: late phases end at once, so the simulation catches up with the wall clock.
+    SLIP: if a phase ends later than the maximum lag, shift the schedule by the lag;
+        the simulation runs behind the wall clock instead of bursting through late events.
+    """
+
+    BURST = 0
+    SLIP = 1
+
+
+class DispatchRule(Enum):
+    """Dispatch rule Enum of the geographic model; which unload station a truck leaving a mining site goes to.
+    NEAREST_AVAILABLE: the nearest unload station without any truck on the way, waiting or unloading;
+        the lowest ETA if every unload station is busy.
+    LOWEST_ETA: the unload station where the truck is expected to start unloading first,
+        counting the travel time and the trucks already dispatched to it.
+    """
+
+    NEAREST_AVAILABLE = 0
+    LOWEST_ETA = 1
+
+
+class ReportMode(Enum):
+    """Report mode Enum; how the report shows trucks and unload stations.
+    FULL: a row per truck and per unload station.
+    SUMMARY: fleet-wide aggregates, percentile bands, utilization histograms and the trucks waiting the longest;
+        for fleets too large to read (or log) a row per truck.
+    """
+
+    FULL = 0
+    SUMMARY = 1
+
+
+class TruckPhase(IntEnum):
+    """Phase of a truck in the fleet store."""
+
+    MINING = 0
+    TRAVELING_TO_STATION = 1
+    WAITING = 2
+    UNLOADING = 3
+    TRAVELING_TO_SITE = 4
+
+
+class LogLevel(IntEnum):
+    """Log level Enum. Messages below the level of the logger are dropped."""
+
+    DEBUG = 10
+    INFO = 20
+    WARNING = 30
+
+
+class LogCategory(Enum):
+    """Log category Enum. Messages of disabled categories are dropped."""
+
+    TRUCK_MOVEMENT = 0
+    MINING = 1
+    STATION = 2
+    QUEUE = 3
+    SUMMARY = 4
+
+
+class OverflowPolicy(Enum):
+    """Overflow policy Enum of the log buffer; what to do when the buffer of the logger is full.
+    BLOCK: wait until the logger thread prints buffered messages; no message is dropped.
+    DROP_OLDEST: drop the oldest buffered message.
+    SAMPLE: keep only one of every N overflowing messages (dropping the oldest one); drop the others.
+    """
+
+    BLOCK = 0
+    DROP_OLDEST = 1
+    SAMPLE = 2
+
+
+class TraceEvent(IntEnum):
+    """Event type code of the binary event trace."""
+
+    MINING_STARTED = 0
+    MINING_COMPLETED = 1
+    TRUCK_ARRIVED = 2
+    TRUCK_WAITING = 3
+    UNLOAD_STARTED = 4
+    UNLOAD_COMPLETED = 5
+    MINING_SITE_ARRIVED = 6
 
 
 # Unload Station
 UNLOADING_TIME_FOR_H3_UNLOAD_STATION = 5
+UNLOADING_TIME_FOR_REGOLITH_UNLOAD_STATION = 10
 
 # Mining Truck
 TRAVELING_TIME_FOR_H3_MINING_TRUCK = 30
 SHORTEST_TIME_FOR_MINING_H3 = 60
 LONGEST_TIME_FOR_MINING_H3 = 300
+TRAVELING_TIME_FOR_REGOLITH_MINING_TRUCK = 20
+SHORTEST_TIME_FOR_MINING_REGOLITH = 30
+LONGEST_TIME_FOR_MINING_REGOLITH = 120
+
+# Names of mining types in truck and unload station names
+MINING_TYPE_NAMES = {
+    MiningType.HELIUM_3: "H3",
+    MiningType.REGOLITH: "Regolith",
+}
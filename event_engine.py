@@ -0,0 +1,412 @@
+import asyncio
+import heapq
+from abc import ABC, abstractmethod
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from UnloadStations.unload_station import UnloadStation
+from Vehicles.mining_truck import MiningTruck
+from const import LogCategory, TraceEvent, TruckPhase
+from time_converter import convert_sim_time_to_real_time_in_sec
+from simulation_logger import SimulationLogger
+
+
+class EventType(IntEnum):
+    """Event types for the discrete event engine.
+    If several events happen at the same simulation time, the event with the smaller value is handled first.
+    So an unload station released by UNLOAD_COMPLETE can serve a truck arriving at the same minute,
+        and SAMPLE sees the state after every other event of the minute.
+    """
+
+    UNLOAD_COMPLETE = 0
+    TRUCK_ARRIVED = 1
+    MINING_COMPLETE = 2
+    MINING_SITE_ARRIVED = 3
+    NOTIFY = 4
+    SAMPLE = 5
+
+
+class TruckEventHandlers(ABC):
+    """Handlers of the events of trucks: a truck mines, travels to an unload station, waits, unloads and travels back.
+    Shared by DiscreteEventEngine (trucks and unload stations are objects) and FleetEngine (trucks and unload
+        stations are indexes into typed arrays), so both handle the same events in the same order.
+    Subclasses keep only the storage: how to schedule an event of a truck, and what each step saves.
+    Each handler takes (truck, unload station or None, mining time carried by the truck).
+    """
+
+    @abstractmethod
+    def _schedule_truck(
+        self, delay: int, event_type: EventType, truck: Any, station: Any = None, mining_time: int = 0
+    ) -> None:
+        """Schedule the next event of a truck.
+
+        :param delay: simulation minutes from now
+        :param event_type: type of the event
+        :param truck: truck of the event
+        :param station: unload station of the event; None if not related
+        :param mining_time: mining time carried by the truck
+        """
+
+    @abstractmethod
+    def _get_mining_time(self, truck: Any) -> int:
+        """Get the next mining time of the truck in simulation minutes."""
+
+    @abstractmethod
+    def _mining_started(self, truck: Any, mining_time: int) -> None:
+        """Save that the truck started to mine for the given simulation minutes."""
+
+    @abstractmethod
+    def _mining_completed(self, truck: Any) -> None:
+        """Save that the truck completed mining and left its mining site."""
+
+    @abstractmethod
+    def _dispatch_departing_truck(self, truck: Any) -> Tuple[Any, int]:
+        """Choose where the truck leaving its mining site unloads.
+
+        :return: unload station (None for any available one) and travel time in simulation minutes
+        """
+
+    @abstractmethod
+    def _truck_arrived(self, truck: Any, station: Any, mining_time: int) -> Any:
+        """Save the arrival of the truck, and take an unload station or put the truck into a queue.
+
+        :return: unload station to unload the truck; None if the truck is waiting
+        """
+
+    @abstractmethod
+    def _unload_started(self, truck: Any, station: Any) -> int:
+        """Save that the truck started to unload at the unload station.
+
+        :return: unloading time in simulation minutes
+        """
+
+    @abstractmethod
+    def _unload_completed(self, truck: Any, station: Any) -> Any:
+        """Save the unload, and take the next truck for the unload station or release it.
+
+        :return: next truck to unload at the unload station; None if there is no truck waiting
+        """
+
+    @abstractmethod
+    def _get_travel_time(self, truck: Any, station: Any) -> int:
+        """Get the travel time from the unload station back to the mining site of the truck in simulation minutes."""
+
+    def _mining_site_arrived(self, truck: Any) -> None:
+        """Save that the truck arrived at its mining site."""
+
+    def _start_to_mining(self, truck: Any) -> None:
+        """Start to mining at a mining site."""
+        mining_time = self._get_mining_time(truck)
+        self._mining_started(truck, mining_time)
+        self._schedule_truck(mining_time, EventType.MINING_COMPLETE, truck, mining_time=mining_time)
+
+    def start_to_unload(self, truck: Any, station: Any) -> None:
+        """Start to unload the truck at the given unload station."""
+        unloading_time = self._unload_started(truck, station)
+        self._schedule_truck(unloading_time, EventType.UNLOAD_COMPLETE, truck, station=station)
+
+    def _on_mining_complete(self, truck: Any, station: Any, mining_time: int) -> None:
+        """Event: When a truck completed mining. Leave the mining site."""
+        self._mining_completed(truck)
+        station, travel_time = self._dispatch_departing_truck(truck)
+        self._schedule_truck(travel_time, EventType.TRUCK_ARRIVED, truck, station=station, mining_time=mining_time)
+
+    def _on_truck_arrived(self, truck: Any, station: Any, mining_time: int) -> None:
+        """Event: When a truck arrives to unload."""
+        station = self._truck_arrived(truck, station, mining_time)
+        if station is not None:
+            self.start_to_unload(truck, station)
+
+    def _on_unload_complete(self, truck: Any, station: Any, mining_time: int) -> None:
+        """Event: When a truck is completed unloads. Send the truck to a mining site."""
+        next_truck = self._unload_completed(truck, station)
+        self._schedule_truck(self._get_travel_time(truck, station), EventType.MINING_SITE_ARRIVED, truck)
+        if next_truck is not None:
+            self.start_to_unload(next_truck, station)
+
+    def _on_mining_site_arrived(self, truck: Any, station: Any, mining_time: int) -> None:
+        """Event: When a truck arrives at a mining site."""
+        self._mining_site_arrived(truck)
+        self._start_to_mining(truck)
+
+
+class DiscreteEventEngine(TruckEventHandlers):
+    """Discrete event engine for the simulation.
+    Instead of waiting in the real world time, keeps a priority queue of timestamped events
+        and jumps straight to the next one.
+    Dispatching trucks to unload stations is still done by the MiningControlCenter.
+    """
+
+    def __init__(
+        self,
+        control_center: "MiningControlCenter",
+        sim_time_unit: int,
+        logger: SimulationLogger,
+        notify_interval: int = 30,
+        log_events: bool = True,
+        sample_interval: int = 0,
+    ):
+        """
+        :param control_center: MiningControlCenter instance
+        :param sim_time_unit: simulation time unit
+        :param logger: logger of the simulation
+        :param notify_interval: interval of the progress notification in simulation minutes
+        :param log_events: whether to log events; False for batch runs which need statistics only
+        :param sample_interval: interval to sample the time series of the control center in simulation minutes;
+            0 not to sample
+        """
+        self._control_center = control_center
+        self._sim_time_unit = sim_time_unit
+        self._logger = logger
+        self._notify_interval = notify_interval
+        self._log_events = log_events
+        self._sample_interval = sample_interval
+
+        # Current simulation time in minutes
+        self.now = 0
+        # Whether the trucks have started: by start(), or by restore() from a snapshot of a started engine
+        self.started = False
+
+        # Heap of (time, event type, sequence, truck, station, mining time).
+        # Sequence keeps events in scheduled order if time and event type are the same.
+        self._events: List[Tuple[int, EventType, int, Optional[MiningTruck], Optional[UnloadStation], int]] = []
+        self._sequence = 0
+
+        self._handlers: Dict[EventType, Callable[..., None]] = {
+            EventType.UNLOAD_COMPLETE: self._on_unload_complete,
+            EventType.TRUCK_ARRIVED: self._on_truck_arrived,
+            EventType.MINING_COMPLETE: self._on_mining_complete,
+            EventType.MINING_SITE_ARRIVED: self._on_mining_site_arrived,
+            EventType.NOTIFY: self._on_notify,
+            EventType.SAMPLE: self._on_sample,
+        }
+
+    def get_time_in_real_time(self) -> float:
+        """Get the current simulation time as real world seconds; Clock for SimulationLogger.
+
+        :return: current simulation time in real world seconds.
+        """
+        return self.now / self._sim_time_unit
+
+    def schedule(
+        self,
+        delay: int,
+        event_type: EventType,
+        truck: Optional[MiningTruck] = None,
+        station: Optional[UnloadStation] = None,
+        mining_time: int = 0,
+    ) -> None:
+        """Schedule an event.
+
+        :param delay: simulation minutes from now
+        :param event_type: type of the event
+        :param truck: truck of the event; None if not related
+        :param station: unload station of the event; None if not related
+        :param mining_time: mining time carried by the truck
+        """
+        heapq.heappush(
+            self._events,
+            (self.now + delay, event_type, self._sequence, truck, station, mining_time),
+        )
+        self._sequence += 1
+
+    def start(self, trucks: Any) -> None:
+        """Let all trucks start to mining. Each truck starts at a mining site.
+
+        :param trucks: trucks to start
+        """
+        self.started = True
+        for truck in trucks:
+            self._start_to_mining(truck)
+        if self._log_events:
+            self.schedule(self._notify_interval, EventType.NOTIFY)
+        if self._sample_interval:
+            self.schedule(self._sample_interval, EventType.SAMPLE)
+
+    def run(self, duration: int) -> None:
+        """Handle events in time order until the given simulation time.
+
+        :param duration: test duration in simulation minutes
+        """
+        while self._events and self._events[0][0] <= duration:
+            time, event_type, _, truck, station, mining_time = heapq.heappop(self._events)
+            self.now = time
+            self._handlers[event_type](truck, station, mining_time)
+        self.now = duration
+
+    async def run_paced(self, duration: int) -> None:
+        """Handle events in time order until the given simulation time, paced by the clock of the running event loop.
+        One coroutine for the whole fleet: instead of a task per truck and unload station,
+            sleeps only until the deadline of the next event and handles every event due by then.
+
+        :param duration: test duration in simulation minutes
+        """
+        loop = asyncio.get_running_loop()
+        # Deadlines are absolute from the clock at the current simulation time: time to handle events does not add up.
+        start = loop.time() - self.get_time_in_real_time()
+        while self._events and self._events[0][0] <= duration:
+            next_time = self._events[0][0]
+            delay = start + convert_sim_time_to_real_time_in_sec(next_time, self._sim_time_unit) - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.run(duration=next_time)
+        delay = start + convert_sim_time_to_real_time_in_sec(duration, self._sim_time_unit) - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.now = duration
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the state of the engine: the clock and pending events with ids instead of objects.
+        Every truck is either waiting in the queue of the control center or has exactly one pending event,
+            so pending events keep the phase and the remaining time of every truck and in-progress unload.
+
+        :return: state of the engine
+        """
+        return {
+            "now": self.now,
+            "sequence": self._sequence,
+            "log_events": self._log_events,
+            "events": [
+                (
+                    time,
+                    int(event_type),
+                    sequence,
+                    truck.truck_id if truck is not None else 0,
+                    station.station_id if station is not None else 0,
+                    mining_time,
+                )
+                for time, event_type, sequence, truck, station, mining_time in self._events
+            ],
+        }
+
+    def restore(
+        self,
+        state: Dict[str, Any],
+        trucks: Dict[int, MiningTruck],
+        stations: Dict[int, UnloadStation],
+    ) -> None:
+        """Restore the state of the engine from a snapshot.
+
+        :param state: state from snapshot()
+        :param trucks: trucks by id
+        :param stations: unload stations by id
+        """
+        self.started = True
+        self.now = state["now"]
+        self._sequence = state["sequence"]
+        self._events = [
+            (
+                time,
+                EventType(event_type),
+                sequence,
+                trucks.get(truck_id),
+                stations.get(station_id),
+                mining_time,
+            )
+            for time, event_type, sequence, truck_id, station_id, mining_time in state["events"]
+        ]
+        heapq.heapify(self._events)
+
+    def count_phases(self) -> List[int]:
+        """Count trucks in each phase from pending events; trucks waiting in queues have no pending event.
+
+        :return: number of trucks in each TruckPhase; 0 for WAITING
+        """
+        phases = {
+            EventType.MINING_COMPLETE: TruckPhase.MINING,
+            EventType.TRUCK_ARRIVED: TruckPhase.TRAVELING_TO_STATION,
+            EventType.UNLOAD_COMPLETE: TruckPhase.UNLOADING,
+            EventType.MINING_SITE_ARRIVED: TruckPhase.TRAVELING_TO_SITE,
+        }
+        counts = [0] * len(TruckPhase)
+        for _, event_type, _, _, _, _ in self._events:
+            if event_type in phases:
+                counts[phases[event_type]] += 1
+        return counts
+
+    def _log(self, category: LogCategory, template: str, *args: Any) -> None:
+        """Log the event message if logging events is enabled."""
+        if self._log_events:
+            self._logger.log_event(category, template, *args)
+
+    def _trace(self, event: TraceEvent, truck: MiningTruck, duration: float = 0) -> None:
+        """Write the event of the truck to the event trace of the logger."""
+        self._logger.trace_event(event, truck_id=truck.truck_id, duration=duration, sim_time=self.now)
+
+    def _schedule_truck(
+        self,
+        delay: int,
+        event_type: EventType,
+        truck: MiningTruck,
+        station: Optional[UnloadStation] = None,
+        mining_time: int = 0,
+    ) -> None:
+        """Schedule the next event of a truck."""
+        self.schedule(delay, event_type, truck=truck, station=station, mining_time=mining_time)
+
+    def _get_mining_time(self, truck: MiningTruck) -> int:
+        """Get the next mining time of the truck."""
+        return truck.get_mining_time()
+
+    def _mining_started(self, truck: MiningTruck, mining_time: int) -> None:
+        """Log and trace that the truck started to mine; update the phase counts of the control center."""
+        self._log(LogCategory.MINING, "+++ Mining time: {} minutes.", mining_time)
+        self._trace(TraceEvent.MINING_STARTED, truck=truck, duration=mining_time)
+        self._control_center.mining_started(truck=truck)
+
+    def _mining_completed(self, truck: MiningTruck) -> None:
+        """Log and trace that the truck completed mining; update the phase counts of the control center."""
+        self._log(LogCategory.MINING, "++> {} completed for mining. Leave the mining site.", truck.name)
+        self._trace(TraceEvent.MINING_COMPLETED, truck=truck)
+        self._control_center.mining_completed(truck=truck)
+
+    def _dispatch_departing_truck(self, truck: MiningTruck) -> Tuple[Optional[UnloadStation], int]:
+        """Let the control center choose where the truck unloads."""
+        return self._control_center.dispatch_departing_truck(truck=truck)
+
+    def _truck_arrived(
+        self, truck: MiningTruck, station: Optional[UnloadStation], mining_time: int
+    ) -> Optional[UnloadStation]:
+        """Log and trace the arrival, save the mining, and let the control center dispatch the truck."""
+        self._log(LogCategory.TRUCK_MOVEMENT, "--> {} arrived and ready to unload.", truck.name)
+        self._trace(TraceEvent.TRUCK_ARRIVED, truck=truck, duration=mining_time)
+        truck.record_mining(mining_time=mining_time)
+        return self._control_center.dispatch_arrived_truck(truck=truck, station=station)
+
+    def _unload_started(self, truck: MiningTruck, station: UnloadStation) -> int:
+        """Log that the unload station started to unload the truck."""
+        truck_name = truck.name if truck.name else "Unknown Truck"
+        self._log(LogCategory.STATION, "(+) {} started unloading from {}.", station.name, truck_name)
+        return station.get_unloading_time(truck)
+
+    def _unload_completed(self, truck: MiningTruck, station: UnloadStation) -> Optional[MiningTruck]:
+        """Log the unload, and let the control center save it and find the next truck for the unload station."""
+        truck_name = truck.name if truck.name else "Unknown Truck"
+        self._log(LogCategory.STATION, "(-) {} finished unloading from {}.", station.name, truck_name)
+        station.record_unload(unloading_time=station.get_unloading_time(truck))
+        next_truck = self._control_center.dispatch_unloaded_truck(truck=truck, station=station)
+        self._log(LogCategory.TRUCK_MOVEMENT, "<-- {} left the control center.", truck.name)
+        return next_truck
+
+    def _get_travel_time(self, truck: MiningTruck, station: UnloadStation) -> int:
+        """Let the control center get the travel time back to the mining site of the truck."""
+        return self._control_center.get_travel_time(truck=truck, station=station)
+
+    def _mining_site_arrived(self, truck: MiningTruck) -> None:
+        """Log and trace that the truck arrived at its mining site."""
+        self._log(LogCategory.TRUCK_MOVEMENT, "<++ {} arrived at a mining site.", truck.name)
+        self._trace(TraceEvent.MINING_SITE_ARRIVED, truck=truck)
+
+    def _on_notify(self, truck: None, station: None, mining_time: int) -> None:
+        """Event: Notify the progress."""
+        if self._log_events:
+            self._logger.log(message=f"-- Notify every {self._notify_interval} minutes. --")
+        self.schedule(self._notify_interval, EventType.NOTIFY)
+
+    def _on_sample(self, truck: None, station: None, mining_time: int) -> None:
+        """Event: Sample the time series of the control center."""
+        if not self._sample_interval:
+            # Restored from a checkpoint of a sampled simulation without a sampler
+            return
+        self._control_center.sample()
+        self.schedule(self._sample_interval, EventType.SAMPLE)
@@ -0,0 +1,134 @@
+import struct
+from typing import Dict, Optional
+
+import numpy as np
+
+from const import TraceEvent
+
+# File header: magic and version of the trace format, then the fleet size (int32 trucks, int32 unload stations)
+TRACE_MAGIC = b"MINTRC02"
+_HEADER = struct.Struct("<8sii")
+
+# Fixed-width record (24 bytes, little endian):
+#   sim time in minutes (float64), event type code (uint8), padding (3 bytes),
+#   truck id (int32), unload station id (int32), duration in minutes (float32)
+_RECORD = struct.Struct("<dB3xiif")
+
+# NumPy structured dtype of the record; same layout as _RECORD.
+TRACE_DTYPE = np.dtype(
+    {
+        "names": ["sim_time", "event", "truck_id", "station_id", "duration"],
+        "formats": ["<f8", "u1", "<i4", "<i4", "<f4"],
+        "offsets": [0, 8, 12, 16, 20],
+        "itemsize": _RECORD.size,
+    }
+)
+
+
+class TraceWriter:
+    """Writer of the binary event trace.
+    Appends every event as a fixed-width record. Records are packed into a buffer and written in batches.
+    """
+
+    def __init__(self, path: str, batch_size: int = 4096, trucks: int = 0, stations: int = 0):
+        """
+        :param path: path of the trace file
+        :param batch_size: number of records to buffer before writing
+        :param trucks: number of mining trucks of the fleet; 0 if not known yet (see set_fleet)
+        :param stations: number of unload stations of the fleet; 0 if not known yet
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive integer")
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(TRACE_MAGIC, trucks, stations))
+        self._buffer = bytearray(_RECORD.size * batch_size)
+        self._offset = 0
+        self.records = 0
+
+    def write(
+        self,
+        sim_time: float,
+        event: TraceEvent,
+        truck_id: int = -1,
+        station_id: int = -1,
+        duration: float = 0,
+    ) -> None:
+        """Append an event record.
+
+        :param sim_time: simulation time of the event in minutes
+        :param event: event type
+        :param truck_id: id of the truck; -1 if not related
+        :param station_id: id of the unload station; -1 if not related
+        :param duration: duration of the event in minutes (e.g., mining time, unloading time, wait time)
+        """
+        _RECORD.pack_into(self._buffer, self._offset, sim_time, event, truck_id, station_id, duration)
+        self._offset += _RECORD.size
+        self.records += 1
+        if self._offset == len(self._buffer):
+            self.flush()
+
+    def set_fleet(self, trucks: int, stations: int) -> None:
+        """Write the fleet size into the header; e.g., MiningControlCenter writes its own.
+
+        :param trucks: number of mining trucks
+        :param stations: number of unload stations
+        """
+        end = self._file.tell()
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(TRACE_MAGIC, trucks, stations))
+        self._file.seek(end)
+
+    def flush(self) -> None:
+        """Write buffered records to the file."""
+        if self._offset:
+            self._file.write(memoryview(self._buffer)[:self._offset])
+            self._offset = 0
+        self._file.flush()
+
+    def close(self) -> None:
+        """Write buffered records and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def read_trace_header(path: str) -> Dict[str, int]:
+    """Read the header of the binary event trace.
+
+    :param path: path of the trace file
+    :return: number of trucks and unload stations of the fleet; 0 if the writer did not know them
+    """
+    with open(path, "rb") as trace_file:
+        header = trace_file.read(_HEADER.size)
+    if len(header) < _HEADER.size or header[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+        raise ValueError(f"{path} is not an event trace file")
+    _, trucks, stations = _HEADER.unpack(header)
+    return {"trucks": trucks, "stations": stations}
+
+
+def read_trace(path: str, event: Optional[TraceEvent] = None) -> np.ndarray:
+    """Read the binary event trace as a NumPy structured array.
+    The file is memory-mapped, so records are not copied or parsed until they are used.
+
+    :param path: path of the trace file
+    :param event: event type to select; None for all events (zero-copy)
+    :return: structured array with TRACE_DTYPE fields
+    """
+    read_trace_header(path)
+    with open(path, "rb") as trace_file:
+        trace_file.seek(0, 2)
+        # Ignore a partial record at the end of the file (e.g., the simulation crashed while writing).
+        records = (trace_file.tell() - _HEADER.size) // TRACE_DTYPE.itemsize
+
+    if records == 0:
+        return np.zeros(0, dtype=TRACE_DTYPE)
+    trace = np.memmap(path, dtype=TRACE_DTYPE, mode="r", offset=_HEADER.size, shape=(records,))
+    if event is not None:
+        return trace[trace["event"] == event]
+    return trace
@@ -0,0 +1,241 @@
+import argparse
+import math
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from monte_carlo_engine import MonteCarloEngine, MonteCarloResult
+from mva_solver import MVASolver
+from report_exporters import Column, TableExporter
+
+# Columns of the table of evaluated candidates
+CANDIDATE_COLUMNS = [
+    Column(key="m", header="Unload stations"),
+    Column(key="mean", header="Mean", fmt=lambda value: f"{value:.3f}"),
+    Column(key="half_width", header="CI half-width", fmt=lambda value: f"{value:.3f}"),
+    Column(key="replications", header="Replications"),
+    Column(key="passed", header="Result", fmt=lambda passed: "pass" if passed else "fail"),
+]
+
+# Metrics which the optimizer can target: value per replication. Every metric decreases with more unload stations.
+METRICS: Dict[str, Callable[[MonteCarloResult], np.ndarray]] = {
+    "p95_wait_time": lambda result: result.wait_time_quantile(0.95),
+    "p99_wait_time": lambda result: result.wait_time_quantile(0.99),
+    "mean_wait_time": lambda result: result.mean_wait_time(),
+    "unloading_utilization": lambda result: result.station_utilization().mean(axis=1),
+}
+
+
+class CandidateResult:
+    """Result of evaluating a number of unload stations against the target."""
+
+    def __init__(self, m: int, passed: bool, mean: float, half_width: float, replications: int):
+        """
+        :param m: number of unload stations
+        :param passed: whether the metric is below the target
+        :param mean: mean of the metric across replications
+        :param half_width: half-width of the confidence interval of the mean
+        :param replications: number of replications run for this candidate
+        """
+        self.m = m
+        self.passed = passed
+        self.mean = mean
+        self.half_width = half_width
+        self.replications = replications
+
+
+class FleetSizingOptimizer:
+    """Find the minimum number of unload stations for n trucks which keeps a metric below the target.
+    Candidates are simulated with MonteCarloEngine in batches of replications.
+    Every candidate uses the same seed, so replication r of every candidate mines with the same mining times
+        (common random numbers): neighbouring candidates differ only in the number of unload stations.
+    A candidate stops early as soon as the confidence interval of its mean is entirely below or above the target.
+    The search starts from the analytic model (MVASolver), gallops to bracket the answer and bisects.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        metric: str,
+        target: float,
+        duration: int = 72,
+        seed: int = 0,
+        batch_size: int = 10,
+        max_replications: int = 200,
+        confidence_z: float = 1.96,
+        max_stations: Optional[int] = None,
+    ):
+        """
+        :param n: number of mining trucks
+        :param metric: metric to keep below the target; one of METRICS
+        :param target: target of the metric; e.g., 10 for p95_wait_time, 0.8 for unloading_utilization
+        :param duration: test duration in simulation hours
+        :param seed: seed shared by all candidates
+        :param batch_size: number of replications to run at a time
+        :param max_replications: maximum number of replications per candidate
+        :param confidence_z: z value of the confidence interval; 1.96 for 95%
+        :param max_stations: the largest number of unload stations to try; None for n
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}. Use one of {', '.join(METRICS)}")
+        if n <= 0 or batch_size <= 0 or max_replications < batch_size:
+            raise ValueError("n and batch_size must be positive, and max_replications must be at least batch_size")
+        self._n = n
+        self._metric = metric
+        self._target = target
+        self._duration = duration
+        self._seed = seed
+        self._batch_size = batch_size
+        self._max_replications = max_replications
+        self._confidence_z = confidence_z
+        self._max_stations = max_stations if max_stations is not None else n
+
+        # Evaluated candidates: number of unload stations -> result
+        self.candidates: Dict[int, CandidateResult] = {}
+
+    @property
+    def replications_run(self) -> int:
+        """Total number of replications run for all candidates."""
+        return sum(candidate.replications for candidate in self.candidates.values())
+
+    def evaluate(self, m: int) -> CandidateResult:
+        """Simulate m unload stations in batches until the confidence interval clearly passes or fails the target.
+
+        :param m: number of unload stations
+        :return: result of the candidate
+        """
+        if m in self.candidates:
+            return self.candidates[m]
+
+        values = np.zeros(0)
+        mean, half_width = math.inf, math.inf
+        while len(values) < self._max_replications:
+            result = MonteCarloEngine(
+                n=self._n,
+                m=m,
+                replications=self._batch_size,
+                seed=self._seed,
+                first_replication=len(values),
+                record_wait_distribution=self._metric.endswith("wait_time"),
+            ).run(duration=self._duration)
+            # A replication without unloads never meets the target.
+            batch_values = np.nan_to_num(METRICS[self._metric](result), nan=math.inf)
+            values = np.concatenate([values, batch_values])
+
+            mean = float(values.mean())
+            if math.isinf(mean):
+                break
+            half_width = self._confidence_z * float(values.std(ddof=1)) / math.sqrt(len(values))
+            if len(values) > 1 and (mean + half_width < self._target or mean - half_width >= self._target):
+                break
+
+        candidate = CandidateResult(
+            m=m, passed=mean < self._target, mean=mean, half_width=half_width, replications=len(values)
+        )
+        self.candidates[m] = candidate
+        return candidate
+
+    def _get_initial_guess(self) -> int:
+        """Get the smallest number of unload stations which meets the target in the analytic model.
+        Quantiles are not in the model: start from the mean queueing delay, which is below the mean wait time
+            (the wait of a truck which queues includes its unloading): the wait must be below the target too.
+        """
+        for m in range(1, self._max_stations + 1):
+            expected = MVASolver(n=self._n, m=m).solve()
+            value = expected["unloading_utilization"] if self._metric == "unloading_utilization" else (
+                expected["mean_queueing_delay"]
+            )
+            if value < self._target:
+                return m
+        return self._max_stations
+
+    def optimize(self) -> Optional[CandidateResult]:
+        """Find the minimum number of unload stations which meets the target.
+
+        :return: result of the minimum passing candidate; None if even max_stations does not meet the target
+        """
+        # Bracket the answer: lower fails, upper passes
+        lower, upper = 0, None
+        guess = self._get_initial_guess()
+        step = 1
+        if self.evaluate(guess).passed:
+            upper = guess
+            # Gallop down until a candidate fails
+            while upper - step >= 1:
+                if self.evaluate(upper - step).passed:
+                    upper -= step
+                    step *= 2
+                else:
+                    lower = upper - step
+                    break
+        else:
+            lower = guess
+            # Gallop up until a candidate passes
+            while lower < self._max_stations:
+                m = min(lower + step, self._max_stations)
+                if self.evaluate(m).passed:
+                    upper = m
+                    break
+                lower = m
+                step *= 2
+            if upper is None:
+                return None
+
+        # Bisect between the failing lower and the passing upper
+        while upper - lower > 1:
+            middle = (lower + upper) // 2
+            if self.evaluate(middle).passed:
+                upper = middle
+            else:
+                lower = middle
+        return self.candidates[upper]
+
+
+def format_candidates(candidates: List[CandidateResult]) -> List[str]:
+    """Format evaluated candidates as table lines.
+
+    :param candidates: evaluated candidates
+    :return: lines of the table
+    """
+    exporter = TableExporter()
+    exporter.begin_table(name="candidates", columns=CANDIDATE_COLUMNS)
+    for candidate in sorted(candidates, key=lambda candidate: candidate.m):
+        exporter.write_row(
+            [candidate.m, candidate.mean, candidate.half_width, candidate.replications, candidate.passed]
+        )
+    exporter.end_table()
+    return exporter.lines
+
+
+if __name__ == "__main__":
+    """Find the minimum number of unload stations. e.g.,
+    python fleet_optimizer.py --trucks 100 --metric p95_wait_time --target 10 --duration 72
+    """
+    parser = argparse.ArgumentParser(description="Fleet sizing: minimum number of unload stations for a target")
+    parser.add_argument("--trucks", type=int, required=True, help="number of mining trucks")
+    parser.add_argument("--metric", choices=list(METRICS), default="p95_wait_time", help="metric to keep below")
+    parser.add_argument("--target", type=float, required=True, help="target of the metric")
+    parser.add_argument("--duration", type=int, default=72, help="test duration in simulation hours")
+    parser.add_argument("--seed", type=int, default=0, help="seed shared by all candidates")
+    parser.add_argument("--batch", type=int, default=10, help="number of replications to run at a time")
+    parser.add_argument("--max-replications", type=int, default=200, help="maximum replications per candidate")
+    args = parser.parse_args()
+
+    optimizer = FleetSizingOptimizer(
+        n=args.trucks,
+        metric=args.metric,
+        target=args.target,
+        duration=args.duration,
+        seed=args.seed,
+        batch_size=args.batch,
+        max_replications=args.max_replications,
+    )
+    best = optimizer.optimize()
+    print("\n".join(format_candidates(list(optimizer.candidates.values()))))
+    if best is None:
+        print(f"No number of unload stations up to {args.trucks} keeps {args.metric} below {args.target}.")
+    else:
+        print(
+            f"Minimum unload stations: {best.m} ({args.metric} {best.mean:.3f} ± {best.half_width:.3f}). "
+            f"Replications run: {optimizer.replications_run}."
+        )
@@ -0,0 +1,372 @@
+import argparse
+import heapq
+import math
+import tracemalloc
+from array import array
+from collections import deque
+from random import randint
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+
+from const import (
+    SimulationMode,
+    TruckPhase,
+    UNLOADING_TIME_FOR_H3_UNLOAD_STATION,
+    TRAVELING_TIME_FOR_H3_MINING_TRUCK,
+    SHORTEST_TIME_FOR_MINING_H3,
+    LONGEST_TIME_FOR_MINING_H3,
+)
+from event_engine import EventType, TruckEventHandlers
+from random_streams import derive_truck_key, draw_mining_time
+from streaming_stats import DistributionStats, RunningStats
+
+# Bits of the packed event key: time | event type | sequence | truck index
+_TYPE_BITS = 3
+_SEQUENCE_BITS = 40
+_TRUCK_BITS = 24
+_TRUCK_MASK = (1 << _TRUCK_BITS) - 1
+_SEQUENCE_SHIFT = _TRUCK_BITS
+_TYPE_SHIFT = _SEQUENCE_SHIFT + _SEQUENCE_BITS
+_TIME_SHIFT = _TYPE_SHIFT + _TYPE_BITS
+
+# The largest fleet: the truck index has to fit in its bits of the event key
+MAX_TRUCKS = 1 << _TRUCK_BITS
+
+
+class FleetStore:
+    """Struct-of-arrays store of the fleet: truck state lives in typed arrays indexed by truck index (id - 1).
+    A truck costs tens of bytes instead of an object with a dict, a name string and a coroutine.
+    Names are generated only when trucks are reported.
+    """
+
+    def __init__(self, n: int):
+        """
+        :param n: number of mining trucks
+        """
+        if not 0 < n <= MAX_TRUCKS:
+            raise ValueError(f"n must be between 1 and {MAX_TRUCKS}")
+        self.n = n
+        self.phase = array("B", bytes(n))
+        # Simulation minute of the pending event of each truck; the truck is waiting if its phase is WAITING
+        self.next_event_time = array("q", bytes(8 * n))
+        self.mining_time = array("I", bytes(4 * n))
+        # Unload station where the truck unloads (or unloaded last)
+        self.station = array("i", bytes(4 * n))
+        self.total_mining = array("l", bytes(array("l").itemsize * n))
+        self.total_mining_time = array("q", bytes(8 * n))
+        self.total_wait_time = array("q", bytes(8 * n))
+        self.start_to_wait = array("q", bytes(8 * n))
+        self.arrived_at = array("q", bytes(8 * n))
+        # Last unload completion of each truck; -1 before the first one, whose cycle started at a mining site
+        self.cycle_start = array("q", [-1]) * n
+        # Random substream of each truck: key and how many times the truck mined
+        self.stream_key = array("Q", bytes(8 * n))
+        self.stream_cycle = array("l", bytes(array("l").itemsize * n))
+
+    @staticmethod
+    def name(index: int) -> str:
+        """Generate the name of a truck.
+
+        :param index: truck index (truck id - 1)
+        :return: name of the truck
+        """
+        return f"H3 Truck #{index + 1}"
+
+    def report(self, index: int) -> Dict[str, Any]:
+        """Reports simulation statistics of a truck; same as H3MiningTruck.report.
+
+        :param index: truck index
+        :return: simulation statistics
+        """
+        return {
+            "Total mining time": self.total_mining_time[index],
+            "Total mining": self.total_mining[index],
+            "Total wait time": self.total_wait_time[index],
+        }
+
+
+class FleetEngine(TruckEventHandlers):
+    """Discrete event engine on the fleet store: events refer to trucks and unload stations by index.
+    Each truck has at most one pending event, packed into a single integer of the event heap:
+        (time, event type, sequence, truck index) in one int keeps the order of DiscreteEventEngine.
+    The handlers of the events are those of DiscreteEventEngine (TruckEventHandlers); this engine keeps only
+        the storage: the fleet store, the queue and the available unload stations of MiningControlCenter.
+        So the same seed gives the same statistics as MiningControlCenter.simulate.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        m: int,
+        seed: Optional[int] = None,
+        replication: int = 0,
+        antithetic: bool = False,
+        travel_time: int = TRAVELING_TIME_FOR_H3_MINING_TRUCK,
+        unloading_time: int = UNLOADING_TIME_FOR_H3_UNLOAD_STATION,
+        shortest_mining_time: int = SHORTEST_TIME_FOR_MINING_H3,
+        longest_mining_time: int = LONGEST_TIME_FOR_MINING_H3,
+    ):
+        """
+        :param n: number of mining trucks
+        :param m: number of mining unload stations
+        :param seed: master seed; each truck mines from its own substream. None for the random module
+        :param replication: index of the replication
+        :param antithetic: whether replications are antithetic pairs (2k, 2k + 1); odd replications mine the mirrored
+            times of the even one
+        :param travel_time: travel time between a mining site and an unload station in simulation minutes
+        :param unloading_time: unloading time of a truck in simulation minutes
+        :param shortest_mining_time: shortest mining time in simulation minutes
+        :param longest_mining_time: longest mining time in simulation minutes
+        """
+        if m <= 0:
+            raise ValueError("m must be positive integer")
+        if not 0 < longest_mining_time < 1 << 32:
+            raise ValueError("longest_mining_time must fit in an unsigned 32-bit integer")
+        self.trucks = FleetStore(n)
+        self.m = m
+        self._seed = seed
+        self._mirrored = False
+        if antithetic:
+            # Both replications of an antithetic pair use the same keys
+            replication, mirrored = divmod(replication, 2)
+            self._mirrored = bool(mirrored)
+        self._travel_time = travel_time
+        self._unloading_time = unloading_time
+        self._shortest_mining_time = shortest_mining_time
+        self._longest_mining_time = longest_mining_time
+        self._span = longest_mining_time - shortest_mining_time + 1
+        if seed is not None:
+            for index in range(n):
+                self.trucks.stream_key[index] = derive_truck_key(seed=seed, truck_id=index + 1, replication=replication)
+
+        self.station_total_unloads = array("q", bytes(8 * m))
+        self._trucks_to_unload = deque()
+        self._available_unload_stations = deque(range(m))
+        self.unloads = 0
+        self.wait_time_stats = DistributionStats()
+        self.cycle_time_stats = DistributionStats()
+        self.response_time_stats = DistributionStats()
+        self.queue_length_stats = DistributionStats()
+
+        # Current simulation time in minutes
+        self.now = 0
+        self._events = []
+        self._sequence = 0
+        self._handlers: Dict[int, Callable[[int, int, int], None]] = {
+            EventType.UNLOAD_COMPLETE: self._on_unload_complete,
+            EventType.TRUCK_ARRIVED: self._on_truck_arrived,
+            EventType.MINING_COMPLETE: self._on_mining_complete,
+            EventType.MINING_SITE_ARRIVED: self._on_mining_site_arrived,
+        }
+        self._started = False
+
+    def _schedule_truck(
+        self, delay: int, event_type: EventType, truck: int, station: Optional[int] = None, mining_time: int = 0
+    ) -> None:
+        """Schedule the next event of a truck; the unload station and the mining time are in the fleet store."""
+        time = self.now + delay
+        self.trucks.next_event_time[truck] = time
+        if station is not None:
+            self.trucks.station[truck] = station
+        heapq.heappush(
+            self._events,
+            (((time << _TYPE_BITS | event_type) << _SEQUENCE_BITS | self._sequence) << _TRUCK_BITS) | truck,
+        )
+        self._sequence += 1
+
+    def run(self, duration: int) -> None:
+        """Handle events in time order until the given simulation time; continue if called again.
+
+        :param duration: simulation minutes since the start to run until
+        """
+        if not self._started:
+            self._started = True
+            for index in range(self.trucks.n):
+                self._start_to_mining(index)
+
+        events = self._events
+        handlers = self._handlers
+        stations = self.trucks.station
+        mining_times = self.trucks.mining_time
+        end = (duration + 1) << _TIME_SHIFT
+        while events and events[0] < end:
+            key = heapq.heappop(events)
+            self.now = key >> _TIME_SHIFT
+            index = key & _TRUCK_MASK
+            handlers[(key >> _TYPE_SHIFT) & ((1 << _TYPE_BITS) - 1)](index, stations[index], mining_times[index])
+        self.now = duration
+
+    def simulate(self, duration: int) -> None:
+        """Run the simulation without reports; same as MiningControlCenter.simulate.
+        Calling it again continues the simulation.
+
+        :param duration: simulation hours since the start to run until
+        """
+        self.run(duration=duration * 60)
+
+    def _get_mining_time(self, index: int) -> int:
+        """Get the next mining time of a truck from its substream, or from the random module without a seed."""
+        if self._seed is None:
+            return randint(self._shortest_mining_time, self._longest_mining_time)
+        trucks = self.trucks
+        cycle = trucks.stream_cycle[index]
+        trucks.stream_cycle[index] = cycle + 1
+        return draw_mining_time(
+            trucks.stream_key[index], cycle, self._shortest_mining_time, self._span, antithetic=self._mirrored
+        )
+
+    def _mining_started(self, truck: int, mining_time: int) -> None:
+        """Save the mining time of the truck."""
+        self.trucks.mining_time[truck] = mining_time
+        self.trucks.phase[truck] = TruckPhase.MINING
+
+    def _mining_completed(self, truck: int) -> None:
+        """The truck leaves its mining site."""
+        self.trucks.phase[truck] = TruckPhase.TRAVELING_TO_STATION
+
+    def _dispatch_departing_truck(self, truck: int) -> Tuple[Optional[int], int]:
+        """The truck unloads at any available unload station."""
+        return None, self._travel_time
+
+    def _truck_arrived(self, truck: int, station: int, mining_time: int) -> Optional[int]:
+        """Same as MiningControlCenter.dispatch_arrived_truck: take an available unload station or wait."""
+        self._record_arrival(truck, queue=self._trucks_to_unload)
+        if self._available_unload_stations:
+            return self._available_unload_stations.popleft()
+        self._start_to_wait(truck, queue=self._trucks_to_unload)
+        return None
+
+    def _record_arrival(self, index: int, queue: deque) -> None:
+        """Save statistics of the truck arriving to unload at the queue."""
+        trucks = self.trucks
+        trucks.total_mining[index] += 1
+        trucks.total_mining_time[index] += trucks.mining_time[index]
+        trucks.arrived_at[index] = self.now
+        self.queue_length_stats.add(len(queue))
+
+    def _start_to_wait(self, index: int, queue: deque) -> None:
+        """Put the truck into the queue."""
+        self.trucks.start_to_wait[index] = self.now
+        self.trucks.phase[index] = TruckPhase.WAITING
+        queue.append(index)
+
+    def _unload_started(self, truck: int, station: int) -> int:
+        """The truck unloads at the unload station."""
+        self.trucks.phase[truck] = TruckPhase.UNLOADING
+        return self._unloading_time
+
+    def _unload_completed(self, truck: int, station: int) -> Optional[int]:
+        """Same as MiningControlCenter.dispatch_unloaded_truck: the next truck in the queue, or release the station."""
+        self._record_unload(truck, station)
+        if self._trucks_to_unload:
+            return self._trucks_to_unload.popleft()
+        self._available_unload_stations.append(station)
+        return None
+
+    def _record_unload(self, index: int, station: int) -> None:
+        """Save statistics of the unloaded truck; it leaves for its mining site."""
+        trucks = self.trucks
+        self.station_total_unloads[station] += 1
+        self.unloads += 1
+
+        wait_time = 0
+        if trucks.start_to_wait[index] > 0:
+            wait_time = self.now - trucks.start_to_wait[index]
+            trucks.total_wait_time[index] += wait_time
+            trucks.start_to_wait[index] = 0
+        self.wait_time_stats.add(wait_time)
+        if trucks.cycle_start[index] >= 0:
+            self.cycle_time_stats.add(self.now - trucks.cycle_start[index])
+        trucks.cycle_start[index] = self.now
+        self.response_time_stats.add(self.now - trucks.arrived_at[index])
+        trucks.phase[index] = TruckPhase.TRAVELING_TO_SITE
+
+    def _get_travel_time(self, truck: int, station: int) -> int:
+        """Every mining site is the same travel time away from every unload station."""
+        return self._travel_time
+
+    def truck_reports(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Reports simulation statistics per truck; names are generated here only.
+
+        :return: iterator of (truck name, simulation statistics)
+        """
+        for index in range(self.trucks.n):
+            yield FleetStore.name(index), self.trucks.report(index)
+
+    def summarize(self, duration: int) -> Dict[str, Any]:
+        """Summarize simulation statistics of the fleet in a single record; same as MiningControlCenter.summarize.
+
+        :param duration: test duration in simulation minutes
+        :return: fleet-wide simulation statistics
+        """
+        n = self.trucks.n
+        wait_time = self.wait_time_stats
+        if isinstance(wait_time, DistributionStats):
+            wait_time = wait_time.stats
+        return {
+            "trucks": n,
+            "unload_stations": self.m,
+            "duration": duration,
+            "unloads": self.unloads,
+            "mining_utilization": sum(self.trucks.total_mining_time) / (duration * n),
+            "mean_wait_time": wait_time.mean if wait_time.count else math.nan,
+            "max_wait_time": wait_time.max if wait_time.count else math.nan,
+            "unloading_utilization": sum(self.station_total_unloads) * self._unloading_time / (duration * self.m),
+            "p50_wait_time": self._quantile(self.wait_time_stats, 0.5),
+            "p95_wait_time": self._quantile(self.wait_time_stats, 0.95),
+            "p99_wait_time": self._quantile(self.wait_time_stats, 0.99),
+            "p95_cycle_time": self._quantile(self.cycle_time_stats, 0.95),
+            "p95_queue_length": self._quantile(self.queue_length_stats, 0.95),
+        }
+
+    @staticmethod
+    def _quantile(stats: Union[DistributionStats, RunningStats], q: float) -> Optional[float]:
+        """Estimate the q-quantile of a distribution; None for statistics without a quantile sketch."""
+        return stats.quantile(q) if isinstance(stats, DistributionStats) else None
+
+
+def measure_memory_per_truck(build: Callable[[int], Any], n: int) -> float:
+    """Measure memory allocated per truck to build and start a fleet.
+
+    :param build: function to build and start a fleet of n trucks; the result is kept alive while measuring
+    :param n: number of mining trucks
+    :return: bytes per truck
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        fleet = build(n)
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del fleet
+    return allocated / n
+
+
+def build_object_fleet(n: int) -> Any:
+    """Build and start a fleet of objects: MiningControlCenter with its discrete event engine."""
+    from mining_control_center import MiningControlCenter
+
+    control_center = MiningControlCenter(n=n, m=1, sim_time_unit=1, mode=SimulationMode.DISCRETE_EVENT, seed=0)
+    control_center.simulate(duration=0)
+    return control_center
+
+
+def build_array_fleet(n: int) -> Any:
+    """Build and start a fleet on the fleet store."""
+    engine = FleetEngine(n=n, m=1, seed=0)
+    engine.simulate(duration=0)
+    return engine
+
+
+if __name__ == "__main__":
+    """Memory per truck of the object model and the fleet store. e.g.,
+    python fleet_store.py --trucks 100000
+    """
+    parser = argparse.ArgumentParser(description="Memory per truck: object model vs. fleet store")
+    parser.add_argument("--trucks", type=int, default=100000, help="number of mining trucks")
+    args = parser.parse_args()
+
+    object_bytes = measure_memory_per_truck(build_object_fleet, args.trucks)
+    array_bytes = measure_memory_per_truck(build_array_fleet, args.trucks)
+    print(f"Object model: {object_bytes:,.0f} bytes per truck")
+    print(f"Fleet store:  {array_bytes:,.0f} bytes per truck ({object_bytes / array_bytes:.0f}x smaller)")
@@ -1,7 +1,12 @@
+import argparse
 import asyncio
+import sys
 
+from const import ReportMode, SimulationMode
 from mining_control_center import MiningControlCenter
-from typing import List, Optional
+from scenarios import FULL_REPORT_MAX_TRUCKS, UNPACED, load_scenario_file, make_scenarios, run_scenarios, write_results
+from virtual_time_loop import run_in_virtual_time
+from typing import Any, Dict, List, Optional, Union
 
 
 def get_integer(prompt: str, selections: Optional[List[int]] = None) -> int:
@@ -33,21 +38,139 @@ def get_integer(prompt: str, selections: Optional[List[int]] = None) -> int:
 # only allows 1, 2, 5, or 10 for simulation time unit
 SIM_TIME_UNIT = [1, 2, 5, 10]
 
-if __name__ == "__main__":
-    """Main function of the program. It simply executes the MiningControlCenter simulation."""
+# 1: real time, 2: discrete event (as fast as possible), 3: virtual time (trucks as coroutines, as fast as possible),
+# 4: analytic (expected steady state by mean value analysis; no simulation),
+# 5: scheduled (real time from one scheduler heap instead of a task per truck)
+SIM_MODES = {
+    1: SimulationMode.REAL_TIME,
+    2: SimulationMode.DISCRETE_EVENT,
+    3: SimulationMode.VIRTUAL_TIME,
+    4: SimulationMode.ANALYTIC,
+    5: SimulationMode.SCHEDULED,
+}
+
+
+def parse_time_scale(value: str) -> Union[float, str]:
+    """Parse a time scale of the command line: simulation minutes per real second, or "unpaced".
+
+    :param value: value of --time-scale
+    :return: positive number of simulation minutes, or UNPACED
+    """
+    if value == UNPACED:
+        return value
+    try:
+        time_scale = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"must be a positive number or \"{UNPACED}\"") from None
+    if time_scale <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive number or \"{UNPACED}\"")
+    return int(time_scale) if time_scale.is_integer() else time_scale
+
 
+def parse_counts(value: str) -> List[int]:
+    """Parse numbers of trucks or unload stations of the command line: "100" or "10,20,40".
+
+    :param value: value of --trucks or --stations
+    :return: numbers of trucks or unload stations
+    """
+    try:
+        return [int(count) for count in value.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError("must be integers separated by commas") from None
+
+
+def run_batch(argv: List[str]) -> None:
+    """Run scenarios from scenario files and/or flags without prompts, and write their results.
+    Flags override the settings of every scenario of the files; without files, the flags make a single scenario.
+
+    :param argv: command line arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Run mining simulations from TOML/JSON scenario files or flags; without arguments, prompt."
+    )
+    parser.add_argument("scenario_files", nargs="*", help="TOML or JSON scenario files")
+    parser.add_argument("--name", help="name of the scenario")
+    parser.add_argument("--trucks", type=parse_counts, help="numbers of mining trucks, e.g., 100 or 10,20,40")
+    parser.add_argument("--stations", type=parse_counts, help="numbers of unload stations, e.g., 4 or 1,2,4")
+    parser.add_argument("--duration", type=int, help="test duration in simulation hours")
+    parser.add_argument(
+        "--mode", choices=[mode.name.lower() for mode in SimulationMode], help="simulation mode"
+    )
+    parser.add_argument(
+        "--time-scale", type=parse_time_scale,
+        help=f"simulation minutes per real second (any positive number), or \"{UNPACED}\" for as fast as possible",
+    )
+    parser.add_argument("--seed", type=int, help="master seed")
+    parser.add_argument("--replications", type=int, help="number of replications of each scenario")
+    parser.add_argument("--antithetic", action="store_true", default=None, help="run antithetic pairs of replications")
+    parser.add_argument("--travel-time", type=int, help="travel time in simulation minutes")
+    parser.add_argument("--unloading-time", type=int, help="unloading time in simulation minutes")
+    parser.add_argument("--shortest-mining-time", type=int, help="shortest mining time in simulation minutes")
+    parser.add_argument("--longest-mining-time", type=int, help="longest mining time in simulation minutes")
+    parser.add_argument("--report-mode", choices=["full", "summary"], help="report of each run")
+    parser.add_argument("--log-level", choices=["debug", "info", "warning"], help="minimum level of the log")
+    parser.add_argument("--log", help="file to write the log and reports to; stdout by default")
+    parser.add_argument("--output", help="file to write the results to (.csv, .json or .jsonl)")
+    args = parser.parse_args(argv)
+
+    overrides: Dict[str, Any] = {
+        key: value for key, value in vars(args).items()
+        if value is not None and key not in ("scenario_files", "log", "output")
+    }
+    try:
+        settings = [item for path in args.scenario_files for item in load_scenario_file(path)] or [{}]
+        scenarios = [scenario for item in settings for scenario in make_scenarios(item, overrides=overrides)]
+    except ValueError as error:
+        parser.error(str(error))
+
+    if args.log is None:
+        records = run_scenarios(scenarios)
+    else:
+        with open(args.log, "w") as log:
+            records = run_scenarios(scenarios, stream=log)
+    if args.output is not None:
+        write_results(args.output, records)
+    print(f"Finished {len(records)} runs of {len(scenarios)} scenarios.")
+
+
+def run_interactive() -> None:
+    """Prompt for a single simulation and run it."""
     # Get number of trucks and unload stations, simulation time unit & test duration from the user.
     num_trucks = get_integer("Please enter the number of trucks: ")
     num_unload_stations = get_integer("Please enter the number of unload stations: ")
     msg = (
-        "Please enter the number of simulation MINUTES that will advance for every 1 SECOND of real-world time "
-        "during the simulation run (1, 2, 5, or 10):"
+        "Please enter the simulation mode "
+        "(1: real time, 2: discrete event, 3: virtual time, 4: analytic, 5: scheduled):"
     )
-    sim_time_unit = get_integer(msg, selections=SIM_TIME_UNIT)
+    sim_mode = SIM_MODES[get_integer(msg, selections=list(SIM_MODES))]
+    if sim_mode in (SimulationMode.REAL_TIME, SimulationMode.SCHEDULED):
+        msg = (
+            "Please enter the number of simulation MINUTES that will advance for every 1 SECOND of real-world time "
+            "during the simulation run (1, 2, 5, or 10):"
+        )
+        sim_time_unit = get_integer(msg, selections=SIM_TIME_UNIT)
+    else:
+        # Discrete event, virtual time and analytic modes do not wait in the real world time.
+        sim_time_unit = SIM_TIME_UNIT[-1]
     test_duration = get_integer("Please enter the test duration in simulation HOURS: ")
 
     # Run simulation.
+    report_mode = ReportMode.FULL if num_trucks <= FULL_REPORT_MAX_TRUCKS else ReportMode.SUMMARY
     mining_control_center = MiningControlCenter(
-        n=num_trucks, m=num_unload_stations, sim_time_unit=sim_time_unit
+        n=num_trucks, m=num_unload_stations, sim_time_unit=sim_time_unit, mode=sim_mode, report_mode=report_mode
     )
-    asyncio.run(mining_control_center.run(test_duration))
+    if sim_mode == SimulationMode.VIRTUAL_TIME:
+        run_in_virtual_time(mining_control_center.run(test_duration))
+    else:
+        asyncio.run(mining_control_center.run(test_duration))
+
+
+if __name__ == "__main__":
+    """Main function of the program. It simply executes the MiningControlCenter simulation.
+    e.g., python main.py (prompts), python main.py scenarios.toml --output results.csv,
+        or python main.py --trucks 100 --stations 1,2,4 --mode real_time --time-scale 60
+    """
+    if len(sys.argv) > 1:
+        run_batch(sys.argv[1:])
+    else:
+        run_interactive()
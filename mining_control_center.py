@@ -1,59 +1,298 @@
+import gzip
+import math
+import pickle
+import random
 import time
 from collections import deque
 import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
 
-from const import MiningType
+from const import (
+    CatchUpPolicy,
+    DispatchRule,
+    LogCategory,
+    MiningType,
+    ReportMode,
+    SimulationMode,
+    TraceEvent,
+    TruckPhase,
+    MINING_TYPE_NAMES,
+)
+from event_engine import DiscreteEventEngine
+from mva_solver import MVASolver
+from random_streams import MiningTimeStream
+from report_exporters import Column, ReportExporter, TableExporter, format_percent
+from site_map import SiteMap, StationIndex
 from UnloadStations.unload_station import UnloadStation
 from UnloadStations.h3_unload_station import H3UnloadStation
+from UnloadStations.regolith_unload_station import RegolithUnloadStation
 from Vehicles.h3_mining_truck import H3MiningTruck
+from Vehicles.regolith_mining_truck import RegolithMiningTruck
 from Vehicles.mining_truck import MiningTruck
 from simulation_logger import SimulationLogger
-from time_converter import convert_sim_time_to_real_time_in_sec, convert_real_time_to_sim_time
+from streaming_stats import DistributionStats, Histogram, TopK
+from time_series import TimeSeriesSampler
+from time_converter import convert_sim_time_to_real_time_in_sec
+from virtual_time_loop import VirtualTimeEventLoop
+
+
+# Version of the checkpoint file format
+CHECKPOINT_VERSION = 3
+
+# Truck and unload station classes of each mining type
+TRUCK_CLASSES = {
+    MiningType.HELIUM_3: H3MiningTruck,
+    MiningType.REGOLITH: RegolithMiningTruck,
+}
+STATION_CLASSES = {
+    MiningType.HELIUM_3: H3UnloadStation,
+    MiningType.REGOLITH: RegolithUnloadStation,
+}
+
+# Columns of the exported tables of trucks and unload stations
+TRUCK_COLUMNS = [
+    Column(key="name", header="Truck Name"),
+    Column(key="total_mining", header="Total mining"),
+    Column(key="total_mining_time", header="Total mining time (min)"),
+    Column(key="mining_utilization", header="Mining utilization (%)", fmt=format_percent),
+    Column(key="total_wait_time", header="Total wait time (min)"),
+]
+UNLOAD_STATION_COLUMNS = [
+    Column(key="name", header="Unload Station Name"),
+    Column(key="total_unloads", header="Total unloads"),
+    Column(key="total_unloading_time", header="Total unloading time"),
+    Column(key="unloading_utilization", header="Unloading utilization (%)", fmt=format_percent),
+]
+
+# Number of trucks waiting the longest in the summary report
+TOP_K_TRUCKS = 10
 
 
 class MiningControlCenter:
     """Mining Control Center class. The main class for the simulation."""
 
-    def __init__(self, n: int, m: int, sim_time_unit: int):
+    def __init__(
+        self,
+        n: int,
+        m: int,
+        sim_time_unit: int,
+        mode: SimulationMode = SimulationMode.REAL_TIME,
+        logger: Optional[SimulationLogger] = None,
+        seed: Optional[int] = None,
+        replication: int = 0,
+        antithetic: bool = False,
+        catch_up_policy: CatchUpPolicy = CatchUpPolicy.BURST,
+        max_lag: float = 1.0,
+        site_map: Optional[SiteMap] = None,
+        dispatch_rule: DispatchRule = DispatchRule.NEAREST_AVAILABLE,
+        truck_mix: Optional[Dict[MiningType, int]] = None,
+        station_types: Optional[Sequence[Iterable[MiningType]]] = None,
+        report_mode: ReportMode = ReportMode.FULL,
+        sampler: Optional[TimeSeriesSampler] = None,
+        truck_classes: Optional[Dict[MiningType, Type[MiningTruck]]] = None,
+        station_classes: Optional[Dict[MiningType, Type[UnloadStation]]] = None,
+    ):
         """
         :param n: number of mining trucks
         :param m: number of mining unload stations
         :param sim_time_unit: simulation time unit
+        :param mode: simulation mode; real time, virtual time or discrete event
+        :param logger: logger of this simulation; None to create a new one
+        :param seed: master seed; each truck mines from its own substream. None for the random module
+        :param replication: index of the replication; replications of the same seed are independent
+        :param antithetic: whether replications are antithetic pairs (2k, 2k + 1); odd replications mine the mirrored
+            times of the even one (antithetic variates)
+        :param catch_up_policy: what to do when the real time mode falls behind the deadlines
+        :param max_lag: lag in real world seconds to tolerate before the catch-up policy slips the schedule
+        :param site_map: travel times between mining sites and the m unload stations; None for a single travel time.
+            Trucks are spread over the mining sites (truck #i mines at site (i - 1) % sites).
+            Only the discrete event engine (discrete event and scheduled modes) supports the geographic model.
+        :param dispatch_rule: which unload station a truck leaving a mining site goes to; with a site map only
+        :param truck_mix: number of trucks of each mining type, n in total; None for n Helium-3 trucks.
+            Trucks are numbered type by type in the order of the dict.
+        :param station_types: mining types served by each of the m unload stations; None for Helium-3 only.
+            The first mining type of an unload station decides its class (e.g., its unloading time).
+        :param report_mode: a row per truck and unload station, or a summary of the fleet (for large fleets)
+        :param sampler: samples queue length, busy unload stations, mining and traveling trucks at its interval;
+            None not to sample
+        :param truck_classes: truck class of each mining type to use instead of TRUCK_CLASSES
+            (e.g., a subclass with other travel and mining times); None for TRUCK_CLASSES
+        :param station_classes: unload station class of each mining type to use instead of STATION_CLASSES
+            (e.g., a subclass with another unloading time); None for STATION_CLASSES
         """
+        truck_types = [MiningType.HELIUM_3] * n
+        if truck_mix is not None:
+            if sum(truck_mix.values()) != n:
+                raise ValueError("truck_mix must have n trucks in total")
+            truck_types = [mining_type for mining_type, count in truck_mix.items() for _ in range(count)]
+        station_types = [[MiningType.HELIUM_3]] * m if station_types is None else [list(t) for t in station_types]
+        if len(station_types) != m or not all(station_types):
+            raise ValueError("station_types must have at least one mining type for each of the m unload stations")
+        if not set(truck_types) <= {mining_type for types in station_types for mining_type in types}:
+            raise ValueError("Every mining type of trucks must be served by an unload station")
+        # A mixed fleet has trucks or unload stations other than Helium-3 ones.
+        self._mixed_fleet = truck_mix is not None or any(types != [MiningType.HELIUM_3] for types in station_types)
+
+        if site_map is not None:
+            if self._mixed_fleet:
+                raise ValueError("The geographic model does not support mixed fleets")
+            if site_map.n_stations != m:
+                raise ValueError("site_map must have a travel time to each of the m unload stations")
+            if mode not in (SimulationMode.DISCRETE_EVENT, SimulationMode.SCHEDULED):
+                raise ValueError("The geographic model needs the discrete event or scheduled mode")
+
+        self._truck_classes = {**TRUCK_CLASSES, **(truck_classes or {})}
+        self._station_classes = {**STATION_CLASSES, **(station_classes or {})}
+        self._custom_classes = bool(truck_classes or station_classes)
+
+        # Each control center owns its logger, so simulations in the same process do not mix their logs.
+        self._logger = logger if logger is not None else SimulationLogger()
+        self._logger.trace_fleet(trucks=n, stations=m)
 
         # Add n number of trucks and m number of stations
         self._trucks = deque()
-        for i in range(1, n + 1):
+        for i, mining_type in enumerate(truck_types, start=1):
+            truck_class = self._truck_classes[mining_type]
+            # Same seed, same mining times of truck #i: regardless of other trucks or unload stations.
+            mining_time_stream = None
+            if seed is not None:
+                mining_time_stream = MiningTimeStream(
+                    seed=seed,
+                    truck_id=i,
+                    shortest_mining_time=truck_class.SHORTEST_MINING_TIME,
+                    longest_mining_time=truck_class.LONGEST_MINING_TIME,
+                    replication=replication,
+                    antithetic=antithetic,
+                )
             self._trucks.append(
-                H3MiningTruck(
+                truck_class(
                     control_center=self,
-                    name=f"H3 Truck #{i}",
-                    mining_type=MiningType.HELIUM_3,
+                    name=f"{MINING_TYPE_NAMES[mining_type]} Truck #{i}",
+                    mining_type=mining_type,
                     sim_time_unit=sim_time_unit,
+                    logger=self._logger,
+                    truck_id=i,
+                    mining_time_stream=mining_time_stream,
                 )
             )
+            if site_map is not None:
+                self._trucks[-1].site = (i - 1) % site_map.n_sites
         self._trucks_to_unload = deque()
 
         # Instead of use a single queue, separates to available and in_use to reduce time to search.
         self._unload_stations = []
         self._available_unload_stations = deque()
-        for i in range(1, m + 1):
-            unload_station = H3UnloadStation(
+        for i, mining_types in enumerate(station_types, start=1):
+            unload_station = self._station_classes[mining_types[0]](
                 control_center=self,
-                name=f"H3 Unload Station #{i}",
-                mining_type=MiningType.HELIUM_3,
+                name=f"{MINING_TYPE_NAMES[mining_types[0]]} Unload Station #{i}",
+                mining_type=mining_types[0],
                 sim_time_unit=sim_time_unit,
+                logger=self._logger,
+                station_id=i,
+                mining_types=mining_types,
+                unloading_times={
+                    mining_type: self._station_classes[mining_type].UNLOADING_TIME for mining_type in mining_types
+                },
             )
             self._available_unload_stations.append(unload_station)
             self._unload_stations.append(unload_station)
 
+        # Mixed fleet: trucks wait in the queue of their mining type, and an unload station is ready for each mining
+        #   type it serves. So a dispatch takes the first ready station of the type instead of searching for one.
+        #   A station taken for one type is skipped (and dropped) when it comes first for another type.
+        self._type_queues = {mining_type: deque() for mining_type in MiningType}
+        self._ready_stations = {mining_type: deque() for mining_type in MiningType}
+        self._in_ready_stations = {mining_type: bytearray(m) for mining_type in MiningType}
+        if self._mixed_fleet:
+            for unload_station in self._unload_stations:
+                self._add_ready_station(station=unload_station)
+
+        # Geographic model: each truck goes to the unload station chosen when it leaves its mining site,
+        #   and waits in the queue of that unload station.
+        self._site_map = site_map
+        self._dispatch_rule = dispatch_rule
+        self._station_index: Optional[StationIndex] = None
+        if site_map is not None:
+            self._station_index = StationIndex(
+                site_map=site_map, unloading_time=self._station_classes[MiningType.HELIUM_3].UNLOADING_TIME
+            )
+        self._station_queues = [deque() for _ in range(m)]
+        self._unloading_stations = [False] * m
 
         self._sim_time_unit = sim_time_unit
+        self._mode = mode
+        self._seed = seed
+        self._replication = replication
+        self._antithetic = antithetic
+        # Discrete event engine; kept between runs so that a simulation can be continued or checkpointed
+        self._engine: Optional[DiscreteEventEngine] = None
+        self._log_events = True
         self.unloads = 0
+        # Distribution of the queue length seen by each arriving truck
+        self.queue_length_stats = DistributionStats()
+        # Distributions of wait time, cycle time (from leaving an unload station to the next unload completion)
+        #   and response time (from the arrival at the control center to the unload completion) of each mining type.
+        #   Trucks of a type share them: the memory does not grow with the fleet.
+        self._type_distributions = {
+            mining_type: {name: DistributionStats() for name in ("wait_time", "cycle_time", "response_time")}
+            for mining_type in MiningType
+        }
+
+        # Current simulation time in minutes. The discrete event engine replaces it with its own clock.
+        # In the real time mode, the deadline of the current phase on the clock of the running event loop
+        #   (monotonic, or a virtual clock).
+        self._clock = time.time
+        self._start_time_in_unix_tic = self._clock()
+        self._get_sim_time = self._get_sim_time_from_real_time
+        self._now = 0
+        # Pacing of the real time mode: lag of each phase behind its deadline and the schedule slipped in seconds
+        self._catch_up_policy = catch_up_policy
+        self._max_lag = max_lag
+        self.lag_stats = DistributionStats()
+        self.slipped = 0.0
+        self._report_mode = report_mode
+        # Number of trucks in each phase (TruckPhase), kept on each event so that sampling does not scan the fleet.
+        # Trucks start on the way to their mining sites, and arrive there as the simulation starts.
+        self.phase_counts = [0] * len(TruckPhase)
+        self.phase_counts[TruckPhase.TRAVELING_TO_SITE] = n
+        self.sampler = sampler
 
-    async def run(self, duration: int) -> None:
+    async def run(self, duration: int, exporter: Optional[ReportExporter] = None) -> None:
         """Start the simulation.
 
+        :param duration: test duration in simulation hours
+        :param exporter: exporter of statistics of trucks, unload stations and the run summary; None for the log only
+        """
+        if self._mode == SimulationMode.ANALYTIC:
+            self._run_analytic(duration=duration)
+            self._logger.thread.join()
+            return
+        if self._mode == SimulationMode.DISCRETE_EVENT:
+            await self._run_engine(duration=duration, run=DiscreteEventEngine.run)
+        elif self._mode == SimulationMode.SCHEDULED:
+            await self._run_engine(duration=duration, run=DiscreteEventEngine.run_paced)
+        else:
+            if self._mode == SimulationMode.VIRTUAL_TIME and not isinstance(
+                asyncio.get_running_loop(), VirtualTimeEventLoop
+            ):
+                raise RuntimeError("Virtual time mode must run in VirtualTimeEventLoop")
+            await self._run_real_time(duration=duration)
+
+        # 4. Report completion
+        self._logger.log(
+            message=f"Finish the simulation for {duration} hours. Total unloads: {self.unloads} times."
+        )
+
+        self.report(duration=duration * 60)
+        if exporter is not None:
+            self.export(duration=duration * 60, exporter=exporter)
+
+        self._logger.thread.join()
+
+    async def _run_real_time(self, duration: int) -> None:
+        """Run the simulation in the time of the running event loop; the real world time or a virtual time.
+
         :param duration: test duration in simulation hours
         """
         duration_in_real_time = convert_sim_time_to_real_time_in_sec(
@@ -61,150 +300,750 @@ class MiningControlCenter:
             sim_time_unit=self._sim_time_unit,
         )
 
-        # Initialize the Logger
-        SimulationLogger.get_instance().reset(
-            start_time_in_unix_timestamp=time.time(),
-            sim_time_unit=self._sim_time_unit
+        # Initialize the Logger: log with the clock of the running event loop.
+        # Every deadline is anchored at the start, so the simulation does not drift from the clock.
+        self._clock = asyncio.get_running_loop().time
+        self._start_time_in_unix_tic = self._clock()
+        self._get_sim_time = self._get_sim_time_from_deadline
+        self._logger.reset(
+            start_time_in_unix_timestamp=self._start_time_in_unix_tic,
+            sim_time_unit=self._sim_time_unit,
+            clock=self._get_paced_time,
         )
 
         # 1. Report the simulation starts. Initiate the Logger
-        SimulationLogger.get_instance().log(
+        self._logger.log(
             message=f"Start the simulation for {duration} hours."
         )
 
         # 2. Use thread to let trucks go -> set daemon True to terminate threads
         for truck in self._trucks:
             asyncio.create_task(truck.start_to_mining())
+        if self.sampler is not None:
+            asyncio.create_task(self._sample_periodically(duration=duration * 60))
 
         # 3. Wait until finish: Give a quick report every 30 minutes
-        tic = convert_sim_time_to_real_time_in_sec(
-            sim_time_to_convert_in_minutes=30, sim_time_unit=self._sim_time_unit
-        )
-        timeleft = duration_in_real_time
-        SimulationLogger.get_instance().log(
+        self._logger.log(
             f"** Wait for {duration_in_real_time} seconds in the real world time. **"
         )
-        while timeleft > 0:
-            await asyncio.sleep(tic)
-            SimulationLogger.get_instance().log(
+        for sim_time in range(30, duration * 60 + 1, 30):
+            await self.wait_until(sim_time=sim_time, record_lag=False)
+            self._logger.log(
                 message=f"-- Notify every 30 minutes. --"
             )
-            timeleft -= tic
 
-        # 4. Report completion
-        SimulationLogger.get_instance().log(
-            message=f"Finish the simulation for {duration} hours. Total unloads: {self.unloads} times."
+    async def _sample_periodically(self, duration: int) -> None:
+        """Sample at every interval of the sampler until the end of the simulation.
+
+        :param duration: test duration in simulation minutes
+        """
+        for sim_time in range(self.sampler.interval, duration + 1, self.sampler.interval):
+            await self.wait_until(sim_time=sim_time, record_lag=False)
+            self.sample()
+
+    def sample(self) -> None:
+        """Record the current counts to the sampler: O(1), from the counts kept on each event."""
+        counts = self.phase_counts
+        self.sampler.sample(
+            sim_time=round(self._get_sim_time()),
+            counts=(
+                counts[TruckPhase.WAITING],
+                # Each unloading truck keeps an unload station busy.
+                counts[TruckPhase.UNLOADING],
+                counts[TruckPhase.MINING],
+                counts[TruckPhase.TRAVELING_TO_STATION] + counts[TruckPhase.TRAVELING_TO_SITE],
+            ),
         )
 
-        self.report(duration=duration * 60)
+    async def wait_until(self, sim_time: int, record_lag: bool = True) -> None:
+        """Wait until the deadline of the given simulation time, on the clock anchored at the start of the simulation.
+        Saves the lag behind the deadline; if the policy is SLIP and the lag is too long, slips the schedule by the lag.
 
-        SimulationLogger.get_instance().thread.join()
+        :param sim_time: simulation time in minutes since the simulation started
+        :param record_lag: whether the deadline ends a phase of a truck or an unload station;
+            False for the notification and sampling, which neither count as phases nor slip the schedule
+        """
+        slipped = self.slipped
+        delay = self._get_deadline(sim_time=sim_time) - self._clock()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.slipped > slipped:
+            # The schedule slipped while waiting: wait for the new deadline.
+            delay = self._get_deadline(sim_time=sim_time) - self._clock()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        if record_lag:
+            lag = max(0.0, self._clock() - self._get_deadline(sim_time=sim_time))
+            self.lag_stats.add(lag)
+            if lag > self._max_lag and self._catch_up_policy == CatchUpPolicy.SLIP:
+                self.slipped += lag
+        self._now = sim_time
+
+    def _get_deadline(self, sim_time: int) -> float:
+        """Get the deadline of the given simulation time on the clock of the event loop.
+
+        :param sim_time: simulation time in minutes since the simulation started
+        :return: deadline in the time of the clock
+        """
+        return (
+            self._start_time_in_unix_tic
+            + self.slipped
+            + convert_sim_time_to_real_time_in_sec(
+                sim_time_to_convert_in_minutes=sim_time, sim_time_unit=self._sim_time_unit
+            )
+        )
+
+    def _get_paced_time(self) -> float:
+        """Get the time of the clock without the slipped schedule; Clock for SimulationLogger."""
+        return self._clock() - self.slipped
+
+    def _get_sim_time_from_deadline(self) -> int:
+        """Get the current simulation time from the deadline of the phase which has just ended.
+
+        :return: simulation time in minutes since the simulation started.
+        """
+        return self._now
+
+    def pacing(self) -> Dict[str, Any]:
+        """Summarize how closely the real time mode kept the deadlines.
+
+        :return: number of phases, mean/p95/max lag and slipped schedule in real world seconds
+        """
+        summary = self.lag_stats.summary()
+        return {
+            "phases": summary["count"],
+            "mean_lag": summary["mean"],
+            "p95_lag": summary["p95"],
+            "max_lag": summary["max"],
+            "slipped": self.slipped,
+        }
+
+    async def _run_engine(
+        self, duration: int, run: Callable[[DiscreteEventEngine, int], Optional[Awaitable[None]]]
+    ) -> None:
+        """Run the simulation with the discrete event engine: the discrete event and scheduled modes.
+        The discrete event mode jumps straight to the next event (DiscreteEventEngine.run). The scheduled mode is
+            paced by the clock of the running event loop (DiscreteEventEngine.run_paced): the control center owns
+            one heap of truck and unload station events instead of a task per truck, and sleeps only until
+            the next deadline.
+
+        :param duration: test duration in simulation hours
+        :param run: function to run the engine for the given simulation minutes; may return an awaitable
+        """
+        engine = self._get_engine(log_events=True)
+
+        # Initialize the Logger: log with the simulation time of the engine.
+        self._logger.reset(
+            start_time_in_unix_timestamp=0,
+            sim_time_unit=self._sim_time_unit,
+            clock=engine.get_time_in_real_time,
+        )
+
+        self._logger.log(
+            message=f"Start the simulation for {duration} hours."
+        )
+        self._start_engine()
+        result = run(engine, duration * 60)
+        if result is not None:
+            await result
+
+    def _get_engine(self, log_events: bool) -> DiscreteEventEngine:
+        """Get the discrete event engine of this simulation; create it for the first run.
+        Trucks start with _start_engine, after the logger is reset for the run.
+
+        :param log_events: whether to log events; only for the first run
+        :return: discrete event engine
+        """
+        if self._engine is None:
+            self._engine = DiscreteEventEngine(
+                control_center=self,
+                sim_time_unit=self._sim_time_unit,
+                logger=self._logger,
+                log_events=log_events,
+                sample_interval=self.sampler.interval if self.sampler is not None else 0,
+            )
+            self._get_sim_time = self._get_sim_time_from_engine
+        return self._engine
+
+    def _start_engine(self) -> None:
+        """Let all trucks start to mining, unless the engine has started (e.g., a continued run or a checkpoint)."""
+        if not self._engine.started:
+            self._engine.start(trucks=self._trucks)
+
+    def _get_sim_time_from_engine(self) -> float:
+        """Get the current simulation time from the discrete event engine.
+
+        :return: simulation time in minutes since the simulation started.
+        """
+        return self._engine.now
+
+    def _run_analytic(self, duration: int) -> None:
+        """Solve the expected steady state with mean value analysis instead of simulating, and report it.
+
+        :param duration: test duration in simulation hours
+        """
+        self._logger.reset(start_time_in_unix_timestamp=0, sim_time_unit=self._sim_time_unit, clock=lambda: 0)
+        self._logger.log(
+            message=f"Solve the analytic model for {duration} hours.", log_with_timestamp=False
+        )
+        result = self.solve_analytic()
+        expected = [
+            ["Throughput (unloads/hour)", f"{result['throughput'] * 60:.2f}"],
+            ["Expected unloads", f"{result['throughput'] * duration * 60:.0f}"],
+            ["Mining utilization (%)", f"{result['mining_utilization'] * 100:.1f} %"],
+            ["Unloading utilization (%)", f"{result['unloading_utilization'] * 100:.1f} %"],
+            ["Mean queueing delay (min)", f"{result['mean_queueing_delay']:.2f}"],
+            ["Mean queue length", f"{result['mean_queue_length']:.2f}"],
+            ["Mean cycle time (min)", f"{result['mean_cycle_time']:.2f}"],
+        ]
+        self._logger.log(
+            message="## Analytic Model (Mean Value Analysis)",
+            log_with_timestamp=False
+        )
+        self._log_table(headers=["Metric", "Expected"], rows=expected)
+        self._logger.log(message=None)
+
+    def solve_analytic(self) -> Dict[str, Any]:
+        """Solve the expected steady state of this fleet with mean value analysis.
+
+        :return: expected statistics; see MVASolver.solve
+        """
+        truck_class = type(self._trucks[0]) if self._trucks else self._truck_classes[MiningType.HELIUM_3]
+        station_class = (
+            type(self._unload_stations[0]) if self._unload_stations else self._station_classes[MiningType.HELIUM_3]
+        )
+        travel_time = truck_class.TRAVEL_TIME
+        if self._site_map is not None and self._trucks:
+            # Approximation: every truck travels to the nearest unload station of its mining site.
+            travel_time = sum(
+                self._site_map.travel_time(truck.site, self._site_map.stations_by_travel_time(truck.site)[0])
+                for truck in self._trucks
+            ) / len(self._trucks)
+        return MVASolver(
+            n=len(self._trucks),
+            m=len(self._unload_stations),
+            travel_time=travel_time,
+            unloading_time=station_class.UNLOADING_TIME,
+            shortest_mining_time=truck_class.SHORTEST_MINING_TIME,
+            longest_mining_time=truck_class.LONGEST_MINING_TIME,
+        ).solve()
+
+    def compare_with_analytic(self, duration: int) -> Dict[str, Tuple[float, float]]:
+        """Compare simulated statistics with the expected ones of the analytic model.
+
+        :param duration: test duration in simulation minutes
+        :return: metric name -> (analytic value, simulated value)
+        """
+        expected = self.solve_analytic()
+        summary = self.summarize(duration=duration)
+        response_time = self.distributions()["response_time"]
+        unloading_time = self._unload_stations[0].UNLOADING_TIME
+        return {
+            "Throughput (unloads/hour)": (expected["throughput"] * 60, summary["unloads"] / duration * 60),
+            "Mining utilization (%)": (expected["mining_utilization"] * 100, summary["mining_utilization"] * 100),
+            "Unloading utilization (%)": (
+                expected["unloading_utilization"] * 100,
+                summary["unloading_utilization"] * 100,
+            ),
+            # Time from the arrival at the control center to the start of unloading: not the wait time of the
+            #   reports, which is from the start of waiting to the unload completion
+            "Mean queueing delay (min)": (
+                expected["mean_queueing_delay"],
+                response_time.stats.mean - unloading_time if response_time.count else 0.0,
+            ),
+        }
+
+    def simulate(self, duration: int, log_events: bool = False) -> None:
+        """Run the simulation with the discrete event engine, without reports; for batch runs (e.g., sweeps).
+        Calling it again continues the simulation: e.g., simulate(24), save_checkpoint(path), simulate(72).
+
+        :param duration: simulation hours since the start to run until
+        :param log_events: whether to log events of trucks and unload stations
+        """
+        self._log_events = log_events
+        engine = self._get_engine(log_events=log_events)
+        self._start_engine()
+        engine.run(duration=duration * 60)
+
+    def save_checkpoint(self, path: str) -> None:
+        """Save the full state of the simulation to a compressed file.
+        Only the discrete event engine can be checkpointed: it keeps the phase and remaining time of every truck
+            in its pending events, while the coroutine modes keep them in suspended coroutines.
+
+        :param path: path of the checkpoint file
+        """
+        if self._engine is None:
+            raise RuntimeError("Only a simulation run by the discrete event engine can be checkpointed")
+        if self._site_map is not None or self._mixed_fleet or self._custom_classes:
+            raise RuntimeError(
+                "A simulation with a site map, a mixed fleet or custom truck or station classes cannot be checkpointed"
+            )
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "n": len(self._trucks),
+            "m": len(self._unload_stations),
+            "sim_time_unit": self._sim_time_unit,
+            "seed": self._seed,
+            "replication": self._replication,
+            "antithetic": self._antithetic,
+            # Trucks without a seed mine from the random module
+            "random_state": random.getstate() if self._seed is None else None,
+            "log_events": self._log_events,
+            "unloads": self.unloads,
+            "queue_length_stats": self.queue_length_stats,
+            "type_distributions": self._type_distributions,
+            "trucks": [truck.snapshot() for truck in self._trucks],
+            "unload_stations": [station.snapshot() for station in self._unload_stations],
+            "trucks_to_unload": [truck.truck_id for truck in self._trucks_to_unload],
+            "available_unload_stations": [station.station_id for station in self._available_unload_stations],
+            "engine": self._engine.snapshot(),
+        }
+        with gzip.open(path, "wb") as checkpoint:
+            pickle.dump(state, checkpoint, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load_checkpoint(
+        cls,
+        path: str,
+        logger: Optional[SimulationLogger] = None,
+        replication: Optional[int] = None,
+        m: Optional[int] = None,
+    ) -> "MiningControlCenter":
+        """Restore a simulation from a checkpoint file to continue it, or to fork a what-if continuation.
+        Only load checkpoints from trusted sources: the file is a pickle.
+
+        :param path: path of the checkpoint file
+        :param logger: logger of the restored simulation; None to create a new one
+        :param replication: replication of the random substreams from now on; None to continue the saved one.
+            Forks with different replications share the past and continue with independent mining times.
+        :param m: number of unload stations from now on (what-if); None for the saved number. Must not be less.
+        :return: restored MiningControlCenter in the discrete event mode
+        """
+        with gzip.open(path, "rb") as checkpoint:
+            state = pickle.load(checkpoint)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"{path} is not a checkpoint of this version")
+        if m is not None and m < state["m"]:
+            raise ValueError("Unload stations cannot be removed from a checkpoint")
+
+        control_center = cls(
+            n=state["n"],
+            m=m if m is not None else state["m"],
+            sim_time_unit=state["sim_time_unit"],
+            mode=SimulationMode.DISCRETE_EVENT,
+            logger=logger,
+            seed=state["seed"],
+            replication=replication if replication is not None else state["replication"],
+            antithetic=state["antithetic"],
+        )
+        if state["random_state"] is not None:
+            random.setstate(state["random_state"])
+        control_center._restore(state)
+        return control_center
+
+    def _restore(self, state: Dict[str, Any]) -> None:
+        """Restore statistics, queues and the engine from the state of a checkpoint."""
+        self._log_events = state["log_events"]
+        self.unloads = state["unloads"]
+        self.queue_length_stats = state["queue_length_stats"]
+        self._type_distributions = state["type_distributions"]
+        trucks = {truck.truck_id: truck for truck in self._trucks}
+        stations = {station.station_id: station for station in self._unload_stations}
+        for truck, truck_state in zip(self._trucks, state["trucks"]):
+            truck.restore(truck_state)
+        for station, station_state in zip(self._unload_stations, state["unload_stations"]):
+            station.restore(station_state)
+
+        self._trucks_to_unload = deque(trucks[truck_id] for truck_id in state["trucks_to_unload"])
+        # Added unload stations (what-if) are available from now on.
+        self._available_unload_stations = deque(
+            [stations[station_id] for station_id in state["available_unload_stations"]]
+            + self._unload_stations[state["m"]:]
+        )
+
+        self._engine = DiscreteEventEngine(
+            control_center=self, sim_time_unit=self._sim_time_unit, logger=self._logger, log_events=self._log_events
+        )
+        self._engine.restore(state["engine"], trucks=trucks, stations=stations)
+        self._get_sim_time = self._get_sim_time_from_engine
+        # Every truck which is not waiting has exactly one pending event.
+        self.phase_counts = self._engine.count_phases()
+        self.phase_counts[TruckPhase.WAITING] = len(self._trucks_to_unload)
+
+        # Added unload stations serve waiting trucks right away.
+        while self._trucks_to_unload and self._available_unload_stations:
+            truck = self._trucks_to_unload.popleft()
+            station = self._available_unload_stations.popleft()
+            self._move_truck(TruckPhase.WAITING, TruckPhase.UNLOADING)
+            self._trace_unload_started(truck=truck, station=station)
+            self._engine.start_to_unload(truck=truck, station=station)
+
+    def summarize(self, duration: int) -> Dict[str, Any]:
+        """Summarize simulation statistics of the fleet in a single record.
+
+        :param duration: test duration in simulation minutes
+        :return: fleet-wide simulation statistics; wait times are per unload (nan without unloads)
+        """
+        total_mining_time = sum(truck.total_mining_time for truck in self._trucks)
+        distributions = self.distributions()
+        wait_time = distributions["wait_time"]
+        total_unloading_time = sum(
+            station.report().get("Total unloading time", 0) for station in self._unload_stations
+        )
+        return {
+            "trucks": len(self._trucks),
+            "unload_stations": len(self._unload_stations),
+            "duration": duration,
+            "unloads": self.unloads,
+            "mining_utilization": total_mining_time / (duration * len(self._trucks)),
+            "mean_wait_time": wait_time.stats.mean if wait_time.count else math.nan,
+            "max_wait_time": wait_time.stats.max if wait_time.count else math.nan,
+            "unloading_utilization": total_unloading_time / (duration * len(self._unload_stations)),
+            "p50_wait_time": distributions["wait_time"].quantile(0.5),
+            "p95_wait_time": distributions["wait_time"].quantile(0.95),
+            "p99_wait_time": distributions["wait_time"].quantile(0.99),
+            "p95_cycle_time": distributions["cycle_time"].quantile(0.95),
+            "p95_queue_length": distributions["queue_length"].quantile(0.95),
+        }
+
+    def totals(self) -> Tuple[int, int, int]:
+        """Get running totals of the fleet since the start; differences between two times give an interval.
+
+        :return: unloads, total wait time of trucks and total unloading time of unload stations in simulation minutes
+        """
+        return (
+            self.unloads,
+            sum(truck.total_wait_time for truck in self._trucks),
+            sum(station.report().get("Total unloading time", 0) for station in self._unload_stations),
+        )
+
+    def summarize_mining_types(self, duration: int) -> Dict[MiningType, Dict[str, Any]]:
+        """Summarize simulation statistics of each mining type of the fleet.
+
+        :param duration: test duration in simulation minutes
+        :return: mining type -> simulation statistics of its trucks and the unload stations serving it;
+            wait times are per unload (None without unloads)
+        """
+        summaries = {}
+        for mining_type in MiningType:
+            trucks = [truck for truck in self._trucks if truck.mining_type == mining_type]
+            if not trucks:
+                continue
+            wait_time = self._type_distributions[mining_type]["wait_time"].summary()
+            summaries[mining_type] = {
+                "trucks": len(trucks),
+                "unload_stations": sum(mining_type in station.mining_types for station in self._unload_stations),
+                "unloads": wait_time["count"],
+                "mining_utilization": sum(truck.total_mining_time for truck in trucks) / (duration * len(trucks)),
+                "mean_wait_per_unload": wait_time["mean"],
+                "max_wait_per_unload": wait_time["max"],
+                "p95_wait_per_unload": wait_time["p95"],
+            }
+        return summaries
+
+    def distributions(self) -> Dict[str, DistributionStats]:
+        """Merge streaming distributions of all mining types.
+
+        :return: distributions of wait time, cycle time, response time and queue length on arrival
+        """
+        merged = {name: DistributionStats() for name in ("wait_time", "cycle_time", "response_time")}
+        for distributions in self._type_distributions.values():
+            for name, stats in distributions.items():
+                merged[name].merge(stats)
+        merged["queue_length"] = self.queue_length_stats
+        return merged
+
+    def _get_sim_time_from_real_time(self) -> float:
+        """Get the current simulation time from the clock of the event loop.
+
+        :return: simulation time in minutes since the simulation started.
+        """
+        return (self._clock() - self._start_time_in_unix_tic) * self._sim_time_unit
 
     def report(self, duration: int) -> None:
         """Reports simulation statistics."""
-        SimulationLogger.get_instance().log(
+        self._logger.log(
             message="## Simulation Statistics Report",
             log_with_timestamp=False
         )
-        SimulationLogger.get_instance().log(
-            message="\n#### Simulation Statistics: Trucks",
-            log_with_timestamp=False
-        )
-        self.report_trucks(duration=duration)
-        SimulationLogger.get_instance().log(
-            message="\n#### Simulation Statistics: Unload Stations",
+        if self._report_mode == ReportMode.SUMMARY:
+            self.report_summary(duration=duration)
+        else:
+            self._logger.log(
+                message="\n#### Simulation Statistics: Trucks",
+                log_with_timestamp=False
+            )
+            self.report_trucks(duration=duration)
+            self._logger.log(
+                message="\n#### Simulation Statistics: Unload Stations",
+                log_with_timestamp=False
+            )
+            self.report_unload_stations(duration=duration)
+        self._logger.log(
+            message="\n#### Simulation Statistics: Distributions",
             log_with_timestamp=False
         )
-        self.report_unload_stations(duration=duration)
-        SimulationLogger.get_instance().log(message=None)
+        self.report_distributions()
+        if self._mixed_fleet:
+            self._logger.log(
+                message="\n#### Simulation Statistics: Mining Types",
+                log_with_timestamp=False
+            )
+            self.report_mining_types(duration=duration)
+        else:
+            # The analytic model has a single type of trucks and unload stations.
+            self._logger.log(
+                message="\n#### Simulation Statistics: Analytic Model Comparison",
+                log_with_timestamp=False
+            )
+            self.report_analytic_comparison(duration=duration)
+        if self.sampler is not None and self.sampler.resolutions:
+            self.report_time_series()
+        if self._mode == SimulationMode.REAL_TIME:
+            self._logger.log(
+                message="\n#### Simulation Statistics: Real Time Pacing",
+                log_with_timestamp=False
+            )
+            self.report_pacing()
+        self._logger.log(message=None)
 
     def report_trucks(self, duration: int) -> None:
-        # Get results
-        reports_trucks = {}
+        """Log simulation statistics of each truck as a table."""
+        self.export_trucks(duration=duration, exporter=TableExporter(logger=self._logger))
+
+    def report_unload_stations(self, duration: int) -> None:
+        """Log simulation statistics of each unload station as a table."""
+        self.export_unload_stations(duration=duration, exporter=TableExporter(logger=self._logger))
+
+    def export(self, duration: int, exporter: ReportExporter) -> None:
+        """Stream simulation statistics of every truck and unload station, and the run summary, to an exporter.
+
+        :param duration: test duration in simulation minutes
+        :param exporter: exporter to write to
+        """
+        self.export_trucks(duration=duration, exporter=exporter)
+        self.export_unload_stations(duration=duration, exporter=exporter)
+        if self.sampler is not None:
+            self.sampler.export(exporter=exporter)
+        exporter.write_summary(self.run_summary(duration=duration))
+
+    def export_trucks(self, duration: int, exporter: ReportExporter) -> None:
+        """Stream simulation statistics of each truck to an exporter, a row per truck.
+
+        :param duration: test duration in simulation minutes
+        :param exporter: exporter to write to
+        """
+        exporter.begin_table(name="trucks", columns=TRUCK_COLUMNS)
         for truck in self._trucks:
-            reports_trucks[truck.name] = truck.report()
+            exporter.write_row([
+                truck.name,
+                truck.total_mining,
+                truck.total_mining_time,
+                truck.total_mining_time / duration,
+                truck.total_wait_time,
+            ])
+        exporter.end_table()
 
-        # To make a table
-        headers = [
-            "Truck Name",
-            "Total mining",
-            "Total mining time (min)",
-            "Mining utilization (%)",
-            "Total wait time (min)",
-        ]
-        rows = []
-        for truck_name, report in reports_trucks.items():
-            total_mining_time = report.get("Total mining time", 0)
-            rows.append([
-                truck_name,
-                str(report.get("Total mining", 0)),
-                str(total_mining_time),
-                f"{(total_mining_time / duration) * 100:.1f} %",
-                str(report.get("Total wait time", 0)),
+    def export_unload_stations(self, duration: int, exporter: ReportExporter) -> None:
+        """Stream simulation statistics of each unload station to an exporter, a row per unload station.
+
+        :param duration: test duration in simulation minutes
+        :param exporter: exporter to write to
+        """
+        exporter.begin_table(name="unload_stations", columns=UNLOAD_STATION_COLUMNS)
+        for unload_station in self._unload_stations:
+            report = unload_station.report()
+            total_unloading_time = report.get("Total unloading time", 0)
+            exporter.write_row([
+                unload_station.name,
+                report.get("Total unloads", 0),
+                total_unloading_time,
+                total_unloading_time / duration,
             ])
+        exporter.end_table()
+
+    def run_summary(self, duration: int) -> Dict[str, Any]:
+        """Summarize the run in a single flat record for downstream aggregation:
+            the settings of the run followed by its fleet-wide statistics.
+
+        :param duration: test duration in simulation minutes
+        :return: run summary record
+        """
+        return {
+            "mode": self._mode.name,
+            "seed": self._seed,
+            "replication": self._replication,
+            "antithetic": self._antithetic,
+            **self.summarize(duration=duration),
+        }
+
+    def summarize_fleet(self, duration: int, k: int = TOP_K_TRUCKS) -> Dict[str, Any]:
+        """Summarize trucks and unload stations in a single pass over each, without a row per truck:
+            distributions and histograms of utilization, and the k trucks waiting the longest (from a heap of k).
+
+        :param duration: test duration in simulation minutes
+        :param k: number of trucks waiting the longest to keep
+        :return: distributions of mining utilization and total wait time of trucks, and of unloading utilization
+            of unload stations; utilization histograms; (total wait time, truck) of the k trucks waiting the longest
+        """
+        mining_utilization = DistributionStats()
+        wait_time = DistributionStats()
+        mining_histogram = Histogram()
+        worst_trucks = TopK(k=k)
+        for truck in self._trucks:
+            utilization = truck.total_mining_time / duration
+            mining_utilization.add(utilization)
+            mining_histogram.add(utilization)
+            wait_time.add(truck.total_wait_time)
+            worst_trucks.add(truck.total_wait_time, truck)
+
+        unloading_utilization = DistributionStats()
+        unloading_histogram = Histogram()
+        for station in self._unload_stations:
+            utilization = station.report().get("Total unloading time", 0) / duration
+            unloading_utilization.add(utilization)
+            unloading_histogram.add(utilization)
 
-        # Find the longest value per column
-        col_widths = [
-            max(len(header), max((len(row[i]) for row in rows), default=0))
-            for i, header in enumerate(headers)
+        return {
+            "mining_utilization": mining_utilization,
+            "wait_time": wait_time,
+            "unloading_utilization": unloading_utilization,
+            "mining_utilization_histogram": mining_histogram,
+            "unloading_utilization_histogram": unloading_histogram,
+            "worst_trucks": worst_trucks.items(),
+        }
+
+    def report_summary(self, duration: int, k: int = TOP_K_TRUCKS) -> None:
+        """Report trucks and unload stations as a summary of the fleet instead of a row per each.
+
+        :param duration: test duration in simulation minutes
+        :param k: number of trucks waiting the longest to report
+        """
+        summary = self.summarize_fleet(duration=duration, k=k)
+
+        self._logger.log(message="\n#### Simulation Statistics: Fleet Summary", log_with_timestamp=False)
+        headers = ["Metric", "Count", "Mean", "Std", "Min", "P5", "P50", "P95", "Max"]
+        metrics = [
+            ("Mining utilization (%)", summary["mining_utilization"], 100),
+            ("Total wait time (min)", summary["wait_time"], 1),
+            ("Unloading utilization (%)", summary["unloading_utilization"], 100),
         ]
+        rows = []
+        for metric_name, distribution, scale in metrics:
+            stats = distribution.stats
+            values = [stats.mean, stats.std, stats.min]
+            # Quantiles of the sketch are approximate; keep them within the exact min and max.
+            values += [min(max(distribution.quantile(q), stats.min), stats.max) for q in (0.05, 0.5, 0.95)]
+            values.append(stats.max)
+            rows.append([metric_name, str(distribution.count)] + [f"{value * scale:.1f}" for value in values])
+        self._log_table(headers=headers, rows=rows)
 
-        sep = " | "
-        line = " -" + "-+-".join("-" * w for w in col_widths) + "-"
-        header_row = sep.join(header.ljust(col_widths[i]) for i, header in enumerate(headers))
+        self._logger.log(message="\n#### Simulation Statistics: Utilization Histograms", log_with_timestamp=False)
+        rows = []
+        for (low, high, trucks), (_, _, stations) in zip(
+            summary["mining_utilization_histogram"].bins(), summary["unloading_utilization_histogram"].bins()
+        ):
+            rows.append([f"{low * 100:.0f} - {high * 100:.0f} %", str(trucks), str(stations)])
+        self._log_table(headers=["Utilization (%)", "Trucks", "Unload stations"], rows=rows)
 
-        SimulationLogger.get_instance().log(line, log_with_timestamp=False)
-        SimulationLogger.get_instance().log(f"| {header_row} |", log_with_timestamp=False)
-        SimulationLogger.get_instance().log(line, log_with_timestamp=False)
-        for row in rows:
-            SimulationLogger.get_instance().log(
-                "| " +  sep.join(row[i].ljust(col_widths[i]) for i in range(len(headers))) + " |",
-                log_with_timestamp=False
-            )
-        SimulationLogger.get_instance().log(line, log_with_timestamp=False)
+        self._logger.log(
+            message=f"\n#### Simulation Statistics: Top {k} Trucks by Wait Time", log_with_timestamp=False
+        )
+        rows = []
+        for rank, (total_wait_time, truck) in enumerate(summary["worst_trucks"], start=1):
+            rows.append([
+                str(rank),
+                truck.name,
+                str(total_wait_time),
+                str(truck.total_mining),
+                format_percent(truck.total_mining_time / duration),
+            ])
+        headers = ["Rank", "Truck Name", "Total wait time (min)", "Total mining", "Mining utilization (%)"]
+        self._log_table(headers=headers, rows=rows)
 
-    def report_unload_stations(self, duration: int) -> None:
+    def report_time_series(self) -> None:
+        """Report the sampled time series at its coarsest resolution (e.g., per shift)."""
+        resolution = max(self.sampler.resolutions, key=self.sampler.resolutions.get)
+        self._logger.log(
+            message=f"\n#### Simulation Statistics: Time Series (per {resolution})",
+            log_with_timestamp=False
+        )
+        self.sampler.export_resolution(resolution=resolution, exporter=TableExporter(logger=self._logger))
+
+    def report_distributions(self) -> None:
         # Get results
-        reports_unloads = {}
-        for unload_station in self._unload_stations:
-            reports_unloads[unload_station.name] = unload_station.report()
+        names = {
+            "wait_time": "Wait time (min)",
+            "cycle_time": "Cycle time (min)",
+            "response_time": "Time at control center (min)",
+            "queue_length": "Queue length on arrival",
+        }
+        summaries = {names[key]: distribution.summary() for key, distribution in self.distributions().items()}
 
         # To make a table
+        headers = ["Metric", "Count", "Mean", "Std", "P50", "P95", "P99", "Max"]
+        rows = []
+        for metric_name, summary in summaries.items():
+            rows.append([metric_name, str(summary["count"])] + [
+                "-" if summary[key] is None else f"{summary[key]:.1f}"
+                for key in ("mean", "std", "p50", "p95", "p99", "max")
+            ])
+        self._log_table(headers=headers, rows=rows)
+
+    def report_mining_types(self, duration: int) -> None:
+        """Report simulation statistics of each mining type."""
         headers = [
-            "Unload Station Name",
+            "Mining Type",
+            "Trucks",
+            "Unload stations",
             "Total unloads",
-            "Total unloading time",
-            "Unloading utilization (%)"
+            "Mining utilization (%)",
+            "Mean wait per unload (min)",
+            "P95 wait per unload (min)",
         ]
         rows = []
-        for unload_station_name, report in reports_unloads.items():
-            total_unloading_time = report.get("Total unloading time", 0)
+        for mining_type, summary in self.summarize_mining_types(duration=duration).items():
             rows.append([
-                unload_station_name,
-                str(report.get("Total unloads", 0)),
-                str(total_unloading_time),
-                f"{(total_unloading_time / duration) * 100:.1f} %",
+                MINING_TYPE_NAMES[mining_type],
+                str(summary["trucks"]),
+                str(summary["unload_stations"]),
+                str(summary["unloads"]),
+                f"{summary['mining_utilization'] * 100:.1f} %",
+                "-" if summary["mean_wait_per_unload"] is None else f"{summary['mean_wait_per_unload']:.1f}",
+                "-" if summary["p95_wait_per_unload"] is None else f"{summary['p95_wait_per_unload']:.1f}",
             ])
+        self._log_table(headers=headers, rows=rows)
 
-        # Find the longest value per column
-        col_widths = [
-            max(len(header), max((len(row[i]) for row in rows), default=0))
-            for i, header in enumerate(headers)
-        ]
+    def report_analytic_comparison(self, duration: int) -> None:
+        """Report simulated statistics next to the expected ones of the analytic model."""
+        rows = []
+        for metric_name, (expected, simulated) in self.compare_with_analytic(duration=duration).items():
+            difference = f"{(simulated - expected) / expected * 100:+.1f} %" if expected else "-"
+            rows.append([metric_name, f"{expected:.2f}", f"{simulated:.2f}", difference])
+        self._log_table(headers=["Metric", "Analytic", "Simulation", "Difference (%)"], rows=rows)
+
+    def report_pacing(self) -> None:
+        """Report how far the real time mode fell behind its deadlines."""
+        pacing = self.pacing()
+        rows = [["Phases", str(pacing["phases"])]]
+        lags = [("mean_lag", "Mean lag (ms)"), ("p95_lag", "P95 lag (ms)"), ("max_lag", "Max lag (ms)")]
+        for key, metric_name in lags:
+            rows.append([metric_name, "-" if pacing[key] is None else f"{pacing[key] * 1000:.1f}"])
+        rows.append(["Slipped schedule (s)", f"{pacing['slipped']:.2f}"])
+        self._log_table(headers=["Metric", "Value"], rows=rows)
 
-        sep = " | "
-        line = " -" + "-+-".join("-" * w for w in col_widths) + "-"
-        header_row = sep.join(header.ljust(col_widths[i]) for i, header in enumerate(headers))
+    def _log_table(self, headers: List[str], rows: List[List[str]]) -> None:
+        """Log rows as a table.
 
-        SimulationLogger.get_instance().log(line, log_with_timestamp=False)
-        SimulationLogger.get_instance().log(f"| {header_row} |", log_with_timestamp=False)
-        SimulationLogger.get_instance().log(line, log_with_timestamp=False)
+        :param headers: column headers
+        :param rows: rows of column values
+        """
+        exporter = TableExporter(logger=self._logger)
+        exporter.begin_table(name="table", columns=[Column(key=header, header=header) for header in headers])
         for row in rows:
-            SimulationLogger.get_instance().log(
-                "| " + sep.join(row[i].ljust(col_widths[i]) for i in range(len(headers))) + " |",
-                log_with_timestamp=False
-            )
-        SimulationLogger.get_instance().log(line, log_with_timestamp=False)
+            exporter.write_row(row)
+        exporter.end_table()
 
     async def _send_truck(self, truck: MiningTruck) -> None:
         """Send the truck to a mining site.
@@ -226,18 +1065,9 @@ class MiningControlCenter:
 
         :param truck: Truck to arrive to unload.
         """
-
-        if self._available_unload_stations:
-            # Get an available Unload Station and store the thread.
-            station = self._available_unload_stations.popleft()
+        station = self.dispatch_arrived_truck(truck=truck)
+        if station is not None:
             await self._unload(truck=truck, station=station)
-        else:
-            # If there is no available unload station, put the truck into queue
-            SimulationLogger.get_instance().log(
-                message=f"{truck.name} is waiting for next available unload stations.",
-            )
-            truck.start_to_wait = time.time()
-            self._trucks_to_unload.append(truck)
 
     async def unload_complete(self, truck: MiningTruck, station: UnloadStation) -> None:
         """Event: When a truck is completed unloads.
@@ -245,19 +1075,225 @@ class MiningControlCenter:
         :param truck: Truck which is completed to unload.
         :param station: Unload Station
         """
+        next_truck = self.dispatch_unloaded_truck(truck=truck, station=station)
 
-        self.unloads += 1
         # Send the truck again
-        if truck.start_to_wait > 0:
-            truck.total_wait_time += convert_real_time_to_sim_time(
-                time.time() - truck.start_to_wait, self._sim_time_unit
+        await self._send_truck(truck=truck)
+
+        if next_truck is not None:
+            await self._unload(truck=next_truck, station=station)
+
+    def mining_started(self, truck: MiningTruck) -> None:
+        """Count the truck as mining when it starts to mine at its mining site.
+
+        :param truck: Truck which started mining.
+        """
+        self._move_truck(TruckPhase.TRAVELING_TO_SITE, TruckPhase.MINING)
+
+    def mining_completed(self, truck: MiningTruck) -> None:
+        """Count the truck as traveling when it leaves its mining site.
+
+        :param truck: Truck which completed mining.
+        """
+        self._move_truck(TruckPhase.MINING, TruckPhase.TRAVELING_TO_STATION)
+
+    def _move_truck(self, from_phase: TruckPhase, to_phase: TruckPhase) -> None:
+        """Move a truck between phase counts.
+
+        :param from_phase: phase which the truck leaves
+        :param to_phase: phase which the truck enters
+        """
+        self.phase_counts[from_phase] -= 1
+        self.phase_counts[to_phase] += 1
+
+    def dispatch_departing_truck(self, truck: MiningTruck) -> Tuple[Optional[UnloadStation], int]:
+        """Choose an unload station for the truck leaving its mining site; with a site map only.
+
+        :param truck: Truck which completed mining.
+        :return: (Unload Station to go; None to unload at any available unload station, travel time in minutes)
+        """
+        if self._station_index is None:
+            return None, truck.TRAVEL_TIME
+        station_index, travel_time = self._station_index.dispatch(
+            site=truck.site, now=self._get_sim_time(), rule=self._dispatch_rule
+        )
+        return self._unload_stations[station_index], travel_time
+
+    def get_travel_time(self, truck: MiningTruck, station: UnloadStation) -> int:
+        """Get the travel time of the truck between its mining site and the unload station.
+
+        :param truck: Mining truck
+        :param station: Unload Station
+        :return: travel time in simulation minutes
+        """
+        if self._site_map is None:
+            return truck.TRAVEL_TIME
+        return self._site_map.travel_time(truck.site, station.station_id - 1)
+
+    def dispatch_arrived_truck(
+        self, truck: MiningTruck, station: Optional[UnloadStation] = None
+    ) -> Optional[UnloadStation]:
+        """Find an unload station for the arrived truck.
+        If there is no available unload station, put the truck into queue.
+
+        :param truck: Truck to arrive to unload.
+        :param station: Unload Station chosen when the truck left its mining site (geographic model);
+            None to unload at any available unload station.
+        :return: Unload Station to unload the truck; None if the truck is waiting.
+        """
+        truck.record_arrival(sim_time=self._get_sim_time())
+        queue = self._get_queue(truck=truck, station=station)
+        self.queue_length_stats.add(len(queue))
+        station = self._take_station(truck=truck, station=station)
+        if station is not None:
+            self._move_truck(TruckPhase.TRAVELING_TO_STATION, TruckPhase.UNLOADING)
+            self._trace_unload_started(truck=truck, station=station)
+            return station
+        self._move_truck(TruckPhase.TRAVELING_TO_STATION, TruckPhase.WAITING)
+
+        # If there is no available unload station, put the truck into queue
+        if self._log_events:
+            self._logger.log_event(
+                LogCategory.QUEUE, "{} is waiting for next available unload stations.", truck.name
             )
+        truck.start_to_wait = self._get_sim_time()
+        self._logger.trace_event(TraceEvent.TRUCK_WAITING, truck_id=truck.truck_id, sim_time=truck.start_to_wait)
+        queue.append(truck)
+        return None
+
+    def dispatch_unloaded_truck(self, truck: MiningTruck, station: UnloadStation) -> Optional[MiningTruck]:
+        """Save statistics of the unloaded truck and find the next truck for the unload station.
+        If there is no truck in queue, the unload station becomes available.
+
+        :param truck: Truck which is completed to unload.
+        :param station: Unload Station
+        :return: Next truck to unload at the station; None if there is no truck waiting.
+        """
+        self.unloads += 1
+        now = self._get_sim_time()
+        wait_time = 0
+        if truck.start_to_wait > 0:
+            wait_time = round(now - truck.start_to_wait)
+            truck.total_wait_time += wait_time
             truck.start_to_wait = 0
-        await self._send_truck(truck=truck)
+        cycle_time, response_time = truck.record_unload(sim_time=now)
+        distributions = self._type_distributions[truck.mining_type]
+        distributions["wait_time"].add(wait_time)
+        if cycle_time is not None:
+            distributions["cycle_time"].add(cycle_time)
+        distributions["response_time"].add(response_time)
+        station.wait_time_stats.add(wait_time)
+        self._logger.trace_event(
+            TraceEvent.UNLOAD_COMPLETED,
+            truck_id=truck.truck_id,
+            station_id=station.station_id,
+            duration=wait_time,
+            sim_time=now,
+        )
 
-        if self._trucks_to_unload:
-            # Get a truck on queue
-            truck = self._trucks_to_unload.popleft()
-            await self._unload(truck=truck, station=station)
+        if self._station_index is not None:
+            self._station_index.release(station.station_id - 1)
+        self._move_truck(TruckPhase.UNLOADING, TruckPhase.TRAVELING_TO_SITE)
+        next_truck = self._take_waiting_truck(station=station)
+        if next_truck is not None:
+            self._move_truck(TruckPhase.WAITING, TruckPhase.UNLOADING)
+            self._trace_unload_started(truck=next_truck, station=station)
+            return next_truck
+
+        self._release_station(station=station)
+        return None
+
+    def _get_queue(self, truck: MiningTruck, station: Optional[UnloadStation]) -> deque:
+        """Get the queue where the arrived truck waits.
+
+        :param truck: Truck to arrive to unload.
+        :param station: Unload Station chosen when the truck left its mining site (geographic model)
+        :return: queue of the chosen unload station, of the mining type of the truck, or of all trucks
+        """
+        if station is not None:
+            return self._station_queues[station.station_id - 1]
+        if self._mixed_fleet:
+            return self._type_queues[truck.mining_type]
+        return self._trucks_to_unload
+
+    def _take_station(self, truck: MiningTruck, station: Optional[UnloadStation]) -> Optional[UnloadStation]:
+        """Take an available unload station for the arrived truck.
+
+        :param truck: Truck to arrive to unload.
+        :param station: Unload Station chosen when the truck left its mining site (geographic model)
+        :return: Unload Station to unload the truck; None if there is no available unload station.
+        """
+        if station is not None:
+            # Geographic model: unload at the chosen station unless it is unloading another truck
+            if self._unloading_stations[station.station_id - 1]:
+                return None
+            self._unloading_stations[station.station_id - 1] = True
+            return station
+
+        if not self._mixed_fleet:
+            # Get an available Unload Station
+            return self._available_unload_stations.popleft() if self._available_unload_stations else None
+
+        # Mixed fleet: the first ready unload station of the mining type; skip ones taken for another type.
+        ready_stations = self._ready_stations[truck.mining_type]
+        while ready_stations:
+            station = ready_stations.popleft()
+            self._in_ready_stations[truck.mining_type][station.station_id - 1] = 0
+            if not self._unloading_stations[station.station_id - 1]:
+                self._unloading_stations[station.station_id - 1] = True
+                return station
+        return None
+
+    def _take_waiting_truck(self, station: UnloadStation) -> Optional[MiningTruck]:
+        """Take the next waiting truck which the unload station serves.
+
+        :param station: Unload Station which completed unloading.
+        :return: Next truck to unload; None if there is no truck waiting.
+        """
+        if self._station_index is not None:
+            queue = self._station_queues[station.station_id - 1]
+        elif self._mixed_fleet:
+            # The truck which has waited the longest among the mining types of the unload station
+            queues = [self._type_queues[mining_type] for mining_type in station.mining_types]
+            queue = min(
+                (queue for queue in queues if queue),
+                key=lambda queue: (queue[0].start_to_wait, queue[0].truck_id),
+                default=None,
+            )
+        else:
+            queue = self._trucks_to_unload
+        # Get a truck on queue
+        return queue.popleft() if queue else None
+
+    def _release_station(self, station: UnloadStation) -> None:
+        """Make the unload station available when no truck is waiting for it.
+
+        :param station: Unload Station which completed unloading.
+        """
+        if self._station_index is not None:
+            self._unloading_stations[station.station_id - 1] = False
+        elif self._mixed_fleet:
+            self._unloading_stations[station.station_id - 1] = False
+            self._add_ready_station(station=station)
         else:
             self._available_unload_stations.append(station)
+
+    def _add_ready_station(self, station: UnloadStation) -> None:
+        """Add the unload station to the ready stations of each mining type it serves, unless it is there already.
+
+        :param station: available Unload Station
+        """
+        for mining_type in station.mining_types:
+            if not self._in_ready_stations[mining_type][station.station_id - 1]:
+                self._in_ready_stations[mining_type][station.station_id - 1] = 1
+                self._ready_stations[mining_type].append(station)
+
+    def _trace_unload_started(self, truck: MiningTruck, station: UnloadStation) -> None:
+        """Write the start of an unloading to the event trace."""
+        self._logger.trace_event(
+            TraceEvent.UNLOAD_STARTED,
+            truck_id=truck.truck_id,
+            station_id=station.station_id,
+            duration=station.get_unloading_time(truck),
+            sim_time=self._get_sim_time(),
+        )
@@ -0,0 +1,336 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from const import (
+    UNLOADING_TIME_FOR_H3_UNLOAD_STATION,
+    TRAVELING_TIME_FOR_H3_MINING_TRUCK,
+    SHORTEST_TIME_FOR_MINING_H3,
+    LONGEST_TIME_FOR_MINING_H3,
+)
+from random_streams import GOLDEN, mix_array
+
+
+class MonteCarloResult:
+    """Per-replication totals of MonteCarloEngine.
+    Same statistics as MiningControlCenter.report_trucks and report_unload_stations;
+        arrays are indexed by [replication, truck] or [replication, unload station].
+    """
+
+    def __init__(
+        self,
+        duration: int,
+        truck_total_mining: np.ndarray,
+        truck_total_mining_time: np.ndarray,
+        truck_total_wait_time: np.ndarray,
+        station_total_unloads: np.ndarray,
+        unloading_time: int,
+        max_queue_length: np.ndarray,
+        wait_histogram: Optional[np.ndarray] = None,
+        antithetic: bool = False,
+        first_replication: int = 0,
+    ):
+        """
+        :param duration: test duration in simulation minutes
+        :param truck_total_mining: total mining per truck
+        :param truck_total_mining_time: total mining time per truck in simulation minutes
+        :param truck_total_wait_time: total wait time per truck in simulation minutes
+        :param station_total_unloads: total unloads per unload station
+        :param unloading_time: unloading time of a truck in simulation minutes
+        :param max_queue_length: the longest queue seen by an arriving truck per replication
+        :param wait_histogram: counts of unloads per wait time in minutes [replication, minute]; wide enough for
+            the longest wait of any replication. None if not recorded
+        :param antithetic: whether replications are antithetic pairs (2k, 2k + 1)
+        :param first_replication: index of the first replication; pairs are by the index of the whole run
+        """
+        self.duration = duration
+        self.truck_total_mining = truck_total_mining
+        self.truck_total_mining_time = truck_total_mining_time
+        self.truck_total_wait_time = truck_total_wait_time
+        self.station_total_unloads = station_total_unloads
+        self.station_total_unloading_time = station_total_unloads * unloading_time
+        self.unloads = station_total_unloads.sum(axis=1)
+        self.max_queue_length = max_queue_length
+        self.wait_histogram = wait_histogram
+        self.antithetic = antithetic
+        self.first_replication = first_replication
+
+    @property
+    def replications(self) -> int:
+        return self.unloads.shape[0]
+
+    def truck_mining_utilization(self) -> np.ndarray:
+        """Mining utilization per truck: total mining time / duration.
+
+        :return: array of [replication, truck]
+        """
+        return self.truck_total_mining_time / self.duration
+
+    def station_utilization(self) -> np.ndarray:
+        """Unloading utilization per unload station: total unloading time / duration.
+
+        :return: array of [replication, unload station]
+        """
+        return self.station_total_unloading_time / self.duration
+
+    def mean_wait_time(self) -> np.ndarray:
+        """Mean wait time per unload.
+
+        :return: array of [replication]; nan if there is no unload
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.truck_total_wait_time.sum(axis=1) / self.unloads
+
+    def wait_time_quantile(self, q: float) -> np.ndarray:
+        """Quantile of the wait time per unload; needs the wait histogram (record_wait_distribution).
+        The same definition as QuantileSketch: the sample of rank q * (count - 1).
+
+        :param q: quantile between 0 and 1; e.g., 0.95 for p95
+        :return: array of [replication]; nan if there is no unload
+        """
+        if self.wait_histogram is None:
+            raise ValueError("Wait distribution was not recorded; use record_wait_distribution=True")
+        cumulative = self.wait_histogram.cumsum(axis=1)
+        rank = q * (cumulative[:, -1] - 1)
+        quantile = (cumulative <= rank[:, None]).sum(axis=1).astype(float)
+        quantile[cumulative[:, -1] == 0] = np.nan
+        return quantile
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Summarize fleet-wide metrics across replications.
+
+        Antithetic pairs are not independent: the confidence interval is from the means of pairs.
+
+        :return: mean, standard deviation and 95% confidence half-width of each metric
+        """
+        metrics = {
+            "Total unloads": self.unloads,
+            "Mining utilization": self.truck_mining_utilization().mean(axis=1),
+            "Wait time per truck": self.truck_total_wait_time.mean(axis=1),
+            "Unloading utilization": self.station_utilization().mean(axis=1),
+            "Max queue length": self.max_queue_length,
+        }
+        summary = {}
+        for name, values in metrics.items():
+            std = float(values.std(ddof=1)) if self.replications > 1 else 0.0
+            independent = values
+            if self.antithetic:
+                # Replications 2k and 2k + 1 of the whole run are a pair; an incomplete pair stands alone
+                pair = (self.first_replication + np.arange(self.replications)) // 2
+                pair -= pair[0]
+                independent = np.bincount(pair, weights=values) / np.bincount(pair)
+            independent_std = float(independent.std(ddof=1)) if len(independent) > 1 else 0.0
+            summary[name] = {
+                "mean": float(values.mean()),
+                "std": std,
+                "ci95": 1.96 * independent_std / np.sqrt(len(independent)),
+            }
+        return summary
+
+
+class MonteCarloEngine:
+    """Vectorized Monte Carlo engine.
+    Simulates R independent replications of the (n trucks, m unload stations) system at once.
+    Unload stations serve trucks in FIFO order, so arrivals are handled in time order;
+        each step handles the next arrival of every replication together with NumPy.
+    The k-th mining time of a truck is a hash of (seed, replication, truck, k) instead of the next draw of a stream.
+    So runs with the same seed use the same mining times regardless of the number of unload stations or trucks:
+        common random numbers to compare configurations. Same as MiningTimeStream of MiningControlCenter.
+    With antithetic variates, replications 2k and 2k + 1 mine mirrored times (shortest + longest - time).
+    """
+
+    def __init__(
+        self,
+        n: int,
+        m: int,
+        replications: int,
+        seed: Optional[int] = None,
+        travel_time: int = TRAVELING_TIME_FOR_H3_MINING_TRUCK,
+        unloading_time: int = UNLOADING_TIME_FOR_H3_UNLOAD_STATION,
+        shortest_mining_time: int = SHORTEST_TIME_FOR_MINING_H3,
+        longest_mining_time: int = LONGEST_TIME_FOR_MINING_H3,
+        first_replication: int = 0,
+        record_wait_distribution: bool = False,
+        max_wait_time: int = 1023,
+        antithetic: bool = False,
+    ):
+        """
+        :param n: number of mining trucks
+        :param m: number of mining unload stations
+        :param replications: number of independent replications
+        :param seed: seed for the mining times; None for a random seed
+        :param travel_time: travel time between a mining site and an unload station in simulation minutes
+        :param unloading_time: unloading time of a truck in simulation minutes
+        :param shortest_mining_time: shortest mining time in simulation minutes
+        :param longest_mining_time: longest mining time in simulation minutes
+        :param first_replication: index of the first replication; e.g., to run replications in batches
+        :param record_wait_distribution: whether to count unloads per wait time for quantiles
+        :param max_wait_time: the largest wait time of the histogram at first; it grows for longer waits
+        :param antithetic: whether to run antithetic pairs; replications 2k and 2k + 1 mine mirrored times.
+            first_replication and replications must be even, so that the run has whole pairs only
+        """
+        if n <= 0 or m <= 0 or replications <= 0:
+            raise ValueError("n, m and replications must be positive integers")
+        if antithetic and (first_replication % 2 or replications % 2):
+            raise ValueError("Antithetic replications come in pairs: first_replication and replications must be even")
+        self._n = n
+        self._m = m
+        self._replications = replications
+        if seed is None:
+            seed = int(np.random.default_rng().integers(2 ** 63))
+        self._seed = seed
+        self._first_replication = first_replication
+        self._record_wait_distribution = record_wait_distribution
+        self._max_wait_time = max_wait_time
+        self._antithetic = antithetic
+        self._travel_time = travel_time
+        self._unloading_time = unloading_time
+        self._shortest_mining_time = shortest_mining_time
+        self._longest_mining_time = longest_mining_time
+
+    def _get_truck_keys(self) -> np.ndarray:
+        """Get a random key of each truck of each replication from the seed.
+
+        :return: array of [replication, truck]
+        """
+        replication = self._get_replications()
+        if self._antithetic:
+            # Both replications of an antithetic pair use the same keys
+            replication //= np.uint64(2)
+        replication_key = mix_array(
+            np.full(self._replications, self._seed, dtype=np.uint64) + GOLDEN * (replication + np.uint64(1))
+        )
+        truck = np.arange(1, self._n + 1, dtype=np.uint64)
+        return mix_array(replication_key[:, None] + GOLDEN * truck[None, :])
+
+    def _get_replications(self) -> np.ndarray:
+        """Get indexes of replications of this run."""
+        return np.arange(self._first_replication, self._first_replication + self._replications, dtype=np.uint64)
+
+    def _get_mining_time(
+        self, truck_key: np.ndarray, cycle: np.ndarray, mirrored: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Get the mining times of the given cycles of trucks: uniform integers in [shortest time, longest time]
+
+        :param truck_key: keys of trucks
+        :param cycle: how many times each truck mined before
+        :param mirrored: whether to mirror the mining time of each truck (antithetic); None for no mirror
+        :return: mining times in simulation minutes
+        """
+        bits = mix_array(truck_key + GOLDEN * cycle.astype(np.uint64)) >> np.uint64(11)
+        span = self._longest_mining_time - self._shortest_mining_time + 1
+        offset = ((bits * np.uint64(span)) >> np.uint64(53)).astype(np.int64)
+        if mirrored is not None:
+            offset = np.where(mirrored, span - 1 - offset, offset)
+        return offset + self._shortest_mining_time
+
+    def run(self, duration: int) -> MonteCarloResult:
+        """Run all replications.
+
+        :param duration: test duration in simulation hours
+        :return: per-replication totals
+        """
+        horizon = duration * 60
+        shape_trucks = (self._replications, self._n)
+        shape_stations = (self._replications, self._m)
+        # Offsets of each replication in flattened arrays; flat indexing is faster than [replication, truck].
+        truck_offset = np.arange(self._replications) * self._n
+        station_offset = np.arange(self._replications) * self._m
+
+        # Each truck starts empty at a mining site. Next arrival at the unload stations per truck.
+        truck_key = self._get_truck_keys()
+        cycle = np.zeros(shape_trucks, dtype=np.int64)
+        # Odd replications of antithetic pairs mine mirrored times
+        mirrored = None
+        if self._antithetic:
+            mirrored = (self._get_replications() % np.uint64(2)) == 1
+        mining_time = self._get_mining_time(
+            truck_key, cycle, None if mirrored is None else np.repeat(mirrored[:, None], self._n, axis=1)
+        )
+        next_arrival = mining_time + self._travel_time
+        # Unload stations are busy until
+        busy_until = np.zeros(shape_stations, dtype=np.int64)
+
+        truck_total_mining = np.zeros(shape_trucks, dtype=np.int64)
+        truck_total_mining_time = np.zeros(shape_trucks, dtype=np.int64)
+        truck_total_wait_time = np.zeros(shape_trucks, dtype=np.int64)
+        station_total_unloads = np.zeros(shape_stations, dtype=np.int64)
+        max_queue_length = np.zeros(self._replications, dtype=np.int64)
+        wait_histogram = None
+        if self._record_wait_distribution:
+            wait_histogram = np.zeros((self._replications, self._max_wait_time + 1), dtype=np.int64)
+            wait_histogram_flat = wait_histogram.reshape(-1)
+            wait_histogram_offset = np.arange(self._replications) * (self._max_wait_time + 1)
+
+        # Flattened views of the arrays above
+        mining_time_flat = mining_time.reshape(-1)
+        next_arrival_flat = next_arrival.reshape(-1)
+        busy_until_flat = busy_until.reshape(-1)
+        truck_total_mining_flat = truck_total_mining.reshape(-1)
+        truck_total_mining_time_flat = truck_total_mining_time.reshape(-1)
+        truck_total_wait_time_flat = truck_total_wait_time.reshape(-1)
+        station_total_unloads_flat = station_total_unloads.reshape(-1)
+        truck_key_flat = truck_key.reshape(-1)
+        cycle_flat = cycle.reshape(-1)
+
+        while True:
+            # The earliest arrival in each replication.
+            # Arrivals never go back in time, so a replication is finished once its arrival is after the duration.
+            # Finished replications keep moving with the others, but are not counted anymore.
+            truck = truck_offset + next_arrival.argmin(axis=1)
+            arrival = next_arrival_flat[truck]
+            active = arrival <= horizon
+            if not active.any():
+                break
+
+            # Save mining time when the truck arrived only.
+            truck_total_mining_flat[truck] += active
+            truck_total_mining_time_flat[truck] += np.where(active, mining_time_flat[truck], 0)
+
+            # Trucks in queue start to unload back-to-back when the previous unloading is completed.
+            # So trucks in queue per station: unloadings which start after the arrival until busy_until.
+            in_queue = (busy_until - arrival[:, None] + self._unloading_time - 1) // self._unloading_time - 1
+            queue_length = np.maximum(in_queue, 0).sum(axis=1)
+            np.maximum(max_queue_length, np.where(active, queue_length, 0), out=max_queue_length)
+
+            # The unload station which becomes available first serves the truck.
+            station = station_offset + busy_until.argmin(axis=1)
+            start = np.maximum(arrival, busy_until_flat[station])
+            complete = start + self._unloading_time
+            busy_until_flat[station] = complete
+
+            # Save unloads and wait time only for completed unloads.
+            completed = active & (complete <= horizon)
+            station_total_unloads_flat[station] += completed
+            waited = completed & (start > arrival)
+            wait_time = np.where(waited, complete - arrival, 0)
+            truck_total_wait_time_flat[truck] += wait_time
+            if wait_histogram is not None:
+                longest = int(wait_time.max())
+                if longest >= wait_histogram.shape[1]:
+                    # Grow the histogram instead of counting longer waits in the last bin, which biases quantiles
+                    width = max(2 * wait_histogram.shape[1], longest + 1)
+                    wait_histogram = np.pad(wait_histogram, ((0, 0), (0, width - wait_histogram.shape[1])))
+                    wait_histogram_flat = wait_histogram.reshape(-1)
+                    wait_histogram_offset = np.arange(self._replications) * width
+                # One unload per replication at a time: indexes never repeat within a step.
+                wait_histogram_flat[wait_histogram_offset + wait_time] += completed
+
+            # Travel to a mining site, mine and travel back to the unload stations.
+            cycle_flat[truck] += 1
+            next_mining_time = self._get_mining_time(truck_key_flat[truck], cycle_flat[truck], mirrored)
+            mining_time_flat[truck] = next_mining_time
+            next_arrival_flat[truck] = complete + 2 * self._travel_time + next_mining_time
+
+        return MonteCarloResult(
+            duration=horizon,
+            truck_total_mining=truck_total_mining,
+            truck_total_mining_time=truck_total_mining_time,
+            truck_total_wait_time=truck_total_wait_time,
+            station_total_unloads=station_total_unloads,
+            unloading_time=self._unloading_time,
+            max_queue_length=max_queue_length,
+            wait_histogram=wait_histogram,
+            antithetic=self._antithetic,
+            first_replication=self._first_replication,
+        )
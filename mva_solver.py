@@ -0,0 +1,99 @@
+from typing import Any, Dict
+
+from const import (
+    UNLOADING_TIME_FOR_H3_UNLOAD_STATION,
+    TRAVELING_TIME_FOR_H3_MINING_TRUCK,
+    SHORTEST_TIME_FOR_MINING_H3,
+    LONGEST_TIME_FOR_MINING_H3,
+)
+
+
+class MVASolver:
+    """Mean value analysis of the mining operation as a closed queueing network.
+    n trucks cycle through mining and traveling (delay stations: no queue) and an unload stage with m servers.
+    MVA for a multi-server station with marginal queue length probabilities; O(n * m) per solve.
+    An arriving truck waits S / m for each truck queued ahead, and a residual time if every station is busy.
+    The residual time is (1 + unloading SCV) / 2 * S / m: exact MVA for exponential unloading (SCV 1),
+        and an approximation for the fixed unloading time of the simulation (default SCV 0).
+    """
+
+    def __init__(
+        self,
+        n: int,
+        m: int,
+        travel_time: int = TRAVELING_TIME_FOR_H3_MINING_TRUCK,
+        unloading_time: int = UNLOADING_TIME_FOR_H3_UNLOAD_STATION,
+        shortest_mining_time: int = SHORTEST_TIME_FOR_MINING_H3,
+        longest_mining_time: int = LONGEST_TIME_FOR_MINING_H3,
+        unloading_scv: float = 0.0,
+    ):
+        """
+        :param n: number of mining trucks
+        :param m: number of mining unload stations
+        :param travel_time: travel time between a mining site and an unload station in simulation minutes
+        :param unloading_time: unloading time of a truck in simulation minutes
+        :param shortest_mining_time: shortest mining time in simulation minutes
+        :param longest_mining_time: longest mining time in simulation minutes
+        :param unloading_scv: squared coefficient of variation of the unloading time; 0 for a fixed time
+        """
+        if n <= 0 or m <= 0:
+            raise ValueError("n and m must be positive integers")
+        if unloading_scv < 0:
+            raise ValueError("unloading_scv must not be negative")
+        self._n = n
+        self._m = m
+        self._unloading_time = unloading_time
+        # Mean of the uniform mining time over integers
+        self._mining_time = (shortest_mining_time + longest_mining_time) / 2
+        # Mining and traveling to the station and back: no queueing
+        self._think_time = self._mining_time + 2 * travel_time
+        # Residual unloading time of a busy station relative to S / m; 1 for exponential unloading
+        self._residual_factor = (1 + unloading_scv) / 2
+
+    def solve(self) -> Dict[str, Any]:
+        """Solve the network for n trucks.
+
+        :return: expected steady state statistics; times in simulation minutes, throughput in unloads per minute
+        """
+        m = self._m
+        service_time = self._unloading_time
+        queue_length = 0.0
+        # Marginal probabilities of j trucks at the unload stage (j < m) with one truck less
+        probabilities = [1.0] + [0.0] * (m - 1)
+        throughput = 0.0
+        response_time = service_time
+
+        for k in range(1, self._n + 1):
+            # Arrival theorem: an arriving truck sees the network with k - 1 trucks.
+            # It waits for the trucks queued ahead, and for the first free station if every station is busy.
+            all_busy = max(1 - sum(probabilities), 0.0)
+            waiting_ahead = max(queue_length - min(throughput * service_time, m), 0.0)
+            response_time = service_time + service_time / m * (all_busy * self._residual_factor + waiting_ahead)
+            throughput = k / (self._think_time + response_time)
+            if throughput > m / service_time:
+                # The residual time approximation may overshoot the capacity of the stations when saturated:
+                #   bound the throughput and keep the cycle time consistent with it (Little's law).
+                throughput = m / service_time
+                response_time = k / throughput - self._think_time
+            queue_length = throughput * response_time
+
+            # Marginal probabilities with k trucks: p(j|k) = X * S / j * p(j-1|k-1) for 0 < j < m
+            new_probabilities = [0.0] * m
+            for j in range(1, m):
+                new_probabilities[j] = throughput * service_time / j * probabilities[j - 1]
+            # Sum of (m - j) * p(j) over j < m equals m * (1 - utilization)
+            utilization = min(throughput * service_time / m, 1.0)
+            rest = m * (1 - utilization) - sum((m - j) * new_probabilities[j] for j in range(1, m))
+            new_probabilities[0] = max(rest / m, 0.0)
+            probabilities = new_probabilities
+
+        return {
+            "trucks": self._n,
+            "unload_stations": m,
+            "throughput": throughput,
+            "mining_utilization": throughput * self._mining_time / self._n,
+            "unloading_utilization": throughput * service_time / m,
+            "mean_queueing_delay": response_time - service_time,
+            "mean_queue_length": queue_length - throughput * service_time,
+            "mean_cycle_time": self._think_time + response_time,
+        }
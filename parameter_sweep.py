@@ -0,0 +1,208 @@
+import argparse
+import csv
+import itertools
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from const import SimulationMode
+from mining_control_center import MiningControlCenter
+
+# Columns of the result table
+FIELDNAMES = [
+    "trucks",
+    "unload_stations",
+    "seed",
+    "duration",
+    "unloads",
+    "mining_utilization",
+    "mean_wait_time",
+    "max_wait_time",
+    "unloading_utilization",
+    "p50_wait_time",
+    "p95_wait_time",
+    "p99_wait_time",
+    "p95_cycle_time",
+    "p95_queue_length",
+    "error",
+]
+
+# (number of trucks, number of unload stations, seed, duration in simulation hours)
+Scenario = Tuple[int, int, int, int]
+
+
+def run_scenario(n: int, m: int, seed: int, duration: int) -> Dict[str, Any]:
+    """Run a simulation in a worker process.
+    Each worker builds its own MiningControlCenter and runs the discrete event engine without logging.
+
+    :param n: number of mining trucks
+    :param m: number of mining unload stations
+    :param seed: master seed for the random mining time
+    :param duration: test duration in simulation hours
+    :return: summary of the simulation
+    """
+    # Each truck mines from its own substream of the seed: pairs with the same seed share mining times.
+    control_center = MiningControlCenter(n=n, m=m, sim_time_unit=1, mode=SimulationMode.DISCRETE_EVENT, seed=seed)
+    control_center.simulate(duration=duration)
+    summary = control_center.summarize(duration=duration * 60)
+    summary["seed"] = seed
+    return summary
+
+
+def make_scenarios(
+    trucks: Iterable[int], unload_stations: Iterable[int], replications: int, duration: int, seed: int = 0
+) -> List[Scenario]:
+    """Make scenarios for every (trucks, unload stations) pair with R seeds each.
+
+    :param trucks: numbers of mining trucks
+    :param unload_stations: numbers of unload stations
+    :param replications: number of seeds per pair
+    :param duration: test duration in simulation hours
+    :param seed: first seed; replication r uses seed + r
+    :return: list of scenarios
+    """
+    return [
+        (n, m, seed + replication, duration)
+        for n, m, replication in itertools.product(trucks, unload_stations, range(replications))
+    ]
+
+
+def sweep(
+    scenarios: List[Scenario],
+    output_path: str,
+    max_workers: Optional[int] = None,
+    max_retries: int = 2,
+    runner: Callable[..., Dict[str, Any]] = run_scenario,
+) -> int:
+    """Run scenarios across all cores with a process pool and stream results into a CSV file.
+    Each result is written and flushed as soon as its worker finishes, so finished results are never lost.
+    If a worker process crashes, the pool is restarted: the scenarios running at the crash are retried, and the
+        scenarios not started yet continue in the new pool.
+    A scenario out of retries runs once more in its own pool, so a crash is recorded only for the scenario
+        which caused it; the rest of the sweep stays parallel.
+
+    :param scenarios: scenarios to run
+    :param output_path: path of the CSV file
+    :param max_workers: number of worker processes; None for the number of CPUs
+    :param max_retries: how many times to retry a scenario in the shared pool after its worker process crashed
+    :param runner: function to run a scenario in a worker; must be picklable
+    :return: number of successfully finished scenarios
+    """
+    finished = 0
+    # Crashes per scenario, by index: the same scenario can be in the list more than once.
+    attempts = [0] * len(scenarios)
+    queue = deque(range(len(scenarios)))
+
+    with open(output_path, "w", newline="") as output:
+        writer = csv.DictWriter(output, fieldnames=FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+        output.flush()
+
+        def write_error(scenario: Scenario, error: str) -> None:
+            n, m, seed, duration = scenario
+            writer.writerow(
+                {"trucks": n, "unload_stations": m, "seed": seed, "duration": duration * 60, "error": error}
+            )
+            output.flush()
+
+        def write_result(future: Future, index: int) -> bool:
+            """Write the result of a finished future; return False if its worker crashed."""
+            nonlocal finished
+            try:
+                writer.writerow(future.result())
+                output.flush()
+                finished += 1
+            except BrokenProcessPool:
+                return False
+            except Exception as e:
+                write_error(scenarios[index], error=repr(e))
+            return True
+
+        def run_pool(pool_queue: Deque[int], pool_workers: Optional[int]) -> List[int]:
+            """Run scenarios of the queue in a new pool with at most one scenario in flight per worker.
+            Stop at the first crash: return the scenarios which were running then; the others stay in the queue.
+            """
+            crashed = []
+            broken = False
+            limit = pool_workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=pool_workers) as executor:
+                in_flight: Dict[Future, int] = {}
+                while (pool_queue or in_flight) and not crashed and not broken:
+                    while pool_queue and len(in_flight) < limit:
+                        index = pool_queue.popleft()
+                        try:
+                            future = executor.submit(runner, *scenarios[index])
+                        except BrokenProcessPool:
+                            # A worker crashed since the last wait: the scenario did not start, keep it queued.
+                            pool_queue.appendleft(index)
+                            broken = True
+                            break
+                        in_flight[future] = index
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = in_flight.pop(future)
+                        if not write_result(future, index):
+                            crashed.append(index)
+            # The pool is broken: every future still in flight either finished just before the crash or crashed.
+            for future, index in in_flight.items():
+                if not write_result(future, index):
+                    crashed.append(index)
+            return crashed
+
+        while queue:
+            for index in run_pool(queue, max_workers):
+                attempts[index] += 1
+                if attempts[index] <= max_retries:
+                    queue.append(index)
+                # Out of retries: one last run in its own pool tells whether this scenario caused the crash.
+                elif run_pool(deque([index]), 1):
+                    write_error(scenarios[index], error="worker process crashed")
+
+    return finished
+
+
+def parse_range(value: str) -> range:
+    """Parse a range argument: "start:stop[:step]" (stop inclusive) or a single integer.
+
+    :param value: range argument
+    :return: range of integers
+    """
+    try:
+        numbers = [int(number) for number in value.split(":")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid range: {value}")
+    if len(numbers) == 1:
+        numbers.append(numbers[0])
+    if len(numbers) not in (2, 3) or numbers[0] <= 0 or numbers[1] < numbers[0]:
+        raise argparse.ArgumentTypeError(f"Invalid range: {value}")
+    step = numbers[2] if len(numbers) == 3 else 1
+    if step <= 0:
+        raise argparse.ArgumentTypeError(f"Invalid range: {value}")
+    return range(numbers[0], numbers[1] + 1, step)
+
+
+if __name__ == "__main__":
+    """Parameter sweep over (trucks, unload stations) grids. e.g.,
+    python parameter_sweep.py --trucks 10:500:10 --stations 1:40 --replications 5 --duration 72 --output sweep.csv
+    """
+    parser = argparse.ArgumentParser(description="Parameter sweep of the mining simulation")
+    parser.add_argument("--trucks", type=parse_range, required=True, help="start:stop[:step] (inclusive)")
+    parser.add_argument("--stations", type=parse_range, required=True, help="start:stop[:step] (inclusive)")
+    parser.add_argument("--replications", type=int, default=1, help="number of seeds per pair")
+    parser.add_argument("--duration", type=int, default=72, help="test duration in simulation hours")
+    parser.add_argument("--seed", type=int, default=0, help="first seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--output", default="sweep.csv", help="path of the CSV file")
+    args = parser.parse_args()
+
+    sweep_scenarios = make_scenarios(
+        trucks=args.trucks,
+        unload_stations=args.stations,
+        replications=args.replications,
+        duration=args.duration,
+        seed=args.seed,
+    )
+    num_finished = sweep(scenarios=sweep_scenarios, output_path=args.output, max_workers=args.workers)
+    print(f"Finished {num_finished} of {len(sweep_scenarios)} scenarios. Results: {args.output}")
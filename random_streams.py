@@ -0,0 +1,111 @@
+try:
+    import numpy as np
+except ImportError:
+    # Only mix_array (the vectorized engines) needs numpy: the substreams of the simulation are pure Python.
+    np = None
+
+# Odd 64-bit constant (golden ratio) to derive independent keys; as in SplitMix64
+GOLDEN = 0x9E3779B97F4A7C15
+_MASK = (1 << 64) - 1
+
+
+def mix(x: int) -> int:
+    """SplitMix64 finalizer: hash a 64-bit integer into well-mixed random bits.
+
+    :param x: integer; only the lower 64 bits are used
+    :return: 64-bit integer
+    """
+    x &= _MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK
+    return x ^ (x >> 31)
+
+
+def mix_array(x: "np.ndarray") -> "np.ndarray":
+    """SplitMix64 finalizer for arrays; same as mix (wraps around on overflow). Requires numpy.
+
+    :param x: array of uint64
+    :return: array of uint64
+    """
+    if np is None:
+        raise ImportError("mix_array requires numpy: pip install numpy; use mix for a single integer")
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def derive_truck_key(seed: int, truck_id: int, replication: int = 0) -> int:
+    """Derive the key of the random substream of a truck from the master seed.
+
+    :param seed: master seed of the simulation
+    :param truck_id: id of the truck (from 1)
+    :param replication: index of the replication
+    :return: 64-bit key
+    """
+    replication_key = mix(seed + GOLDEN * (replication + 1))
+    return mix(replication_key + GOLDEN * truck_id)
+
+
+def draw_mining_time(key: int, cycle: int, shortest_mining_time: int, span: int, antithetic: bool = False) -> int:
+    """Get the mining time of a cycle of a substream: uniform integer in [shortest time, shortest time + span)
+
+    :param key: key of the substream
+    :param cycle: how many times the truck mined before
+    :param shortest_mining_time: shortest mining time in simulation minutes
+    :param span: number of possible mining times
+    :param antithetic: mirror the mining time for antithetic variates
+    :return: mining time in simulation minutes
+    """
+    offset = ((mix(key + GOLDEN * cycle) >> 11) * span) >> 53
+    if antithetic:
+        offset = span - 1 - offset
+    return shortest_mining_time + offset
+
+
+class MiningTimeStream:
+    """Independent substream of the mining times of a truck.
+    Counter-based: the k-th mining time is a hash of (master seed, replication, truck, k).
+    So a truck mines the same times with the same seed, whatever the other trucks, the unload stations,
+        the scheduling order or any other user of the random module do.
+    MonteCarloEngine derives mining times in the same way: replication r of both engines mines the same times,
+        with or without antithetic variates.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        truck_id: int,
+        shortest_mining_time: int,
+        longest_mining_time: int,
+        replication: int = 0,
+        antithetic: bool = False,
+    ):
+        """
+        :param seed: master seed of the simulation
+        :param truck_id: id of the truck (from 1)
+        :param shortest_mining_time: shortest mining time in simulation minutes
+        :param longest_mining_time: longest mining time in simulation minutes
+        :param replication: index of the replication
+        :param antithetic: whether replications are antithetic pairs (2k, 2k + 1); the odd replication of a pair
+            mirrors every mining time (shortest + longest - time) of the even one
+        """
+        mirrored = False
+        if antithetic:
+            # Both replications of an antithetic pair use the same keys
+            replication, mirrored = divmod(replication, 2)
+        self._key = derive_truck_key(seed=seed, truck_id=truck_id, replication=replication)
+        self._shortest_mining_time = shortest_mining_time
+        self._span = longest_mining_time - shortest_mining_time + 1
+        self._mirrored = bool(mirrored)
+        self.cycle = 0
+
+    def next(self) -> int:
+        """Get the next mining time: uniform integer in [shortest time, longest time]
+
+        :return: mining time in simulation minutes
+        """
+        mining_time = draw_mining_time(
+            self._key, self.cycle, self._shortest_mining_time, self._span, antithetic=self._mirrored
+        )
+        self.cycle += 1
+        return mining_time
@@ -0,0 +1,239 @@
+import csv
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, TextIO
+
+from simulation_logger import SimulationLogger
+
+
+def format_percent(value: float) -> str:
+    """Format a ratio as a percentage in a table cell.
+
+    :param value: ratio (e.g., 0.5)
+    :return: percentage (e.g., "50.0 %")
+    """
+    return f"{value * 100:.1f} %"
+
+
+class Column(NamedTuple):
+    """Column of an exported table."""
+
+    # Field name in machine-readable formats (CSV, JSON Lines, Parquet)
+    key: str
+    # Column header of the ASCII table
+    header: str
+    # Formats a value in the ASCII table; machine-readable formats keep the raw value
+    fmt: Callable[[Any], str] = str
+
+
+class ReportExporter(ABC):
+    """Abstract class for report exporters.
+    The control center streams each table row by row: begin_table, write_row for every truck or unload station,
+        then end_table. An exporter writes each row as it comes, so the whole table is never built in memory
+        (except for the ASCII table, which needs the widths of its columns).
+    """
+
+    def __init__(self):
+        self._table = ""
+        self._columns: List[Column] = []
+
+    def begin_table(self, name: str, columns: Sequence[Column]) -> None:
+        """Begin a table.
+
+        :param name: name of the table (e.g., "trucks")
+        :param columns: columns of the table
+        """
+        self._table = name
+        self._columns = list(columns)
+
+    @abstractmethod
+    def write_row(self, values: Sequence[Any]) -> None:
+        """Write a row of the current table.
+
+        :param values: raw value of each column
+        """
+
+    def end_table(self) -> None:
+        """End the current table."""
+
+    def write_summary(self, summary: Dict[str, Any]) -> None:
+        """Write the run summary record: a single row table named "summary".
+
+        :param summary: summary of the run (e.g., MiningControlCenter.run_summary())
+        """
+        self.begin_table(name="summary", columns=[Column(key=key, header=key) for key in summary])
+        self.write_row(list(summary.values()))
+        self.end_table()
+
+    def close(self) -> None:
+        """Flush and release the output."""
+
+    def __enter__(self) -> "ReportExporter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class TableExporter(ReportExporter):
+    """Logs each table as an ASCII table; the default report of the simulation."""
+
+    def __init__(self, logger: Optional[SimulationLogger] = None):
+        """
+        :param logger: logger to log tables; None to keep the lines of the last table only (e.g., to print them)
+        """
+        super().__init__()
+        self._logger = logger
+        self._rows: List[List[str]] = []
+        # Lines of the last table
+        self.lines: List[str] = []
+
+    def begin_table(self, name: str, columns: Sequence[Column]) -> None:
+        super().begin_table(name=name, columns=columns)
+        self._rows = []
+
+    def write_row(self, values: Sequence[Any]) -> None:
+        self._rows.append([
+            "-" if value is None else column.fmt(value) for column, value in zip(self._columns, values)
+        ])
+
+    def end_table(self) -> None:
+        """Log the table as a single message, if there is a logger."""
+        headers = [column.header for column in self._columns]
+        # Find the longest value per column
+        col_widths = [
+            max(len(header), max((len(row[i]) for row in self._rows), default=0))
+            for i, header in enumerate(headers)
+        ]
+
+        sep = " | "
+        line = " -" + "-+-".join("-" * w for w in col_widths) + "-"
+        lines = [line, "| " + sep.join(header.ljust(col_widths[i]) for i, header in enumerate(headers)) + " |", line]
+        for row in self._rows:
+            lines.append("| " + sep.join(row[i].ljust(col_widths[i]) for i in range(len(headers))) + " |")
+        lines.append(line)
+        self.lines = lines
+        if self._logger is not None:
+            self._logger.log("\n".join(lines), log_with_timestamp=False)
+        self._rows = []
+
+
+class CsvExporter(ReportExporter):
+    """Writes each table to a CSV file in a directory: <table>.csv.
+    The run summary is appended to summary.csv, so the summaries of many runs aggregate in one file.
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param directory: output directory; created if it does not exist
+        """
+        super().__init__()
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._file: Optional[TextIO] = None
+        self._writer = None
+
+    def begin_table(self, name: str, columns: Sequence[Column]) -> None:
+        super().begin_table(name=name, columns=columns)
+        path = os.path.join(self._directory, f"{name}.csv")
+        # Append run summaries; the header is written only once.
+        append = name == "summary" and os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, "a" if append else "w", newline="")
+        self._writer = csv.writer(self._file)
+        if not append:
+            self._writer.writerow([column.key for column in self._columns])
+
+    def write_row(self, values: Sequence[Any]) -> None:
+        self._writer.writerow(values)
+
+    def end_table(self) -> None:
+        self._file.close()
+        self._file = None
+        self._writer = None
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.end_table()
+
+
+class JsonLinesExporter(ReportExporter):
+    """Writes every row as a JSON object on its own line to a text stream (a file or a buffer).
+    Each object has the name of its table in the "table" field; the run summary is {"table": "summary", ...}.
+    """
+
+    def __init__(self, stream: TextIO):
+        """
+        :param stream: text stream to write to; the caller owns it
+        """
+        super().__init__()
+        self._stream = stream
+        self._keys: List[str] = []
+
+    def begin_table(self, name: str, columns: Sequence[Column]) -> None:
+        super().begin_table(name=name, columns=columns)
+        self._keys = [column.key for column in self._columns]
+
+    def write_row(self, values: Sequence[Any]) -> None:
+        record = {"table": self._table}
+        record.update(zip(self._keys, values))
+        self._stream.write(json.dumps(record) + "\n")
+
+    def close(self) -> None:
+        self._stream.flush()
+
+
+class ParquetExporter(ReportExporter):
+    """Writes each table to a Parquet file in a directory: <table>.parquet.
+    Rows are written in batches, so at most one batch of a table is in memory. Requires pyarrow.
+    """
+
+    def __init__(self, directory: str, batch_size: int = 65536):
+        """
+        :param directory: output directory; created if it does not exist
+        :param batch_size: number of rows per written batch
+        """
+        super().__init__()
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError("ParquetExporter requires pyarrow: pip install pyarrow") from error
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._batch_size = batch_size
+        self._batch: List[List[Any]] = []
+        self._writer = None
+
+    def begin_table(self, name: str, columns: Sequence[Column]) -> None:
+        super().begin_table(name=name, columns=columns)
+        self._batch = [[] for _ in self._columns]
+        self._writer = None
+
+    def write_row(self, values: Sequence[Any]) -> None:
+        for column_values, value in zip(self._batch, values):
+            column_values.append(value)
+        if len(self._batch[0]) >= self._batch_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write the buffered rows as a batch."""
+        table = self._pa.table({column.key: values for column, values in zip(self._columns, self._batch)})
+        if self._writer is None:
+            # The schema of the file is the one of its first batch.
+            path = os.path.join(self._directory, f"{self._table}.parquet")
+            self._writer = self._pq.ParquetWriter(path, table.schema)
+        self._writer.write_table(table.cast(self._writer.schema))
+        self._batch = [[] for _ in self._columns]
+
+    def end_table(self) -> None:
+        if self._batch[0] or self._writer is None:
+            self._flush()
+        self._writer.close()
+        self._writer = None
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self.end_table()
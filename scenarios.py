@@ -0,0 +1,311 @@
+import asyncio
+import csv
+import itertools
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, TextIO, Union
+
+from const import (
+    LogLevel,
+    MiningType,
+    ReportMode,
+    SimulationMode,
+    UNLOADING_TIME_FOR_H3_UNLOAD_STATION,
+    TRAVELING_TIME_FOR_H3_MINING_TRUCK,
+    SHORTEST_TIME_FOR_MINING_H3,
+    LONGEST_TIME_FOR_MINING_H3,
+)
+from mining_control_center import MiningControlCenter
+from simulation_logger import SimulationLogger
+from UnloadStations.h3_unload_station import H3UnloadStation
+from Vehicles.h3_mining_truck import H3MiningTruck
+from virtual_time_loop import run_in_virtual_time
+
+# Time scale of a scenario which runs as fast as possible instead of in the real world time
+UNPACED = "unpaced"
+
+# Larger fleets are reported as a summary instead of a row per truck, unless the scenario sets report_mode
+FULL_REPORT_MAX_TRUCKS = 100
+
+# Settings of a scenario which are not in the scenario file (or in [defaults] of the file)
+DEFAULTS = {
+    "name": None,
+    "duration": 72,
+    "mode": "discrete_event",
+    "time_scale": 10,
+    "seed": None,
+    "replications": 1,
+    "antithetic": False,
+    "travel_time": TRAVELING_TIME_FOR_H3_MINING_TRUCK,
+    "unloading_time": UNLOADING_TIME_FOR_H3_UNLOAD_STATION,
+    "shortest_mining_time": SHORTEST_TIME_FOR_MINING_H3,
+    "longest_mining_time": LONGEST_TIME_FOR_MINING_H3,
+    "report_mode": None,
+    "log_level": "info",
+}
+
+# Settings which every scenario must have
+REQUIRED = ("trucks", "stations")
+
+
+class Scenario(NamedTuple):
+    """Settings of a simulation run by the batch runner; see DEFAULTS for the default of each setting."""
+
+    name: str
+    trucks: int
+    stations: int
+    duration: int
+    mode: SimulationMode
+    # Simulation minutes per real second (real time and scheduled modes); UNPACED to run as fast as possible
+    time_scale: Union[float, str]
+    seed: Optional[int]
+    replications: int
+    antithetic: bool
+    travel_time: int
+    unloading_time: int
+    shortest_mining_time: int
+    longest_mining_time: int
+    report_mode: Optional[ReportMode]
+    log_level: LogLevel
+
+
+def load_scenario_file(path: str) -> List[Dict[str, Any]]:
+    """Read the settings of scenarios from a TOML (.toml) or JSON (.json) file. e.g.,
+        [defaults]
+        duration = 72
+        mode = "discrete_event"
+
+        [[scenario]]
+        name = "baseline"
+        trucks = 100
+        stations = [1, 2, 4]
+    [defaults] applies to every [[scenario]]; a file without [[scenario]] is a single scenario.
+
+    :param path: path of the scenario file
+    :return: settings of each scenario, with the defaults of the file
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".toml":
+        try:
+            import tomllib
+        except ImportError:
+            raise ImportError("Reading TOML scenario files requires Python 3.11+; use a JSON file instead") from None
+        with open(path, "rb") as file:
+            document = tomllib.load(file)
+    elif extension == ".json":
+        with open(path) as file:
+            document = json.load(file)
+    else:
+        raise ValueError(f"{path}: a scenario file must be .toml or .json")
+
+    defaults = document.get("defaults", {})
+    scenarios = document.get("scenario", [])
+    if not scenarios:
+        scenarios = [{key: value for key, value in document.items() if key != "defaults"}]
+    prefix = os.path.splitext(os.path.basename(path))[0]
+    return [
+        {"name": f"{prefix}-{index + 1}", **defaults, **settings} for index, settings in enumerate(scenarios)
+    ]
+
+
+def make_scenarios(settings: Dict[str, Any], overrides: Optional[Dict[str, Any]] = None) -> List[Scenario]:
+    """Make scenarios from settings; a list of trucks or stations makes a scenario for every combination.
+
+    :param settings: settings of the scenario (e.g., an item of load_scenario_file)
+    :param overrides: settings which replace those of the scenario (e.g., from the command line); None for none
+    :return: scenarios in the order of (trucks, stations)
+    """
+    settings = {**DEFAULTS, **settings, **(overrides or {})}
+    unknown = set(settings) - set(DEFAULTS) - set(REQUIRED)
+    if unknown:
+        raise ValueError(f"Unknown scenario settings: {', '.join(sorted(unknown))}")
+    missing = [key for key in REQUIRED if settings.get(key) is None]
+    if missing:
+        raise ValueError(f"Missing scenario settings: {', '.join(missing)}")
+
+    trucks = _as_list(settings["trucks"])
+    stations = _as_list(settings["stations"])
+    name = settings["name"] or "scenario"
+    scenarios = []
+    for n, m in itertools.product(trucks, stations):
+        scenarios.append(_make_scenario({
+            **settings,
+            "name": name if len(trucks) == 1 and len(stations) == 1 else f"{name}-n{n}-m{m}",
+            "trucks": n,
+            "stations": m,
+        }))
+    return scenarios
+
+
+def _as_list(value: Union[int, Iterable[int]]) -> List[int]:
+    """Get a setting which can be a single value or a list as a list."""
+    return [value] if isinstance(value, int) else list(value)
+
+
+def _make_scenario(settings: Dict[str, Any]) -> Scenario:
+    """Validate the settings of a single (trucks, stations) pair and make its scenario."""
+    for key in ("trucks", "stations", "duration", "replications", "travel_time", "unloading_time",
+                "shortest_mining_time", "longest_mining_time"):
+        if not isinstance(settings[key], int) or settings[key] <= 0:
+            raise ValueError(f"{key} must be a positive integer")
+    if settings["longest_mining_time"] < settings["shortest_mining_time"]:
+        raise ValueError("longest_mining_time must not be shorter than shortest_mining_time")
+    if settings["antithetic"] and settings["replications"] % 2:
+        raise ValueError("Antithetic replications come in pairs: replications must be even")
+
+    try:
+        mode = SimulationMode[str(settings["mode"]).upper()]
+    except KeyError:
+        raise ValueError(f"Unknown mode: {settings['mode']}") from None
+    time_scale = settings["time_scale"]
+    if time_scale != UNPACED and (isinstance(time_scale, bool) or not isinstance(time_scale, (int, float))
+                                  or time_scale <= 0):
+        raise ValueError(f"time_scale must be a positive number or \"{UNPACED}\"")
+    if time_scale == UNPACED:
+        # As fast as possible: the unpaced counterpart of each paced mode
+        mode = {
+            SimulationMode.REAL_TIME: SimulationMode.VIRTUAL_TIME,
+            SimulationMode.SCHEDULED: SimulationMode.DISCRETE_EVENT,
+        }.get(mode, mode)
+
+    report_mode = settings["report_mode"]
+    if not isinstance(settings["log_level"], str):
+        raise ValueError("log_level must be the name of a log level")
+    if report_mode is not None and not isinstance(report_mode, str):
+        raise ValueError("report_mode must be the name of a report mode")
+    try:
+        return Scenario(
+            name=settings["name"],
+            trucks=settings["trucks"],
+            stations=settings["stations"],
+            duration=settings["duration"],
+            mode=mode,
+            time_scale=time_scale,
+            seed=settings["seed"],
+            replications=settings["replications"],
+            antithetic=bool(settings["antithetic"]),
+            travel_time=settings["travel_time"],
+            unloading_time=settings["unloading_time"],
+            shortest_mining_time=settings["shortest_mining_time"],
+            longest_mining_time=settings["longest_mining_time"],
+            report_mode=None if report_mode is None else ReportMode[report_mode.upper()],
+            log_level=LogLevel[settings["log_level"].upper()],
+        )
+    except KeyError as error:
+        raise ValueError(f"Unknown setting value: {error.args[0]}") from None
+
+
+def make_control_center(
+    scenario: Scenario, replication: int = 0, stream: Optional[TextIO] = None
+) -> MiningControlCenter:
+    """Make the control center of a replication of a scenario.
+    Time constants other than those of const.py make subclasses of the Helium-3 truck and unload station.
+
+    :param scenario: scenario to simulate
+    :param replication: index of the replication
+    :param stream: stream to print logs and reports; None for sys.stdout
+    :return: control center ready to run
+    """
+    truck_classes = {}
+    if (scenario.travel_time, scenario.shortest_mining_time, scenario.longest_mining_time) != (
+        H3MiningTruck.TRAVEL_TIME, H3MiningTruck.SHORTEST_MINING_TIME, H3MiningTruck.LONGEST_MINING_TIME
+    ):
+        truck_classes[MiningType.HELIUM_3] = type(H3MiningTruck.__name__, (H3MiningTruck,), {
+            "TRAVEL_TIME": scenario.travel_time,
+            "SHORTEST_MINING_TIME": scenario.shortest_mining_time,
+            "LONGEST_MINING_TIME": scenario.longest_mining_time,
+        })
+    station_classes = {}
+    if scenario.unloading_time != H3UnloadStation.UNLOADING_TIME:
+        station_classes[MiningType.HELIUM_3] = type(H3UnloadStation.__name__, (H3UnloadStation,), {
+            "UNLOADING_TIME": scenario.unloading_time,
+        })
+
+    report_mode = scenario.report_mode
+    if report_mode is None:
+        report_mode = ReportMode.FULL if scenario.trucks <= FULL_REPORT_MAX_TRUCKS else ReportMode.SUMMARY
+    return MiningControlCenter(
+        n=scenario.trucks,
+        m=scenario.stations,
+        # Unpaced modes do not wait in the real world time: the time scale only labels the log.
+        sim_time_unit=10 if scenario.time_scale == UNPACED else scenario.time_scale,
+        mode=scenario.mode,
+        logger=SimulationLogger(stream=stream, level=scenario.log_level),
+        seed=scenario.seed,
+        replication=replication,
+        antithetic=scenario.antithetic,
+        report_mode=report_mode,
+        truck_classes=truck_classes,
+        station_classes=station_classes,
+    )
+
+
+def run_scenario(scenario: Scenario, stream: Optional[TextIO] = None) -> List[Dict[str, Any]]:
+    """Run every replication of a scenario one after another, each with its own control center and logger.
+
+    :param scenario: scenario to simulate
+    :param stream: stream to print logs and reports; None for sys.stdout
+    :return: a result record per replication: the scenario name, time scale and wall time, then the run summary
+        (the expected statistics of the analytic model in analytic mode)
+    """
+    records = []
+    for replication in range(scenario.replications):
+        control_center = make_control_center(scenario=scenario, replication=replication, stream=stream)
+        started = time.perf_counter()
+        if scenario.mode == SimulationMode.VIRTUAL_TIME:
+            run_in_virtual_time(control_center.run(scenario.duration))
+        else:
+            asyncio.run(control_center.run(scenario.duration))
+        wall_time = time.perf_counter() - started
+
+        record = {"scenario": scenario.name, "time_scale": scenario.time_scale, "wall_time": wall_time}
+        if scenario.mode == SimulationMode.ANALYTIC:
+            record.update({
+                "mode": scenario.mode.name,
+                "trucks": scenario.trucks,
+                "unload_stations": scenario.stations,
+                **control_center.solve_analytic(),
+            })
+        else:
+            record.update(control_center.run_summary(duration=scenario.duration * 60))
+        records.append(record)
+    return records
+
+
+def run_scenarios(scenarios: Iterable[Scenario], stream: Optional[TextIO] = None) -> List[Dict[str, Any]]:
+    """Run scenarios one after another in this interpreter.
+
+    :param scenarios: scenarios to simulate
+    :param stream: stream to print logs and reports; None for sys.stdout
+    :return: result records of every replication of every scenario, in order
+    """
+    records = []
+    for scenario in scenarios:
+        records += run_scenario(scenario=scenario, stream=stream)
+    return records
+
+
+def write_results(path: str, records: List[Dict[str, Any]]) -> None:
+    """Write result records as CSV (.csv), a JSON array (.json) or JSON lines (.jsonl).
+    CSV columns are every key of the records in order of appearance; missing values are left empty.
+
+    :param path: path of the result file
+    :param records: result records (e.g., from run_scenarios)
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        fieldnames = list(dict.fromkeys(key for record in records for key in record))
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(records)
+    elif extension == ".json":
+        with open(path, "w") as file:
+            json.dump(records, file, indent=2)
+    elif extension == ".jsonl":
+        with open(path, "w") as file:
+            for record in records:
+                file.write(json.dumps(record) + "\n")
+    else:
+        raise ValueError(f"{path}: a result file must be .csv, .json or .jsonl")
@@ -0,0 +1,425 @@
+import argparse
+import math
+from array import array
+from statistics import NormalDist
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from const import SimulationMode
+from mining_control_center import MiningControlCenter
+from report_exporters import Column, TableExporter
+
+# Metrics which can be estimated to a precision
+METRICS = ("unloads_per_hour", "mean_wait_time", "unloading_utilization")
+
+# Number of observations averaged into each batch of MSER-5
+MSER_BATCH_SIZE = 5
+
+# Columns of the table of estimates
+ESTIMATE_COLUMNS = [
+    Column(key="metric", header="Metric"),
+    Column(key="mean", header="Mean", fmt=lambda value: f"{value:.4f}"),
+    Column(key="half_width", header="CI half-width", fmt=lambda value: f"{value:.4f}"),
+    Column(key="target", header="Target"),
+]
+
+
+class IntervalSeries:
+    """Totals of each interval of a run in typed arrays: unloads, wait time and unloading time.
+    Every series is additive, so intervals can be grouped into batches of any size afterwards.
+    """
+
+    def __init__(self):
+        self.unloads = array("q")
+        self.wait_time = array("q")
+        self.unloading_time = array("q")
+
+    def __len__(self) -> int:
+        return len(self.unloads)
+
+    def observe(self, control_center: MiningControlCenter, intervals: int, interval: int) -> None:
+        """Continue a simulation by more intervals with the discrete event engine, recording the totals of each.
+
+        :param control_center: control center simulated up to the end of the recorded intervals
+        :param intervals: number of intervals to simulate
+        :param interval: length of an interval in simulation hours
+        """
+        before = control_center.totals()
+        for index in range(len(self) + 1, len(self) + intervals + 1):
+            control_center.simulate(duration=index * interval)
+            after = control_center.totals()
+            self.unloads.append(after[0] - before[0])
+            self.wait_time.append(after[1] - before[1])
+            self.unloading_time.append(after[2] - before[2])
+            before = after
+
+
+class Estimate(NamedTuple):
+    """Point estimate of a metric and the half-width of its confidence interval."""
+
+    mean: float
+    half_width: float
+
+
+class PrecisionResult:
+    """Result of a run until the confidence intervals are tight enough."""
+
+    def __init__(
+        self, estimates: Dict[str, Estimate], warm_up: int, duration: int, observations: int, converged: bool
+    ):
+        """
+        :param estimates: metric -> estimate after the warm-up
+        :param warm_up: simulation hours truncated from the start as the warm-up transient
+        :param duration: simulation hours run (per replication with replications)
+        :param observations: number of batches (batch means) or replications the estimates are from
+        :param converged: whether every target was met before the limit
+        """
+        self.estimates = estimates
+        self.warm_up = warm_up
+        self.duration = duration
+        self.observations = observations
+        self.converged = converged
+
+
+def mser(values: Sequence[float], batch_size: int = MSER_BATCH_SIZE) -> int:
+    """Find the end of the warm-up transient by MSER-5 (Marginal Standard Error Rule).
+    Observations are averaged in batches of batch_size; the truncation is the number of batches d which minimizes
+        the variance of the mean of the remaining batches, SSE(d) / (k - d)^2, searched in the first half.
+
+    :param values: observations in time order
+    :param batch_size: number of observations per batch
+    :return: number of observations to truncate from the start
+    """
+    k = len(values) // batch_size
+    if k < 2:
+        return 0
+    means = np.asarray(values[:k * batch_size], dtype=float).reshape(k, batch_size).mean(axis=1)
+    # Sums of the last r batches for r = 1..k
+    sums = np.cumsum(means[::-1])
+    squares = np.cumsum(means[::-1] ** 2)
+    remaining = np.arange(k, k - k // 2 - 1, -1)
+    sse = squares[remaining - 1] - sums[remaining - 1] ** 2 / remaining
+    return int(np.argmin(sse / remaining ** 2)) * batch_size
+
+
+def student_t_quantile(p: float, dof: int) -> float:
+    """Quantile of Student's t distribution.
+    Exact up to 4 degrees of freedom, where the expansion is too far off (closed forms; Newton's method on the
+        exact distribution function for 3). From 5, from the normal quantile (Cornish-Fisher expansion), within 0.01
+        of the exact value for p up to 0.995.
+
+    :param p: probability
+    :param dof: degrees of freedom
+    :return: t such that P(T <= t) = p
+    """
+    if dof == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if dof == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    if dof == 4:
+        alpha = 4 * p * (1 - p)
+        q = math.cos(math.acos(math.sqrt(alpha)) / 3) / math.sqrt(alpha)
+        return math.copysign(2 * math.sqrt(q - 1), p - 0.5)
+
+    z = NormalDist().inv_cdf(p)
+    terms = [
+        (z ** 3 + z) / 4,
+        (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96,
+        (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384,
+        (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / 92160,
+    ]
+    t = z + sum(term / dof ** (power + 1) for power, term in enumerate(terms))
+    if dof == 3:
+        for _ in range(4):
+            cdf = 0.5 + (t / math.sqrt(3) / (1 + t * t / 3) + math.atan(t / math.sqrt(3))) / math.pi
+            pdf = 6 * math.sqrt(3) / (math.pi * (3 + t * t) ** 2)
+            t -= (cdf - p) / pdf
+    return t
+
+
+def estimate(values: Sequence[float], confidence: float) -> Estimate:
+    """Estimate the mean of independent observations with a Student's t confidence interval.
+
+    :param values: observations
+    :param confidence: confidence level; e.g., 0.95
+    :return: mean and half-width; an infinite half-width with fewer than 2 observations or with a missing value
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) < 2 or np.isnan(values).any():
+        return Estimate(mean=float(values.mean()) if len(values) else math.nan, half_width=math.inf)
+    t = student_t_quantile(0.5 + confidence / 2, dof=len(values) - 1)
+    return Estimate(mean=float(values.mean()), half_width=t * float(values.std(ddof=1)) / math.sqrt(len(values)))
+
+
+def _metrics(unloads: int, wait_time: int, unloading_time: int, hours: int, m: int) -> Dict[str, float]:
+    """Metrics of a window of a run from its totals.
+
+    :param unloads: unloads completed in the window
+    :param wait_time: wait time of the unloads in simulation minutes
+    :param unloading_time: unloading time of the unload stations in simulation minutes
+    :param hours: length of the window in simulation hours
+    :param m: number of unload stations
+    :return: metric -> value; the mean wait time of a window without unloads is NaN
+    """
+    return {
+        "unloads_per_hour": unloads / hours,
+        "mean_wait_time": wait_time / unloads if unloads else math.nan,
+        "unloading_utilization": unloading_time / (hours * 60 * m),
+    }
+
+
+def _warm_up(unloads: Sequence[float], wait_time: Sequence[float], unloading_time: Sequence[float]) -> int:
+    """Truncation point of the series of a run: the latest end of the warm-up of any series."""
+    return max(mser(unloads), mser(wait_time), mser(unloading_time))
+
+
+def _met(estimates: Dict[str, Estimate], targets: Dict[str, float], relative: bool) -> bool:
+    """Whether the half-width of every target metric is at most its target (times the mean if relative)."""
+    return all(
+        estimates[metric].half_width <= target * (abs(estimates[metric].mean) if relative else 1)
+        for metric, target in targets.items()
+    )
+
+
+def _validate_targets(targets: Dict[str, float]) -> None:
+    unknown = set(targets) - set(METRICS)
+    if unknown or not targets:
+        raise ValueError(f"targets must be half-widths of some of {', '.join(METRICS)}")
+
+
+def batch_means(
+    series: IntervalSeries, m: int, interval: int, batches: int, confidence: float = 0.95
+) -> PrecisionResult:
+    """Estimate the metrics of a single run by the method of batch means, after truncating the warm-up by MSER-5.
+    The intervals after the warm-up are grouped into `batches` batches of equal length (the oldest remainder is
+        dropped); long enough batches are nearly independent, so their values give a confidence interval.
+
+    :param series: totals of each interval of the run
+    :param m: number of unload stations
+    :param interval: length of an interval in simulation hours
+    :param batches: number of batches
+    :param confidence: confidence level
+    :return: estimates; not converged (see run_batch_means)
+    """
+    warm_up = _warm_up(series.unloads, series.wait_time, series.unloading_time)
+    size = (len(series) - warm_up) // batches
+    values: Dict[str, List[float]] = {metric: [] for metric in METRICS}
+    if size > 0:
+        start = len(series) - size * batches
+        for begin in range(start, len(series), size):
+            window = slice(begin, begin + size)
+            batch = _metrics(
+                unloads=sum(series.unloads[window]),
+                wait_time=sum(series.wait_time[window]),
+                unloading_time=sum(series.unloading_time[window]),
+                hours=size * interval,
+                m=m,
+            )
+            for metric, value in batch.items():
+                values[metric].append(value)
+    return PrecisionResult(
+        estimates={metric: estimate(values[metric], confidence=confidence) for metric in METRICS},
+        warm_up=warm_up * interval,
+        duration=len(series) * interval,
+        observations=batches if size > 0 else 0,
+        converged=False,
+    )
+
+
+def run_batch_means(
+    n: int,
+    m: int,
+    targets: Dict[str, float],
+    seed: Optional[int] = None,
+    interval: int = 1,
+    batches: int = 20,
+    max_duration: int = 720,
+    relative: bool = False,
+    confidence: float = 0.95,
+    **kwargs: Any,
+) -> PrecisionResult:
+    """Run a single simulation until the confidence intervals of batch means are tight enough.
+    The run starts with 2 intervals per batch and continues by one interval per batch at a time;
+        the warm-up is truncated again each time, so the estimates never include the empty-fleet start.
+
+    :param n: number of mining trucks
+    :param m: number of unload stations
+    :param targets: metric -> largest half-width of its confidence interval; e.g., {"mean_wait_time": 0.5}
+    :param seed: master seed; None for the random module
+    :param interval: length of an interval in simulation hours
+    :param batches: number of batches
+    :param max_duration: simulation hours to stop at even if the targets are not met
+    :param relative: targets are fractions of the mean (e.g., 0.05 for ±5%) instead of absolute half-widths
+    :param confidence: confidence level
+    :param kwargs: other arguments of MiningControlCenter (e.g., replication, site_map)
+    :return: estimates at the stop
+    """
+    _validate_targets(targets)
+    if interval <= 0 or batches < 2:
+        raise ValueError("interval must be positive and batches must be at least 2")
+    control_center = MiningControlCenter(
+        n=n, m=m, sim_time_unit=1, mode=SimulationMode.DISCRETE_EVENT, seed=seed, **kwargs
+    )
+    series = IntervalSeries()
+    series.observe(control_center, intervals=2 * batches, interval=interval)
+    while True:
+        result = batch_means(series, m=m, interval=interval, batches=batches, confidence=confidence)
+        result.converged = _met(result.estimates, targets=targets, relative=relative)
+        if result.converged or (len(series) + batches) * interval > max_duration:
+            return result
+        series.observe(control_center, intervals=batches, interval=interval)
+
+
+def run_replications(
+    n: int,
+    m: int,
+    targets: Dict[str, float],
+    duration: int = 72,
+    seed: int = 0,
+    interval: int = 1,
+    min_replications: int = 5,
+    max_replications: int = 100,
+    relative: bool = False,
+    confidence: float = 0.95,
+    antithetic: bool = False,
+    **kwargs: Any,
+) -> PrecisionResult:
+    """Run independent replications until the confidence intervals of their means are tight enough.
+    The warm-up is found by MSER-5 on the series averaged across replications, and truncated from every one.
+
+    :param n: number of mining trucks
+    :param m: number of unload stations
+    :param targets: metric -> largest half-width of its confidence interval; e.g., {"mean_wait_time": 0.5}
+    :param duration: test duration of each replication in simulation hours
+    :param seed: master seed; replication r mines from the substreams of replication r of the seed
+    :param interval: length of an interval in simulation hours
+    :param min_replications: number of replications to run before the first check
+    :param max_replications: number of replications to stop at even if the targets are not met
+    :param relative: targets are fractions of the mean (e.g., 0.05 for ±5%) instead of absolute half-widths
+    :param confidence: confidence level
+    :param antithetic: run antithetic pairs (2k, 2k + 1); the confidence interval is from the means of pairs.
+        min_replications and max_replications are rounded up to whole pairs
+    :param kwargs: other arguments of MiningControlCenter (e.g., site_map)
+    :return: estimates at the stop
+    """
+    _validate_targets(targets)
+    if interval <= 0 or duration < interval or not 2 <= min_replications <= max_replications:
+        raise ValueError(
+            "interval must be positive and at most duration, and 2 <= min_replications <= max_replications"
+        )
+    runs: List[IntervalSeries] = []
+    while True:
+        control_center = MiningControlCenter(
+            n=n, m=m, sim_time_unit=1, mode=SimulationMode.DISCRETE_EVENT, seed=seed, replication=len(runs),
+            antithetic=antithetic, **kwargs,
+        )
+        series = IntervalSeries()
+        series.observe(control_center, intervals=duration // interval, interval=interval)
+        runs.append(series)
+        if len(runs) < min_replications or antithetic and len(runs) % 2:
+            continue
+
+        warm_up = _warm_up(
+            *(np.mean([getattr(run, name) for run in runs], axis=0)
+              for name in ("unloads", "wait_time", "unloading_time"))
+        )
+        hours = (len(series) - warm_up) * interval
+        values: Dict[str, List[float]] = {metric: [] for metric in METRICS}
+        for run in runs:
+            replication = _metrics(
+                unloads=sum(run.unloads[warm_up:]),
+                wait_time=sum(run.wait_time[warm_up:]),
+                unloading_time=sum(run.unloading_time[warm_up:]),
+                hours=hours,
+                m=m,
+            )
+            for metric, value in replication.items():
+                values[metric].append(value)
+        if antithetic:
+            # Antithetic pairs are not independent: the confidence interval is from the means of pairs
+            values = {
+                metric: [(even + odd) / 2 for even, odd in zip(items[::2], items[1::2])]
+                for metric, items in values.items()
+            }
+        estimates = {metric: estimate(values[metric], confidence=confidence) for metric in METRICS}
+        converged = _met(estimates, targets=targets, relative=relative)
+        if converged or len(runs) >= max_replications:
+            return PrecisionResult(
+                estimates=estimates,
+                warm_up=warm_up * interval,
+                duration=len(series) * interval,
+                observations=len(runs),
+                converged=converged,
+            )
+
+
+def format_result(result: PrecisionResult, targets: Dict[str, float]) -> List[str]:
+    """Format the estimates of a result as table lines.
+
+    :param result: result to format
+    :param targets: targets of the run
+    :return: lines of the table
+    """
+    exporter = TableExporter()
+    exporter.begin_table(name="estimates", columns=ESTIMATE_COLUMNS)
+    for metric, item in result.estimates.items():
+        exporter.write_row([metric, item.mean, item.half_width, targets.get(metric)])
+    exporter.end_table()
+    return exporter.lines
+
+
+def parse_target(value: str) -> Tuple[str, float]:
+    """Parse a target of the command line: "<metric>=<half-width>"."""
+    metric, _, half_width = value.partition("=")
+    if metric not in METRICS:
+        raise argparse.ArgumentTypeError(f"metric must be one of {', '.join(METRICS)}")
+    try:
+        return metric, float(half_width)
+    except ValueError:
+        raise argparse.ArgumentTypeError("must be <metric>=<half-width>") from None
+
+
+if __name__ == "__main__":
+    """Run until the confidence intervals are tight enough. e.g.,
+    python sequential_stopping.py --trucks 100 --stations 4 --target mean_wait_time=0.5 --target unloads_per_hour=0.5
+    python sequential_stopping.py --trucks 100 --stations 4 --method replications --relative \
+        --target mean_wait_time=0.05
+    """
+    parser = argparse.ArgumentParser(description="Sequential stopping on confidence interval half-widths")
+    parser.add_argument("--trucks", type=int, required=True, help="number of mining trucks")
+    parser.add_argument("--stations", type=int, required=True, help="number of unload stations")
+    parser.add_argument(
+        "--target", type=parse_target, action="append", required=True,
+        help="<metric>=<largest half-width>; metrics: " + ", ".join(METRICS),
+    )
+    parser.add_argument("--method", choices=["batch_means", "replications"], default="batch_means")
+    parser.add_argument("--relative", action="store_true", help="targets are fractions of the mean")
+    parser.add_argument("--confidence", type=float, default=0.95, help="confidence level")
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument("--interval", type=int, default=1, help="length of an interval in simulation hours")
+    parser.add_argument("--batches", type=int, default=20, help="number of batches (batch means)")
+    parser.add_argument("--max-duration", type=int, default=720, help="longest run in simulation hours (batch means)")
+    parser.add_argument("--duration", type=int, default=72, help="duration of each replication in simulation hours")
+    parser.add_argument("--max-replications", type=int, default=100, help="most replications (replications)")
+    args = parser.parse_args()
+
+    targets = dict(args.target)
+    if args.method == "batch_means":
+        precision = run_batch_means(
+            n=args.trucks, m=args.stations, targets=targets, seed=args.seed, interval=args.interval,
+            batches=args.batches, max_duration=args.max_duration, relative=args.relative, confidence=args.confidence,
+        )
+        observations = f"{precision.observations} batches of a {precision.duration}-hour run"
+    else:
+        precision = run_replications(
+            n=args.trucks, m=args.stations, targets=targets, duration=args.duration, seed=args.seed,
+            interval=args.interval, max_replications=args.max_replications, relative=args.relative,
+            confidence=args.confidence,
+        )
+        observations = f"{precision.observations} replications of {precision.duration} hours"
+    print("\n".join(format_result(precision, targets=targets)))
+    print(
+        f"{'Converged' if precision.converged else 'Stopped at the limit'}: {observations}, "
+        f"warm-up of {precision.warm_up} hours truncated."
+    )
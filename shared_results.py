@@ -0,0 +1,272 @@
+import argparse
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from const import UNLOADING_TIME_FOR_H3_UNLOAD_STATION
+from fleet_store import FleetEngine
+from monte_carlo_engine import MonteCarloResult
+from streaming_stats import DistributionStats
+
+# Distributions merged across replications
+DISTRIBUTIONS = ("wait_time", "cycle_time", "response_time", "queue_length")
+
+# (name of the shared memory block, replications, trucks, unload stations): all a worker needs to attach
+Handle = Tuple[str, int, int, int]
+
+
+class SharedFleetResults:
+    """Per-truck and per-unload-station totals of R replications in one block of shared memory.
+    The parent creates the block; each worker attaches to it by name and writes the rows of its replication in place,
+        so only a few mergeable distributions go back through pickling instead of a report per truck.
+    Every total is a contiguous int64 array of [replication, truck] or [replication, unload station]:
+        the parent reads them as NumPy views of the block without copying.
+    Views are valid until close(); copy them (np.array) to keep them longer.
+    """
+
+    # Per-truck totals, in the order of the block
+    TRUCK_FIELDS = ("total_mining", "total_mining_time", "total_wait_time")
+
+    def __init__(
+        self, replications: int, n: int, m: int, name: Optional[str] = None, antithetic: bool = False
+    ):
+        """
+        :param replications: number of replications
+        :param n: number of mining trucks
+        :param m: number of unload stations
+        :param name: name of the block to attach to (see handle); None to create a new block
+        :param antithetic: whether replications are antithetic pairs (2k, 2k + 1); replications must be even
+        """
+        if replications <= 0 or n <= 0 or m <= 0:
+            raise ValueError("replications, n and m must be positive integers")
+        if antithetic and replications % 2:
+            raise ValueError("Antithetic replications come in pairs: replications must be even")
+        self.replications = replications
+        self.n = n
+        self.m = m
+        self.antithetic = antithetic
+        # Trucks, unload stations, the longest queue and whether each replication is written
+        size = replications * (len(self.TRUCK_FIELDS) * n + m + 2)
+        self._owner = name is None
+        if self._owner:
+            self._memory = SharedMemory(create=True, size=8 * size)
+        else:
+            # Pool workers share the resource tracker of the parent: the block stays registered once, by the creator.
+            self._memory = SharedMemory(name=name)
+        block = np.ndarray((size,), dtype=np.int64, buffer=self._memory.buf)
+        if self._owner:
+            block[:] = 0
+
+        offset = 0
+        for field in self.TRUCK_FIELDS:
+            setattr(self, field, block[offset:offset + replications * n].reshape(replications, n))
+            offset += replications * n
+        self.station_total_unloads = block[offset:offset + replications * m].reshape(replications, m)
+        offset += replications * m
+        self.max_queue_length = block[offset:offset + replications]
+        self.written = block[offset + replications:]
+
+        # Distributions merged across replications and errors of failed replications, by the parent;
+        # see run_parallel_replications
+        self.distributions: Dict[str, DistributionStats] = {}
+        self.errors: Dict[int, Exception] = {}
+
+    @property
+    def handle(self) -> Handle:
+        """Picklable handle for workers to attach to the block."""
+        return self._memory.name, self.replications, self.n, self.m
+
+    @classmethod
+    def attach(cls, handle: Handle) -> "SharedFleetResults":
+        """Attach to a block created by another process.
+
+        :param handle: handle of the block
+        :return: results backed by the same shared memory
+        """
+        name, replications, n, m = handle
+        return cls(replications=replications, n=n, m=m, name=name)
+
+    def write(self, replication: int, engine: FleetEngine) -> None:
+        """Write the totals of a finished replication into its rows.
+
+        :param replication: index of the row
+        :param engine: engine which simulated the replication
+        """
+        for field in self.TRUCK_FIELDS:
+            getattr(self, field)[replication] = np.asarray(getattr(engine.trucks, field))
+        self.station_total_unloads[replication] = np.asarray(engine.station_total_unloads)
+        queue_length = engine.queue_length_stats
+        self.max_queue_length[replication] = queue_length.stats.max if queue_length.count else 0
+        self.written[replication] = 1
+
+    @property
+    def missing(self) -> np.ndarray:
+        """Indexes of the replications whose rows have not been written (e.g., their workers failed)."""
+        return np.flatnonzero(self.written == 0)
+
+    def result(self, duration: int, unloading_time: int = UNLOADING_TIME_FOR_H3_UNLOAD_STATION) -> MonteCarloResult:
+        """Get the totals of the written replications as a MonteCarloResult (e.g., for summary()).
+        Truck arrays are views of the block if every replication is written; see missing for the others.
+        Antithetic pairs are kept whole: a written replication whose pair is missing is left out too.
+
+        :param duration: test duration in simulation minutes
+        :param unloading_time: unloading time of a truck in simulation minutes
+        :return: per-replication totals of the written replications
+        """
+        written = self.written.astype(bool)
+        if self.antithetic:
+            written = written.reshape(-1, 2).all(axis=1).repeat(2)
+        if not written.any():
+            raise ValueError("No replication has been written")
+        rows = slice(None) if written.all() else written
+        return MonteCarloResult(
+            duration=duration,
+            truck_total_mining=self.total_mining[rows],
+            truck_total_mining_time=self.total_mining_time[rows],
+            truck_total_wait_time=self.total_wait_time[rows],
+            station_total_unloads=self.station_total_unloads[rows],
+            unloading_time=unloading_time,
+            max_queue_length=self.max_queue_length[rows],
+            antithetic=self.antithetic,
+        )
+
+    def close(self) -> None:
+        """Release the views and detach from the block; the creator also frees it."""
+        for field in self.TRUCK_FIELDS + ("station_total_unloads", "max_queue_length", "written"):
+            setattr(self, field, None)
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    def __enter__(self) -> "SharedFleetResults":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def run_replication(handle: Handle, replication: int, duration: int, **kwargs: Any) -> Dict[str, DistributionStats]:
+    """Run a replication in a worker process and write its totals into the shared block.
+
+    :param handle: handle of the shared block
+    :param replication: index of the replication (and of its rows)
+    :param duration: test duration in simulation hours
+    :param kwargs: other arguments of FleetEngine (e.g., seed, antithetic)
+    :return: distributions of the replication, to merge
+    """
+    results = SharedFleetResults.attach(handle)
+    try:
+        engine = FleetEngine(n=results.n, m=results.m, replication=replication, **kwargs)
+        engine.simulate(duration=duration)
+        results.write(replication=replication, engine=engine)
+    finally:
+        results.close()
+    return {name: getattr(engine, f"{name}_stats") for name in DISTRIBUTIONS}
+
+
+def run_parallel_replications(
+    n: int,
+    m: int,
+    replications: int,
+    duration: int = 72,
+    seed: int = 0,
+    max_workers: Optional[int] = None,
+    antithetic: bool = False,
+    **kwargs: Any,
+) -> SharedFleetResults:
+    """Run replications across processes; workers write per-truck and per-station totals into shared memory.
+    Distributions of wait time, cycle time, response time and queue length are merged as workers finish.
+    A failed replication does not stop the others: it is in missing, and its error in errors.
+
+    :param n: number of mining trucks
+    :param m: number of unload stations
+    :param replications: number of replications
+    :param duration: test duration in simulation hours
+    :param seed: master seed; replication r mines from the substreams of replication r of the seed
+    :param max_workers: number of worker processes; None for the number of CPUs
+    :param antithetic: run antithetic pairs (2k, 2k + 1); replications must be even
+    :param kwargs: other arguments of FleetEngine (e.g., unloading_time)
+    :return: shared results; close() them when done (or use them as a context manager)
+    """
+    results = SharedFleetResults(replications=replications, n=n, m=m, antithetic=antithetic)
+    try:
+        distributions = {name: DistributionStats() for name in DISTRIBUTIONS}
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    run_replication, results.handle, replication=replication, duration=duration, seed=seed,
+                    antithetic=antithetic, **kwargs
+                ): replication
+                for replication in range(replications)
+            }
+            for future in as_completed(futures):
+                try:
+                    replication_distributions = future.result()
+                except Exception as error:
+                    results.errors[futures[future]] = error
+                    continue
+                for name, stats in replication_distributions.items():
+                    distributions[name].merge(stats)
+    except BaseException:
+        results.close()
+        raise
+    results.distributions = distributions
+    return results
+
+
+def _run_with_reports(n: int, m: int, replication: int, duration: int, seed: int) -> Dict[str, Any]:
+    """Run a replication and return a report per truck and unload station; the pickling baseline."""
+    engine = FleetEngine(n=n, m=m, seed=seed, replication=replication)
+    engine.simulate(duration=duration)
+    return {
+        "trucks": dict(engine.truck_reports()),
+        "stations": list(engine.station_total_unloads),
+        "wait_time": engine.wait_time_stats,
+    }
+
+
+if __name__ == "__main__":
+    """Parallel replications through shared memory vs. reports returned by workers. e.g.,
+    python shared_results.py --trucks 20000 --stations 400 --replications 16 --duration 6
+    """
+    parser = argparse.ArgumentParser(description="Shared memory aggregation of parallel replications")
+    parser.add_argument("--trucks", type=int, default=20000, help="number of mining trucks")
+    parser.add_argument("--stations", type=int, default=400, help="number of unload stations")
+    parser.add_argument("--replications", type=int, default=16, help="number of replications")
+    parser.add_argument("--duration", type=int, default=6, help="test duration in simulation hours")
+    parser.add_argument("--seed", type=int, default=0, help="master seed")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with run_parallel_replications(
+        n=args.trucks, m=args.stations, replications=args.replications, duration=args.duration, seed=args.seed,
+        max_workers=args.workers,
+    ) as shared:
+        for replication, error in sorted(shared.errors.items()):
+            print(f"Replication {replication} failed: {error!r}")
+        summary = shared.result(duration=args.duration * 60).summary()
+        p95 = shared.distributions["wait_time"].quantile(0.95)
+        shared_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    returned_bytes = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        reports = [
+            pool.submit(_run_with_reports, args.trucks, args.stations, replication, args.duration, args.seed)
+            for replication in range(args.replications)
+        ]
+        for report in as_completed(reports):
+            returned_bytes += len(pickle.dumps(report.result()))
+    reports_seconds = time.perf_counter() - started
+
+    for name, metric in summary.items():
+        print(f"{name}: {metric['mean']:.3f} ± {metric['ci95']:.3f}")
+    print(f"P95 wait time (all replications): {p95:.1f} min")
+    print(f"Shared memory: {shared_seconds:.2f} s")
+    print(f"Reports:       {reports_seconds:.2f} s ({returned_bytes / 2 ** 20:.1f} MiB pickled back)")
@@ -1,75 +1,261 @@
+import sys
 import threading
 import time
-from queue import Queue
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, TextIO
 
+from const import LogCategory, LogLevel, OverflowPolicy, TraceEvent
 from time_converter import convert_unix_time_to_sim_timestamp
 
+if TYPE_CHECKING:
+    from event_trace import TraceWriter
+
 
 class SimulationLogger:
-    """Logger class for Simulation."""
+    """Logger class for Simulation.
+    Each MiningControlCenter owns its logger, and passes it to its trucks and unload stations.
+    So simulations in the same process do not mix their logs and timestamps.
+    Messages below the level or of disabled categories are dropped before formatting, locking or queueing.
+    Formatting enabled messages is deferred to the thread which prints logs.
+    Messages are buffered in a bounded buffer; the thread drains it in batches and writes a batch at once.
+    When the buffer is full, the overflow policy decides whether to wait or to drop messages.
+    """
 
-    # SimulationLogger has to print a log at a time: use threading.Lock()
-    _lock = threading.Lock()
-    _log_queue = Queue()
+    # Process-wide instance: only for backward compatibility. Use a logger per simulation instead.
     _instance = None
-    thread = None
     _instance_lock = threading.Lock()
-    _start_time_in_unix_tic = 0
-    _sim_time_unit = 0
 
-    def __init__(self):
-        self._instance = self
+    # Seconds between checks that the thread which prints logs is still running, while BLOCK waits for room
+    BLOCK_POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        stream: Optional[TextIO] = None,
+        level: LogLevel = LogLevel.DEBUG,
+        categories: Optional[Iterable[LogCategory]] = None,
+        trace: Optional["TraceWriter"] = None,
+        max_buffered: int = 65536,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        sample_every: int = 10,
+    ):
+        """
+        :param stream: stream to print logs; None for sys.stdout
+        :param level: minimum level of messages to log
+        :param categories: categories of messages to log; None for all categories
+        :param trace: writer of the binary event trace; None not to trace events
+        :param max_buffered: maximum number of messages in the buffer
+        :param overflow_policy: what to do when the buffer is full
+        :param sample_every: with OverflowPolicy.SAMPLE, keep one of every sample_every overflowing messages
+        """
+        if max_buffered <= 0:
+            raise ValueError("max_buffered must be positive integer")
+        if sample_every <= 0:
+            raise ValueError("sample_every must be positive integer")
+        # The buffer is shared with the thread which prints logs: guard it with threading.Lock()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._log_buffer = deque()
+        self._max_buffered = max_buffered
+        self._overflow_policy = overflow_policy
+        self._sample_every = sample_every
+        self._overflowed = 0
+        # Number of messages dropped because the buffer was full
+        self.dropped = 0
+        self.thread = None
+        self._stream = stream
+        self._start_time_in_unix_tic = 0
+        self._sim_time_unit = 0
+        self._clock = time.time
+        self.trace = trace
+        self.set_level(level=level, categories=categories)
+
+    def set_level(self, level: LogLevel, categories: Optional[Iterable[LogCategory]] = None) -> None:
+        """Set the minimum level and categories of messages to log.
+
+        :param level: minimum level of messages to log
+        :param categories: categories of messages to log; None for all categories
+        """
+        self._level = level
+        self._categories = frozenset(LogCategory if categories is None else categories)
+
+    def is_enabled(self, category: LogCategory, level: LogLevel = LogLevel.DEBUG) -> bool:
+        """Check whether messages of the category and the level are logged.
+
+        :param category: category of messages
+        :param level: level of messages
+        :return: True if logged
+        """
+        return level >= self._level and category in self._categories
 
-    def reset(self, start_time_in_unix_timestamp: float, sim_time_unit: int) -> None:
+    def reset(
+        self,
+        start_time_in_unix_timestamp: float,
+        sim_time_unit: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         """Reset the simulation starting time.
 
-        :param start_time_in_unix_timestamp: starting time in unix timestamp
+        :param start_time_in_unix_timestamp: starting time in unix timestamp; or in the time of the clock
         :param sim_time_unit: simulation time unit
+        :param clock: function to get the current time in seconds for timestamps (e.g., loop.time of a virtual clock)
         """
         self._start_time_in_unix_tic = start_time_in_unix_timestamp
         self._sim_time_unit = sim_time_unit
-        if self.thread is None:
+        self._clock = clock
+        with self._lock:
+            if self.thread is not None:
+                # Count the dropped messages of each simulation: messages logged before the first reset belong to it
+                self._overflowed = 0
+                self.dropped = 0
+        # Start a new thread if this logger has not started yet, or the previous simulation has finished.
+        if self.thread is None or not self.thread.is_alive():
             self.thread = threading.Thread(target=self._print_log, daemon=True)
             self.thread.start()
 
     @classmethod
     def get_instance(cls) -> "SimulationLogger":
-        """Use singleton instance for this class."""
+        """Use singleton instance for this class. Kept for backward compatibility."""
         with cls._instance_lock:
             if cls._instance is None:
                 cls._instance = SimulationLogger()
         return cls._instance
 
-    def log(self, message: str|None, log_with_timestamp: bool = True) -> None:
-        """Store message in log queue.
+    def log(
+        self,
+        message: str|None,
+        log_with_timestamp: bool = True,
+        category: LogCategory = LogCategory.SUMMARY,
+        level: LogLevel = LogLevel.INFO,
+    ) -> None:
+        """Store message in log buffer.
 
         :param message: message to log; None to notify the end of the queue.
         :param log_with_timestamp: whether to log message with timestamp.
+        :param category: category of the message
+        :param level: level of the message
+        """
+        if message is not None and (level < self._level or category not in self._categories):
+            return
+        self._put((self._clock() if log_with_timestamp else None, message, ()))
+
+    def log_event(self, category: LogCategory, template: str, *args: Any, level: LogLevel = LogLevel.DEBUG) -> None:
+        """Store an event message in log buffer; for the hot path of trucks and unload stations.
+        The message is formatted by the thread which prints logs: template.format(*args)
+
+        :param category: category of the message
+        :param template: message template with {} for each argument
+        :param args: arguments of the template
+        :param level: level of the message
+        """
+        if level < self._level or category not in self._categories:
+            return
+        self._put((self._clock(), template, args))
+
+    def _put(self, item: tuple) -> None:
+        """Store an item in log buffer; apply the overflow policy if the buffer is full.
+        The end notification is always stored, so the thread which prints logs always stops.
+        BLOCK waits only while the thread which prints logs is running: without it (e.g., before reset, or after
+            the end notification), nobody would ever make room, so the oldest message is dropped instead.
+
+        :param item: (timestamp or None, message or template, arguments of the template)
         """
-        # Stores message to _log_queue
         with self._lock:
-            self._log_queue.put(
-                (
-                    time.time() if log_with_timestamp else 0,
-                    message
-                )
-            )
+            if len(self._log_buffer) >= self._max_buffered and item[1] is not None:
+                if self._overflow_policy == OverflowPolicy.BLOCK:
+                    # Wake up from time to time to notice the thread finishing while waiting
+                    while len(self._log_buffer) >= self._max_buffered and self._is_printing():
+                        self._not_full.wait(timeout=self.BLOCK_POLL_INTERVAL)
+                if len(self._log_buffer) >= self._max_buffered:
+                    self._overflowed += 1
+                    self.dropped += 1
+                    sampled_out = (
+                        self._overflow_policy == OverflowPolicy.SAMPLE
+                        and self._overflowed % self._sample_every
+                    )
+                    if sampled_out or self._log_buffer[0][1] is None:
+                        # Drop the new message; never drop a pending end notification
+                        return
+                    # Drop the oldest message to keep the new one
+                    self._log_buffer.popleft()
+            self._log_buffer.append(item)
+            self._not_empty.notify()
+
+    def _is_printing(self) -> bool:
+        """Check whether the thread which prints logs is running.
+
+        :return: True if the thread is running
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    def trace_fleet(self, trucks: int, stations: int) -> None:
+        """Write the fleet size into the header of the binary event trace, if there is a trace.
+
+        :param trucks: number of mining trucks
+        :param stations: number of unload stations
+        """
+        if self.trace is not None:
+            self.trace.set_fleet(trucks=trucks, stations=stations)
+
+    def trace_event(
+        self,
+        event: TraceEvent,
+        truck_id: int = -1,
+        station_id: int = -1,
+        duration: float = 0,
+        sim_time: Optional[float] = None,
+    ) -> None:
+        """Write an event record to the binary event trace, if there is a trace.
+
+        :param event: event type
+        :param truck_id: id of the truck; -1 if not related
+        :param station_id: id of the unload station; -1 if not related
+        :param duration: duration of the event in simulation minutes
+        :param sim_time: simulation time in minutes; None to get it from the clock of the logger
+        """
+        if self.trace is None:
+            return
+        if sim_time is None:
+            sim_time = (self._clock() - self._start_time_in_unix_tic) * self._sim_time_unit
+        self.trace.write(sim_time, event, truck_id, station_id, duration)
 
     def _print_log(self):
-        """Print log message one at a time."""
-        while True:
-            # Print logs in _log_queue. One at a time.
-            # Wait until there is any message to pint
-            msg = self._log_queue.get()
-            if msg[1] is None:
-                # If end notification is shown, stop the thread
-                break
-            if msg[0] > 0:
-                sim_timestamp = convert_unix_time_to_sim_timestamp(
-                    unix_time_start=self._start_time_in_unix_tic,
-                    curr_unix_time=msg[0],
-                    sim_time_unit=self._sim_time_unit,
-                )
-                print(f"[{sim_timestamp}] {msg[1]}")
-            else:
-                print(msg[1])
+        """Print log messages in batches: take every buffered message, and write them at once."""
+        stream = self._stream if self._stream is not None else sys.stdout
+        finished = False
+        while not finished:
+            # Wait until there is any message to print, then take the whole buffer
+            with self._lock:
+                while not self._log_buffer:
+                    self._not_empty.wait()
+                batch = self._log_buffer
+                self._log_buffer = deque()
+                self._not_full.notify_all()
+
+            lines = []
+            while batch:
+                timestamp, message, args = batch.popleft()
+                if message is None:
+                    # If end notification is shown, stop the thread after printing this batch.
+                    # Messages after it are for the next simulation: put them back for the next thread.
+                    finished = True
+                    with self._lock:
+                        batch.extend(self._log_buffer)
+                        self._log_buffer = batch
+                    break
+                if args:
+                    message = message.format(*args)
+                if timestamp is not None:
+                    sim_timestamp = convert_unix_time_to_sim_timestamp(
+                        unix_time_start=self._start_time_in_unix_tic,
+                        curr_unix_time=timestamp,
+                        sim_time_unit=self._sim_time_unit,
+                    )
+                    lines.append(f"[{sim_timestamp}] {message}\n")
+                else:
+                    lines.append(f"{message}\n")
+            if finished and self.dropped:
+                lines.append(f"{self.dropped} log messages were dropped because the log buffer was full.\n")
+            if lines:
+                stream.write("".join(lines))
+                stream.flush()
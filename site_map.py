@@ -0,0 +1,242 @@
+import math
+from typing import List, Optional, Sequence, Tuple
+
+from const import DispatchRule
+
+
+class SiteMap:
+    """Geography of the mine: travel times between mining sites and unload stations.
+    Each truck mines at its own mining site; when it leaves the site, the control center chooses an unload station,
+        and the truck travels there and back to its site.
+    """
+
+    def __init__(self, travel_times: Sequence[Sequence[int]]):
+        """
+        :param travel_times: travel time in simulation minutes from each mining site (row) to each unload station
+        """
+        if not travel_times or not travel_times[0]:
+            raise ValueError("travel_times must have at least one mining site and one unload station")
+        if any(len(row) != len(travel_times[0]) for row in travel_times):
+            raise ValueError("travel_times must have a travel time to every unload station from every mining site")
+        if any(travel_time <= 0 for row in travel_times for travel_time in row):
+            raise ValueError("travel times must be positive")
+
+        self.travel_times = [list(row) for row in travel_times]
+        self.n_sites = len(self.travel_times)
+        self.n_stations = len(self.travel_times[0])
+        # Unload stations of each mining site from the nearest one
+        self._stations_by_travel_time = [
+            sorted(range(self.n_stations), key=lambda station, row=row: (row[station], station))
+            for row in self.travel_times
+        ]
+
+    @classmethod
+    def from_coordinates(
+        cls,
+        sites: Sequence[Tuple[float, float]],
+        stations: Sequence[Tuple[float, float]],
+        speed: float = 1.0,
+    ) -> "SiteMap":
+        """Create a site map from coordinates: travel in a straight line at a constant speed.
+
+        :param sites: (x, y) of each mining site
+        :param stations: (x, y) of each unload station
+        :param speed: distance per simulation minute
+        :return: site map with travel times rounded up to whole minutes (at least 1 minute)
+        """
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        return cls(
+            [
+                [max(1, math.ceil(math.dist(site, station) / speed)) for station in stations]
+                for site in sites
+            ]
+        )
+
+    def travel_time(self, site: int, station: int) -> int:
+        """Get the travel time between a mining site and an unload station.
+
+        :param site: index of the mining site
+        :param station: index of the unload station
+        :return: travel time in simulation minutes
+        """
+        return self.travel_times[site][station]
+
+    def stations_by_travel_time(self, site: int) -> List[int]:
+        """Get unload stations from the nearest one to the mining site.
+
+        :param site: index of the mining site
+        :return: indexes of unload stations
+        """
+        return self._stations_by_travel_time[site]
+
+
+class StationIndex:
+    """Index of unload stations to dispatch trucks leaving mining sites.
+    Keeps the load of each unload station (trucks on the way, waiting or unloading) and the expected time
+        when it has unloaded every truck dispatched to it, so a dispatch does not scan every unload station.
+    Each mining site has a segment tree over the unload stations from the nearest one; each node keeps the minimums
+        of its unload stations, so both queries descend the tree in O(log m):
+    - Nearest idle: the leftmost unload station with no load.
+    - Lowest ETA: the leftmost unload station available when a truck arrives there (available at - travel time
+        <= now) starts unloading on arrival; only a nearer unload station, which is still busy when the truck
+        arrives, can be better: the earliest available one of them.
+    A dispatch or a release updates the leaf of the unload station in the tree of each mining site in O(log m).
+    """
+
+    def __init__(self, site_map: SiteMap, unloading_time: int):
+        """
+        :param site_map: travel times between mining sites and unload stations
+        :param unloading_time: unloading time of a truck in simulation minutes
+        """
+        self._site_map = site_map
+        self._unloading_time = unloading_time
+        m = site_map.n_stations
+        self.load = [0] * m
+        self.available_at = [0] * m
+
+        self._size = 1
+        while self._size < m:
+            self._size *= 2
+        # Per mining site: unload stations from the nearest one, their travel times, and the leaf of each station
+        self._stations = [site_map.stations_by_travel_time(site) for site in range(site_map.n_sites)]
+        self._travel_times = [
+            [site_map.travel_time(site, station) for station in stations]
+            for site, stations in enumerate(self._stations)
+        ]
+        self._leaves = []
+        # Per mining site, per node: minimum load, minimum of (available at - travel time),
+        #   and minimum (available at, leaf) of the unload stations under the node
+        self._min_load = []
+        self._min_slack = []
+        self._min_available = []
+        for site, stations in enumerate(self._stations):
+            leaves = [0] * m
+            for leaf, station in enumerate(stations):
+                leaves[station] = leaf
+            self._leaves.append(leaves)
+            min_load = [math.inf] * (2 * self._size)
+            min_slack = [math.inf] * (2 * self._size)
+            min_available = [(math.inf, 0)] * (2 * self._size)
+            for leaf in range(m):
+                min_load[self._size + leaf] = 0
+                min_slack[self._size + leaf] = -self._travel_times[site][leaf]
+                min_available[self._size + leaf] = (0, leaf)
+            for tree in (min_load, min_slack, min_available):
+                for node in range(self._size - 1, 0, -1):
+                    tree[node] = min(tree[2 * node], tree[2 * node + 1])
+            self._min_load.append(min_load)
+            self._min_slack.append(min_slack)
+            self._min_available.append(min_available)
+
+    @staticmethod
+    def _pull(tree: list, node: int) -> None:
+        """Update a node of a tree and its ancestors from their children."""
+        while node:
+            left, right = tree[2 * node], tree[2 * node + 1]
+            value = left if left <= right else right
+            if tree[node] == value:
+                # The ancestors keep their minimums too.
+                return
+            tree[node] = value
+            node //= 2
+
+    def _update(self, station: int, load_only: bool = False) -> None:
+        """Update the leaf of the unload station in the trees of every mining site.
+
+        :param station: index of the unload station
+        :param load_only: whether only the load changed
+        """
+        load = self.load[station]
+        available_at = self.available_at[station]
+        for site in range(self._site_map.n_sites):
+            leaf = self._leaves[site][station]
+            node = self._size + leaf
+            self._min_load[site][node] = load
+            self._pull(self._min_load[site], node // 2)
+            if load_only:
+                continue
+            self._min_slack[site][node] = available_at - self._travel_times[site][leaf]
+            self._pull(self._min_slack[site], node // 2)
+            self._min_available[site][node] = (available_at, leaf)
+            self._pull(self._min_available[site], node // 2)
+
+    def dispatch(self, site: int, now: int, rule: DispatchRule) -> Tuple[int, int]:
+        """Choose an unload station for a truck leaving the mining site, and reserve it.
+
+        :param site: index of the mining site
+        :param now: current simulation time in minutes
+        :param rule: dispatch rule
+        :return: (index of the unload station, travel time in simulation minutes)
+        """
+        station = None
+        if rule == DispatchRule.NEAREST_AVAILABLE:
+            station = self.nearest_idle(site=site)
+        if station is None:
+            station, _ = self.lowest_eta(site=site, now=now)
+
+        travel_time = self._site_map.travel_time(site, station)
+        self.load[station] += 1
+        self.available_at[station] = max(now + travel_time, self.available_at[station]) + self._unloading_time
+        self._update(station)
+        return station, travel_time
+
+    def release(self, station: int) -> None:
+        """Release an unload station when it has unloaded a truck.
+
+        :param station: index of the unload station
+        """
+        self.load[station] -= 1
+        if self.load[station] == 0:
+            self._update(station, load_only=True)
+
+    def nearest_idle(self, site: int) -> Optional[int]:
+        """Find the nearest unload station without any truck on the way, waiting or unloading.
+
+        :param site: index of the mining site
+        :return: index of the unload station; None if every unload station is busy
+        """
+        tree = self._min_load[site]
+        if tree[1] > 0:
+            return None
+        node = 1
+        while node < self._size:
+            node = 2 * node if tree[2 * node] == 0 else 2 * node + 1
+        return self._stations[site][node - self._size]
+
+    def lowest_eta(self, site: int, now: int) -> Tuple[int, int]:
+        """Find the unload station where a truck leaving the mining site can start unloading first,
+            counting the travel time and the trucks already dispatched to the unload station.
+        Ties go to the nearest unload station.
+
+        :param site: index of the mining site
+        :param now: current simulation time in minutes
+        :return: (index of the unload station, expected simulation time to start unloading)
+        """
+        slack = self._min_slack[site]
+        available = self._min_available[site]
+        if slack[1] > now:
+            # Every unload station is still busy when the truck arrives: the earliest available one.
+            eta, leaf = available[1]
+            return self._stations[site][leaf], eta
+
+        # The nearest unload station available on arrival
+        node = 1
+        while node < self._size:
+            node = 2 * node if slack[2 * node] <= now else 2 * node + 1
+        leaf = node - self._size
+        best = (now + self._travel_times[site][leaf], leaf)
+
+        # Nearer unload stations are busy on arrival: the earliest available one of them, if not later.
+        low, high = self._size, node
+        while low < high:
+            if low & 1:
+                best = min(best, available[low])
+                low += 1
+            if high & 1:
+                high -= 1
+                best = min(best, available[high])
+            low //= 2
+            high //= 2
+        eta, leaf = best
+        return self._stations[site][leaf], eta
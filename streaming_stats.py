@@ -0,0 +1,289 @@
+import heapq
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+# Values at or below this are counted as zero by QuantileSketch (e.g., no wait).
+_MIN_POSITIVE_VALUE = 1e-9
+
+
+class RunningStats:
+    """Online mean and variance with Welford's algorithm.
+    Keeps count, mean, sum of squared deviations, min and max only; constant memory for any number of samples.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add a sample.
+
+        :param value: sample value
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Merge samples of other stats into this one (Chan's parallel algorithm).
+
+        :param other: stats to merge; e.g., of another replication or worker process
+        :return: this stats
+        """
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance; 0 if there are less than 2 samples."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with relative accuracy (logarithmic buckets as in DDSketch).
+    A value x is counted in bucket ceil(log_gamma(x)), so every quantile is estimated within relative_accuracy.
+    The number of buckets grows with the log of the value range only, and is capped by max_buckets:
+        the lowest buckets are collapsed first, so high quantiles (e.g., p95, p99) stay accurate.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        """
+        :param relative_accuracy: relative accuracy of quantiles; 0 < relative_accuracy < 1
+        :param max_buckets: maximum number of buckets
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        if max_buckets <= 0:
+            raise ValueError("max_buckets must be positive integer")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_buckets = max_buckets
+        self._buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Add a sample.
+
+        :param value: non-negative sample value
+        """
+        if value < 0:
+            raise ValueError("QuantileSketch supports non-negative values only")
+        self.count += 1
+        if value <= _MIN_POSITIVE_VALUE:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        if len(self._buckets) > self._max_buckets:
+            self._collapse()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Merge samples of another sketch into this one.
+
+        :param other: sketch with the same relative accuracy
+        :return: this sketch
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self._buckets) > self._max_buckets:
+            self._collapse()
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile.
+
+        :param q: quantile between 0 and 1; e.g., 0.95 for p95
+        :return: estimated value; nan if there is no sample
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        cumulative = self.zero_count
+        if rank < cumulative:
+            return 0.0
+        for index in sorted(self._buckets):
+            cumulative += self._buckets[index]
+            if rank < cumulative:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in terms of relative error
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+    def _collapse(self) -> None:
+        """Collapse the lowest buckets into one to keep max_buckets."""
+        indexes = sorted(self._buckets)
+        excess = len(indexes) - self._max_buckets
+        target = indexes[excess]
+        for index in indexes[:excess]:
+            self._buckets[target] += self._buckets.pop(index)
+
+
+class DistributionStats:
+    """Streaming distribution of a metric: Welford mean/variance and a quantile sketch.
+    Updated a sample at a time without storing samples, and mergeable across replications and worker processes.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """
+        :param relative_accuracy: relative accuracy of quantiles
+        """
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch(relative_accuracy=relative_accuracy)
+
+    @property
+    def count(self) -> int:
+        """Number of samples."""
+        return self.stats.count
+
+    def add(self, value: float) -> None:
+        """Add a sample.
+
+        :param value: non-negative sample value
+        """
+        self.stats.add(value)
+        self.sketch.add(value)
+
+    def merge(self, other: "DistributionStats") -> "DistributionStats":
+        """Merge samples of other distribution into this one.
+
+        :param other: distribution to merge
+        :return: this distribution
+        """
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile.
+
+        :param q: quantile between 0 and 1
+        :return: estimated value; nan if there is no sample
+        """
+        return self.sketch.quantile(q)
+
+    def summary(self) -> Dict[str, Optional[Any]]:
+        """Summarize the distribution.
+
+        :return: count, mean, std, min, max, p50, p95 and p99; None for values without samples
+        """
+        if self.count == 0:
+            return {"count": 0} | {key: None for key in ("mean", "std", "min", "max", "p50", "p95", "p99")}
+        return {
+            "count": self.count,
+            "mean": self.stats.mean,
+            "std": self.stats.std,
+            "min": self.stats.min,
+            "max": self.stats.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Histogram:
+    """Fixed-width histogram over [low, high]; values out of the range are counted in the first or last bin."""
+
+    def __init__(self, low: float = 0.0, high: float = 1.0, bins: int = 10):
+        """
+        :param low: lower edge of the first bin
+        :param high: upper edge of the last bin (inclusive)
+        :param bins: number of bins
+        """
+        if bins <= 0 or high <= low:
+            raise ValueError("Histogram needs at least one bin and high > low")
+        self.low = low
+        self.high = high
+        self.counts = [0] * bins
+        self._scale = bins / (high - low)
+
+    def add(self, value: float) -> None:
+        """Count a value.
+
+        :param value: value to count
+        """
+        index = int((value - self.low) * self._scale)
+        self.counts[min(max(index, 0), len(self.counts) - 1)] += 1
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Merge counts of other histogram with the same bins into this one.
+
+        :param other: histogram to merge
+        :return: this histogram
+        """
+        if (self.low, self.high, len(self.counts)) != (other.low, other.high, len(other.counts)):
+            raise ValueError("Histograms to merge must have the same bins")
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        return self
+
+    def bins(self) -> List[Tuple[float, float, int]]:
+        """Get the bins.
+
+        :return: (lower edge, upper edge, count) of each bin
+        """
+        width = (self.high - self.low) / len(self.counts)
+        return [(self.low + i * width, self.low + (i + 1) * width, count) for i, count in enumerate(self.counts)]
+
+
+class TopK:
+    """The k items with the largest keys, kept in a min-heap of size k: O(log k) per item and no full sort.
+    Of items with the same key, the first added ones are kept.
+    """
+
+    def __init__(self, k: int):
+        """
+        :param k: number of items to keep; at least 1
+        """
+        if k < 1:
+            raise ValueError("TopK needs k >= 1")
+        self.k = k
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._added = 0
+
+    def add(self, key: float, item: Any) -> None:
+        """Offer an item.
+
+        :param key: key of the item; larger is kept
+        :param item: item
+        """
+        self._added += 1
+        # Later items are smaller on the same key, so they are dropped first.
+        entry = (key, -self._added, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Tuple[float, Any]]:
+        """Get the kept items.
+
+        :return: (key, item) from the largest key
+        """
+        return [(key, item) for key, _, item in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
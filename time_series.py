@@ -0,0 +1,192 @@
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+
+from report_exporters import Column, ReportExporter
+
+# Sampled metrics, in the order of the counts given to TimeSeriesSampler.sample
+METRICS = ("queue_length", "busy_stations", "mining", "traveling")
+
+# Downsampled resolutions: name -> window in simulation minutes (a shift is 8 hours)
+DEFAULT_RESOLUTIONS = {"5min": 5, "hour": 60, "shift": 480}
+
+
+class RingBuffer:
+    """Preallocated ring buffer of numbers in a typed array; keeps the latest `capacity` values."""
+
+    def __init__(self, capacity: int, typecode: str = "q"):
+        """
+        :param capacity: number of values to keep
+        :param typecode: typecode of the array (e.g., "q" for integers, "d" for floats)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._values = array(typecode, [0]) * capacity
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float) -> None:
+        """Append a value; overwrite the oldest one if the buffer is full.
+
+        :param value: value to append
+        """
+        capacity = len(self._values)
+        if self._count < capacity:
+            self._values[(self._start + self._count) % capacity] = value
+            self._count += 1
+        else:
+            self._values[self._start] = value
+            self._start = (self._start + 1) % capacity
+
+    def to_list(self) -> List[float]:
+        """Get the kept values.
+
+        :return: values from the oldest one
+        """
+        end = self._start + self._count
+        if end <= len(self._values):
+            return self._values[self._start:end].tolist()
+        return self._values[self._start:].tolist() + self._values[:end - len(self._values)].tolist()
+
+
+class _Window:
+    """Downsampled series of a resolution: mean and max of each metric per window, and the window being filled."""
+
+    def __init__(self, width: int, capacity: int):
+        self.width = width
+        self.times = RingBuffer(capacity=capacity)
+        self.means = [RingBuffer(capacity=capacity, typecode="d") for _ in METRICS]
+        self.maxes = [RingBuffer(capacity=capacity) for _ in METRICS]
+        # Window being filled: index (ends at index * width), number of samples, sum and max of each metric
+        self.index = 0
+        self.samples = 0
+        self.sums = [0] * len(METRICS)
+        self.current_maxes = [0] * len(METRICS)
+
+    def add(self, sim_time: int, counts: Sequence[int]) -> None:
+        # A window covers (end - width, end]
+        index = -(-sim_time // self.width)
+        if index != self.index and self.samples:
+            self.flush()
+        self.index = index
+        self.samples += 1
+        for i, count in enumerate(counts):
+            self.sums[i] += count
+            if count > self.current_maxes[i]:
+                self.current_maxes[i] = count
+
+    def flush(self) -> None:
+        self.times.append(self.index * self.width)
+        for i in range(len(METRICS)):
+            self.means[i].append(self.sums[i] / self.samples)
+            self.maxes[i].append(self.current_maxes[i])
+        self.samples = 0
+        self.sums = [0] * len(METRICS)
+        self.current_maxes = [0] * len(METRICS)
+
+    def rows(self) -> List[List[Any]]:
+        columns = [self.times.to_list()]
+        for means, maxes in zip(self.means, self.maxes):
+            columns += [means.to_list(), maxes.to_list()]
+        rows = [list(row) for row in zip(*columns)]
+        if self.samples:
+            # The window being filled, so far
+            row = [self.index * self.width]
+            for i in range(len(METRICS)):
+                row += [self.sums[i] / self.samples, self.current_maxes[i]]
+            rows.append(row)
+        return rows
+
+
+class TimeSeriesSampler:
+    """Samples the state of the simulation at a fixed simulation time interval into ring buffers:
+        queue length, busy unload stations, trucks mining and trucks traveling.
+    The control center keeps the counts incrementally on each event, so a sample is O(1) and does not scan the fleet.
+    Each sample also updates downsampled series (mean and max per 5 minutes, per hour and per shift by default),
+        so every resolution is ready at the end without another pass.
+    """
+
+    def __init__(self, interval: int = 1, capacity: int = 4320, resolutions: Optional[Dict[str, int]] = None):
+        """
+        :param interval: sampling interval in simulation minutes
+        :param capacity: number of samples (and of windows of each resolution) to keep; the oldest ones are dropped
+        :param resolutions: name -> window in simulation minutes; None for 5 minutes, an hour and a shift
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self._times = RingBuffer(capacity=capacity)
+        self._values = [RingBuffer(capacity=capacity) for _ in METRICS]
+        self.resolutions = dict(DEFAULT_RESOLUTIONS if resolutions is None else resolutions)
+        self._windows = {name: _Window(width=width, capacity=capacity) for name, width in self.resolutions.items()}
+
+    def sample(self, sim_time: int, counts: Sequence[int]) -> None:
+        """Record a sample.
+
+        :param sim_time: simulation time in minutes
+        :param counts: count of each metric in METRICS
+        """
+        self._times.append(sim_time)
+        for values, count in zip(self._values, counts):
+            values.append(count)
+        for window in self._windows.values():
+            window.add(sim_time, counts)
+
+    def series(self) -> Dict[str, List[int]]:
+        """Get the kept samples.
+
+        :return: "time" and each metric -> values from the oldest sample
+        """
+        series = {"time": self._times.to_list()}
+        for metric, values in zip(METRICS, self._values):
+            series[metric] = values.to_list()
+        return series
+
+    def downsampled(self, resolution: str) -> Dict[str, List[float]]:
+        """Get the downsampled series of a resolution, including the window being filled.
+
+        :param resolution: name of the resolution (e.g., "hour")
+        :return: "time" (end of each window) and "<metric>_mean", "<metric>_max" -> values from the oldest window
+        """
+        columns = _window_columns()
+        rows = self._windows[resolution].rows()
+        return {column.key: [row[i] for row in rows] for i, column in enumerate(columns)}
+
+    def export(self, exporter: ReportExporter) -> None:
+        """Stream the samples (table "time_series") and each resolution (table "time_series_<resolution>").
+
+        :param exporter: exporter to write to
+        """
+        exporter.begin_table(
+            name="time_series", columns=[Column(key="time", header="Time (min)")] + [
+                Column(key=metric, header=metric) for metric in METRICS
+            ]
+        )
+        for row in zip(self._times.to_list(), *(values.to_list() for values in self._values)):
+            exporter.write_row(row)
+        exporter.end_table()
+        for name in self._windows:
+            self.export_resolution(resolution=name, exporter=exporter)
+
+    def export_resolution(self, resolution: str, exporter: ReportExporter) -> None:
+        """Stream the downsampled series of a resolution (table "time_series_<resolution>").
+
+        :param resolution: name of the resolution (e.g., "shift")
+        :param exporter: exporter to write to
+        """
+        exporter.begin_table(name=f"time_series_{resolution}", columns=_window_columns())
+        for row in self._windows[resolution].rows():
+            exporter.write_row(row)
+        exporter.end_table()
+
+
+def _window_columns() -> List[Column]:
+    """Columns of downsampled series: the end of the window, then mean and max of each metric."""
+    columns = [Column(key="time", header="Time (min)")]
+    for metric in METRICS:
+        name = metric.replace("_", " ").capitalize()
+        columns.append(Column(key=f"{metric}_mean", header=f"{name} (mean)", fmt=lambda value: f"{value:.1f}"))
+        columns.append(Column(key=f"{metric}_max", header=f"{name} (max)"))
+    return columns
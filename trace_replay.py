@@ -0,0 +1,281 @@
+import argparse
+import time
+from array import array
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from const import (
+    DispatchRule,
+    SimulationMode,
+    TraceEvent,
+    TruckPhase,
+    UNLOADING_TIME_FOR_H3_UNLOAD_STATION,
+    TRAVELING_TIME_FOR_H3_MINING_TRUCK,
+    SHORTEST_TIME_FOR_MINING_H3,
+    LONGEST_TIME_FOR_MINING_H3,
+)
+from event_trace import read_trace, read_trace_header
+from fleet_store import FleetEngine
+from random_streams import MiningTimeStream
+from site_map import SiteMap, StationIndex
+from streaming_stats import RunningStats
+
+
+class DemandTrace:
+    """Mining times of each truck in the order it mined them: the only random input of a simulation.
+    Replaying the same trace against other fleets (unload stations, unloading time, dispatch rule) compares them
+        under exactly the same demand, without sampling noise.
+    Mining times of all trucks are in one flat array; truck i has mining_times[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, mining_times: Sequence[Sequence[int]]):
+        """
+        :param mining_times: mining times in simulation minutes of each truck, in the order of truck ids
+        """
+        if not mining_times:
+            raise ValueError("mining_times must have at least one truck")
+        self.mining_times = array("q")
+        self.offsets = array("q", [0])
+        for truck_mining_times in mining_times:
+            self.mining_times.extend(truck_mining_times)
+            self.offsets.append(len(self.mining_times))
+
+    @property
+    def n(self) -> int:
+        """Number of trucks."""
+        return len(self.offsets) - 1
+
+    def cycles(self, index: int) -> int:
+        """Get the number of recorded mining times of a truck.
+
+        :param index: index of the truck (truck id - 1)
+        :return: number of mining times
+        """
+        return self.offsets[index + 1] - self.offsets[index]
+
+    @classmethod
+    def from_event_trace(cls, path: str) -> "DemandTrace":
+        """Read mining times from the binary event trace of a run (MINING_STARTED records).
+        e.g., run MiningControlCenter(..., logger=SimulationLogger(trace=TraceWriter(path))) to record it.
+
+        :param path: path of the event trace file
+        :return: demand trace of every truck of the fleet in the header of the trace
+        """
+        n = read_trace_header(path)["trucks"]
+        if n <= 0:
+            raise ValueError(f"{path} has no fleet size in its header")
+        records = read_trace(path, event=TraceEvent.MINING_STARTED)
+        if len(records) == 0:
+            raise ValueError(f"{path} has no mining times")
+        truck_ids = records["truck_id"]
+        if truck_ids.min() < 1 or truck_ids.max() > n:
+            raise ValueError(f"{path} has mining times of trucks out of its fleet of {n} trucks")
+        # Records are in time order; a stable sort by truck keeps the order of the mining times of each truck.
+        order = np.argsort(truck_ids, kind="stable")
+        durations = records["duration"][order].astype(np.int64)
+        # Trucks without a recorded mining time have none to replay.
+        counts = np.bincount(truck_ids, minlength=n + 1)[1:]
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        return cls([durations[start:end].tolist() for start, end in zip(bounds[:-1], bounds[1:])])
+
+    @classmethod
+    def from_seed(
+        cls,
+        n: int,
+        seed: int,
+        cycles: int,
+        replication: int = 0,
+        antithetic: bool = False,
+        shortest_mining_time: int = SHORTEST_TIME_FOR_MINING_H3,
+        longest_mining_time: int = LONGEST_TIME_FOR_MINING_H3,
+    ) -> "DemandTrace":
+        """Draw the mining times which MiningControlCenter(..., seed=seed) gives its trucks.
+
+        :param n: number of mining trucks
+        :param seed: master seed
+        :param cycles: number of mining times per truck
+        :param replication: index of the replication
+        :param antithetic: whether replications are antithetic pairs (2k, 2k + 1); odd replications mirror the even one
+        :param shortest_mining_time: shortest mining time in simulation minutes
+        :param longest_mining_time: longest mining time in simulation minutes
+        :return: demand trace of n trucks
+        """
+        mining_times = []
+        for truck_id in range(1, n + 1):
+            stream = MiningTimeStream(
+                seed=seed,
+                truck_id=truck_id,
+                shortest_mining_time=shortest_mining_time,
+                longest_mining_time=longest_mining_time,
+                replication=replication,
+                antithetic=antithetic,
+            )
+            mining_times.append([stream.next() for _ in range(cycles)])
+        return cls(mining_times)
+
+
+class ReplayEngine(FleetEngine):
+    """Queue-only discrete event engine which replays a demand trace instead of drawing mining times.
+    Runs on the fleet store without truck and unload station objects, logging or tracing; with the same mining times,
+        handles events in the same order as MiningControlCenter, so a replay of a run with the same fleet gives
+        the same statistics as the run.
+    A truck which has mined every recorded mining time stays at its mining site (counted in `exhausted`);
+        record a longer run than the replays, or use DemandTrace.from_seed with enough cycles.
+    """
+
+    def __init__(
+        self,
+        trace: DemandTrace,
+        m: int,
+        travel_time: int = TRAVELING_TIME_FOR_H3_MINING_TRUCK,
+        unloading_time: int = UNLOADING_TIME_FOR_H3_UNLOAD_STATION,
+        site_map: Optional[SiteMap] = None,
+        dispatch_rule: DispatchRule = DispatchRule.NEAREST_AVAILABLE,
+        quantiles: bool = True,
+    ):
+        """
+        :param trace: mining times of each truck
+        :param m: number of mining unload stations
+        :param travel_time: travel time between a mining site and an unload station in simulation minutes
+        :param unloading_time: unloading time of a truck in simulation minutes
+        :param site_map: travel times between mining sites and the m unload stations; None for a single travel time
+        :param dispatch_rule: which unload station a truck leaving a mining site goes to; with a site map only
+        :param quantiles: whether to keep quantile sketches of the distributions; False to keep counts and means only
+            (RunningStats), which replays faster, and the quantiles of the summary are None
+        """
+        super().__init__(n=trace.n, m=m, travel_time=travel_time, unloading_time=unloading_time)
+        if site_map is not None and site_map.n_stations != m:
+            raise ValueError("site_map must have travel times to the m unload stations")
+        self._trace = trace
+        self.exhausted = 0
+        if not quantiles:
+            self.wait_time_stats = RunningStats()
+            self.cycle_time_stats = RunningStats()
+            self.response_time_stats = RunningStats()
+            self.queue_length_stats = RunningStats()
+
+        self._site_map = site_map
+        self._dispatch_rule = dispatch_rule
+        if site_map is not None:
+            # Same as MiningControlCenter: truck #i mines at site (i - 1) % sites, and waits at its unload station.
+            self._sites = array("q", (index % site_map.n_sites for index in range(trace.n)))
+            self._station_index = StationIndex(site_map=site_map, unloading_time=unloading_time)
+            self._station_queues = [deque() for _ in range(m)]
+            self._unloading_stations = bytearray(m)
+
+    def _start_to_mining(self, index: int) -> None:
+        """Start to mining the next recorded mining time; stay at the mining site if there is none."""
+        if self.trucks.stream_cycle[index] >= self._trace.cycles(index):
+            self.trucks.phase[index] = TruckPhase.MINING
+            self.exhausted += 1
+            return
+        super()._start_to_mining(index)
+
+    def _get_mining_time(self, index: int) -> int:
+        """Get the next recorded mining time of a truck."""
+        trucks = self.trucks
+        cycle = trucks.stream_cycle[index]
+        trucks.stream_cycle[index] = cycle + 1
+        return self._trace.mining_times[self._trace.offsets[index] + cycle]
+
+    def _dispatch_departing_truck(self, index: int) -> Tuple[Optional[int], int]:
+        """Dispatch the truck leaving its mining site to an unload station of the site map, if any."""
+        if self._site_map is None:
+            return super()._dispatch_departing_truck(index)
+        return self._station_index.dispatch(site=self._sites[index], now=self.now, rule=self._dispatch_rule)
+
+    def _truck_arrived(self, index: int, station: int, mining_time: int) -> Optional[int]:
+        """The truck arrived at its unload station; wait in its queue if it is unloading another truck.
+        Without a site map, take any available unload station or wait.
+        """
+        if self._site_map is None:
+            return super()._truck_arrived(index, station, mining_time)
+        queue = self._station_queues[station]
+        self._record_arrival(index, queue=queue)
+        if not self._unloading_stations[station]:
+            self._unloading_stations[station] = 1
+            return station
+        self._start_to_wait(index, queue=queue)
+        return None
+
+    def _unload_completed(self, index: int, station: int) -> Optional[int]:
+        """The truck unloaded at its unload station; the next truck in the queue of the unload station unloads.
+        Without a site map, the next truck in the single queue unloads.
+        """
+        if self._site_map is None:
+            return super()._unload_completed(index, station)
+        self._record_unload(index, station)
+        self._station_index.release(station)
+        queue = self._station_queues[station]
+        if queue:
+            return queue.popleft()
+        self._unloading_stations[station] = 0
+        return None
+
+    def _get_travel_time(self, index: int, station: int) -> int:
+        """Get the travel time from the unload station back to the mining site of the truck, if there is a site map."""
+        if self._site_map is None:
+            return super()._get_travel_time(index, station)
+        return self._site_map.travel_time(self._sites[index], station)
+
+    def summarize(self, duration: int) -> Dict[str, Any]:
+        """Summarize the replay; same as MiningControlCenter.summarize, and the number of exhausted trucks.
+
+        :param duration: test duration in simulation minutes
+        :return: fleet-wide simulation statistics
+        """
+        return {**super().summarize(duration=duration), "exhausted_trucks": self.exhausted}
+
+
+def replay(trace: DemandTrace, ms: Iterable[int], duration: int, **kwargs: Any) -> List[Dict[str, Any]]:
+    """Replay the same demand against each number of unload stations.
+
+    :param trace: mining times of each truck
+    :param ms: numbers of unload stations
+    :param duration: test duration in simulation hours
+    :param kwargs: other arguments of ReplayEngine (e.g., unloading_time)
+    :return: summary of each replay
+    """
+    summaries = []
+    for m in ms:
+        engine = ReplayEngine(trace=trace, m=m, **kwargs)
+        engine.simulate(duration=duration)
+        summaries.append(engine.summarize(duration=duration * 60))
+    return summaries
+
+
+if __name__ == "__main__":
+    """Replay one demand against many numbers of unload stations vs. simulate each of them. e.g.,
+    python trace_replay.py --trucks 100 --stations 40 --duration 72
+    """
+    from mining_control_center import MiningControlCenter
+
+    parser = argparse.ArgumentParser(description="Trace replay vs. fresh simulations")
+    parser.add_argument("--trucks", type=int, default=100, help="number of mining trucks")
+    parser.add_argument("--stations", type=int, default=40, help="replay against 1..stations unload stations")
+    parser.add_argument("--duration", type=int, default=72, help="test duration in simulation hours")
+    parser.add_argument("--seed", type=int, default=42, help="master seed")
+    args = parser.parse_args()
+
+    # Enough cycles for the shortest possible cycle of every truck
+    cycles = args.duration * 60 // (SHORTEST_TIME_FOR_MINING_H3 + 2 * TRAVELING_TIME_FOR_H3_MINING_TRUCK) + 2
+    demand = DemandTrace.from_seed(n=args.trucks, seed=args.seed, cycles=cycles)
+    started = time.perf_counter()
+    replay(demand, range(1, args.stations + 1), duration=args.duration)
+    replay_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    replay(demand, range(1, args.stations + 1), duration=args.duration, quantiles=False)
+    means_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for stations in range(1, args.stations + 1):
+        MiningControlCenter(
+            n=args.trucks, m=stations, sim_time_unit=1, mode=SimulationMode.DISCRETE_EVENT, seed=args.seed
+        ).simulate(duration=args.duration, log_events=False)
+    simulate_seconds = time.perf_counter() - started
+    print(f"Replay:    {replay_seconds:.2f} s for {args.stations} numbers of unload stations")
+    print(f"Means:     {means_seconds:.2f} s without quantiles ({replay_seconds / means_seconds:.1f}x faster)")
+    print(f"Simulate:  {simulate_seconds:.2f} s ({simulate_seconds / replay_seconds:.1f}x slower)")
@@ -0,0 +1,113 @@
+import asyncio
+import selectors
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _VirtualTimeSelector(selectors.BaseSelector):
+    """Selector for VirtualTimeEventLoop.
+    Polls the real selector without blocking. If nothing is ready and the event loop is waiting for a timer,
+        advances the virtual clock to the deadline instead of sleeping.
+    """
+
+    def __init__(self, loop: "VirtualTimeEventLoop", selector: selectors.BaseSelector):
+        """
+        :param loop: event loop which owns the virtual clock
+        :param selector: real selector for I/O (e.g., call_soon_threadsafe from other threads)
+        """
+        self._loop = loop
+        self._selector = selector
+
+    def register(self, fileobj, events, data=None):
+        return self._selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj):
+        return self._selector.unregister(fileobj)
+
+    def modify(self, fileobj, events, data=None):
+        return self._selector.modify(fileobj, events, data)
+
+    def get_map(self):
+        return self._selector.get_map()
+
+    def close(self) -> None:
+        self._selector.close()
+
+    def select(self, timeout: Optional[float] = None):
+        """Wait until some registered file objects become ready, or the timeout expires.
+
+        :param timeout: None to wait until any file object is ready; seconds to wait for the next timer.
+        :return: list of (key, events) tuples for ready file objects.
+        """
+        if timeout is None:
+            # There is no timer at all: only another thread can wake the event loop up.
+            return self._selector.select(None)
+
+        ready = self._selector.select(0)
+        if not ready and timeout > 0:
+            # All tasks are blocked on timers: jump to the earliest deadline.
+            self._loop.advance(timeout)
+        return ready
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock is virtual.
+    When all tasks are blocked on timers (e.g., asyncio.sleep), advances the clock to the earliest deadline
+        instead of sleeping. So coroutines of trucks and unload stations run without waiting in the real world time.
+    Note: work done in other threads does not advance the virtual clock.
+    """
+
+    def __init__(self, start_time: float = 0.0):
+        """
+        :param start_time: starting time of the virtual clock in seconds
+        """
+        self._virtual_time = start_time
+        super().__init__(selector=_VirtualTimeSelector(self, selectors.DefaultSelector()))
+
+    def time(self) -> float:
+        """Get the current time of the virtual clock.
+
+        :return: virtual time in seconds
+        """
+        return self._virtual_time
+
+    def advance(self, seconds: float) -> None:
+        """Advance the virtual clock.
+
+        :param seconds: seconds to advance
+        """
+        if seconds < 0:
+            raise ValueError("seconds must be greater than or equal to 0")
+        self._virtual_time += seconds
+
+
+class VirtualTimeEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    """Event loop policy to create VirtualTimeEventLoop; Use with asyncio.set_event_loop_policy()."""
+
+    def new_event_loop(self) -> VirtualTimeEventLoop:
+        return VirtualTimeEventLoop()
+
+
+def run_in_virtual_time(main: Coroutine[Any, Any, T], start_time: float = 0.0) -> T:
+    """Run the coroutine in a new VirtualTimeEventLoop, like asyncio.run().
+    Remaining tasks (e.g., trucks which are still working) are cancelled when the coroutine is completed.
+
+    :param main: coroutine to run
+    :param start_time: starting time of the virtual clock in seconds
+    :return: result of the coroutine
+    """
+    loop = VirtualTimeEventLoop(start_time=start_time)
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()